@@ -0,0 +1,110 @@
+"""Analitik batch seluruh riwayat lari dengan NumPy (tanpa GUI).
+
+Riwayat dimuat sekali ke array kolom (tanggal, jarak, waktu, berat); metrik
+turunan dan agregat harian/mingguan/bulanan dihitung sekaligus dengan
+operasi vektor. Membutuhkan numpy.
+"""
+import numpy as np
+
+from analyzer_core import berat_dari_kalori, hitung_kalori, hitung_pace, hitung_speed
+
+PERIODS = ("day", "week", "month")
+
+
+class HistoryArrays:
+    """Kolom sesi: date (datetime64[D]), jarak, waktu, berat"""
+
+    def __init__(self, date, jarak, waktu, berat):
+        self.date = date
+        self.jarak = jarak
+        self.waktu = waktu
+        self.berat = berat
+
+    def __len__(self):
+        return len(self.date)
+
+    @classmethod
+    def from_history(cls, history):
+        """Membangun array dari dict history {tanggal: [sesi, ...]}"""
+        tanggal = list(history)
+        runs = [history[t] for t in tanggal]
+        counts = np.fromiter((len(r) for r in runs), dtype=np.int64, count=len(runs))
+        n = int(counts.sum())
+        date = np.repeat(np.array(tanggal, dtype="datetime64[D]"), counts)
+        jarak = np.fromiter((s["jarak"] for r in runs for s in r), dtype=float, count=n)
+        waktu = np.fromiter((s["waktu"] for r in runs for s in r), dtype=float, count=n)
+        kal = np.fromiter((s["kal"] for r in runs for s in r), dtype=float, count=n)
+        return cls(date, jarak, waktu, berat_dari_kalori(jarak, kal))
+
+
+def derive(arrays):
+    """Pace, kecepatan dan kalori untuk semua sesi sekaligus"""
+    return {
+        "pace": hitung_pace(arrays.jarak, arrays.waktu),
+        "speed": hitung_speed(arrays.jarak, arrays.waktu),
+        "kal": hitung_kalori(arrays.jarak, arrays.berat)
+    }
+
+
+def period_keys(date, period):
+    """Tanggal awal periode (hari, Senin tiap minggu, atau tanggal 1 tiap bulan)"""
+    if period == "day":
+        return date
+    if period == "week":
+        # 1970-01-01 adalah hari Kamis; +3 membuat Senin = 0
+        weekday = (date.astype(np.int64) + 3) % 7
+        return date - weekday.astype("timedelta64[D]")
+    if period == "month":
+        return date.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Periode tidak dikenal: {period}")
+
+
+def aggregate(arrays, period="day", derived=None):
+    """Total jarak, waktu, kalori, jumlah sesi dan rata-rata pace per periode"""
+    derived = derived if derived is not None else derive(arrays)
+    keys, inverse = np.unique(period_keys(arrays.date, period), return_inverse=True)
+    jarak = np.bincount(inverse, weights=arrays.jarak, minlength=len(keys))
+    waktu = np.bincount(inverse, weights=arrays.waktu, minlength=len(keys))
+    return {
+        "start": keys,
+        "sessions": np.bincount(inverse, minlength=len(keys)),
+        "jarak": jarak,
+        "waktu": waktu,
+        "kal": np.bincount(inverse, weights=derived["kal"], minlength=len(keys)),
+        "pace": waktu / jarak
+    }
+
+
+def summary(arrays, derived=None):
+    """Ringkasan seluruh riwayat"""
+    derived = derived if derived is not None else derive(arrays)
+    if not len(arrays):
+        return {"sessions": 0, "jarak": 0.0, "waktu": 0.0, "kal": 0.0, "pace": None}
+    jarak = float(arrays.jarak.sum())
+    waktu = float(arrays.waktu.sum())
+    return {
+        "sessions": len(arrays),
+        "jarak": jarak,
+        "waktu": waktu,
+        "kal": float(derived["kal"].sum()),
+        "pace": waktu / jarak,
+        "best_pace": float(derived["pace"].min()),
+        "longest": float(arrays.jarak.max())
+    }
+
+
+def rows(table):
+    """Mengubah hasil aggregate() menjadi daftar dict biasa (untuk JSON/CSV)"""
+    return [
+        {
+            "start": str(start),
+            "sessions": int(sessions),
+            "jarak": float(jarak),
+            "waktu": float(waktu),
+            "kal": float(kal),
+            "pace": float(pace)
+        }
+        for start, sessions, jarak, waktu, kal, pace in zip(
+            table["start"], table["sessions"], table["jarak"],
+            table["waktu"], table["kal"], table["pace"])
+    ]
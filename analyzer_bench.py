@@ -0,0 +1,1008 @@
+"""Benchmark jalur load/save Run Analyzer.
+
+Contoh:
+    python analyzer_bench.py storage --sizes 1000 100000 1000000
+    python analyzer_bench.py theme --sessions 10000
+    python analyzer_bench.py sessions --sizes 1000000
+    python analyzer_bench.py generate 20y running_data.json
+    xvfb-run python analyzer_bench.py suite --output hasil.json
+    python analyzer_bench.py compare hasil_lama.json hasil.json
+    python analyzer_bench.py report --athletes 32 --jobs 1 2 4 8
+    python analyzer_bench.py trends --scenario 20y-interval
+    python analyzer_bench.py search --sessions 1000000
+    python analyzer_bench.py binary --sizes 100000 1000000
+    python analyzer_bench.py stats --ops 20000
+    python analyzer_bench.py training --ops 20000
+    python analyzer_bench.py ingest --clients 4 --sessions 25000 --batch 100
+    python analyzer_bench.py merge --scenario 20y-interval --devices 3
+    python analyzer_bench.py concurrency --writers 4 --sessions 500
+    python analyzer_bench.py copy --sessions 3000
+
+Versi kecil cek stats, training, concurrency dan copy dijalankan sebagai tes:
+    python -m pytest tests
+
+Benchmark GUI (theme, dan jalur show_* di suite) membutuhkan display (atau
+Xvfb); tanpa display suite hanya mengukur jalur penyimpanan.
+"""
+import argparse
+from datetime import date, timedelta
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from analyzer_core import hitung_kalori, hitung_pace, hitung_speed
+from analyzer_storage import (DATA_FILE, JsonStore, JournalStore, ShardStore, SqliteStore, apply_op, open_store,
+                              shard_path)
+
+# skenario suite: (jumlah hari, sesi per hari)
+SCENARIOS = {
+    "1d": (1, 1),
+    "1y": (365, 1),
+    "5y": (1826, 2),
+    "20y": (7305, 3),
+    "20y-interval": (7305, 12)
+}
+
+
+def generate_data(n_sessions, per_day=3, seed=0, end=date(2025, 12, 31)):
+    """Data sintetis deterministik berisi n_sessions sesi"""
+    rng = random.Random(seed)
+    data = {"history": {}, "daily_targets": {}, "daily_distances": {}}
+    hari = end - timedelta(days=(n_sessions + per_day - 1) // per_day)
+    for i in range(n_sessions):
+        if i % per_day == 0:
+            hari += timedelta(days=1)
+        apply_op(data, make_op(rng, hari.strftime("%Y-%m-%d"), data))
+    return data
+
+
+def generate_scenario(name, path):
+    """Menulis running_data.json sintetis untuk skenario; hasil selalu sama per nama"""
+    days, per_day = SCENARIOS[name]
+    data = generate_data(days * per_day, per_day)
+    JsonStore(path).compact(data)
+    return days, days * per_day
+
+
+def make_op(rng, tanggal, data):
+    j = round(rng.uniform(2, 21), 2)
+    w = round(j * rng.uniform(4.5, 7.5), 1)
+    b = rng.choice((55, 62, 70, 78))
+    target = data["daily_targets"].get(tanggal, rng.choice((5, 8, 10)))
+    sesi = {
+        "time": f"{rng.randrange(5, 22):02d}:{rng.randrange(60):02d}",
+        "jarak": j,
+        "waktu": w,
+        "pace": hitung_pace(j, w),
+        "speed": hitung_speed(j, w),
+        "kal": hitung_kalori(j, b),
+        "target": target,
+        "total_jarak_harian": data["daily_distances"].get(tanggal, 0) + j
+    }
+    return {"op": "session", "date": tanggal, "session": sesi, "target": target}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_storage(n, workdir):
+    data = generate_data(n)
+    tanggal = max(data["history"])
+    op = make_op(random.Random(1), tanggal, data)
+    results = {"sessions": n}
+
+    json_path = os.path.join(workdir, f"json_{n}.json")
+    JsonStore(json_path).compact(data)
+    results["json_load"], loaded = timed(JsonStore(json_path).load)
+    store = JsonStore(json_path)
+    store.load()
+    apply_op(loaded, op)
+    results["json_save"], _ = timed(lambda: store.commit(loaded, [op]))
+    results["json_bytes"] = os.path.getsize(json_path)
+
+    journal_path = os.path.join(workdir, f"journal_{n}.json")
+    shutil.copy(json_path, journal_path)
+    store = JournalStore(journal_path)
+    loaded = store.load()
+    apply_op(loaded, op)
+    results["journal_save"], _ = timed(lambda: store.commit(loaded, [op]))
+
+    db_path = os.path.join(workdir, f"sqlite_{n}.db")
+    SqliteStore(db_path).commit(data, None)
+    store = SqliteStore(db_path)
+    results["sqlite_load"], loaded = timed(store.load)
+    apply_op(loaded, op)
+    results["sqlite_save"], _ = timed(lambda: store.commit(loaded, [op]))
+    results["sqlite_read_date"], _ = timed(lambda: store.sessions(tanggal))
+    store.close()
+    results["sqlite_bytes"] = os.path.getsize(db_path)
+
+    shard_dir = os.path.join(workdir, f"shard_{n}")
+    ShardStore(shard_dir).commit(data, None)
+    store = ShardStore(shard_dir)
+    results["shard_load"], loaded = timed(store.load)
+    apply_op(loaded, op)
+    results["shard_save"], _ = timed(lambda: store.commit(loaded, [op]))
+    oldest = min(data["history"])
+    results["shard_read_date"], _ = timed(lambda: store.sessions(oldest))
+    results["shard_manifest_bytes"] = os.path.getsize(store.manifest_path)
+    return results
+
+
+def peak_rss_kb():
+    """RSS puncak proses ini; VmHWM karena ru_maxrss ikut terwarisi lewat fork+exec di Linux"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss():
+    """Mengembalikan VmHWM ke RSS saat ini (Linux) agar puncak bisa diukur per jalur"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def measure_load(mode, path):
+    """Dijalankan di proses terpisah agar RSS puncak hanya milik load"""
+    start = time.perf_counter()
+    if mode == "dict":
+        with open(path) as f:
+            history = json.load(f)["history"]
+        count = sum(len(runs) for runs in history.values())
+    else:
+        history = JournalStore(path).load()["history"]
+        count = history.session_total()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss_kb": peak_rss_kb(), "sessions": count}))
+
+
+def bench_sessions(n, workdir):
+    """History dict biasa vs SessionStore: waktu load dan RSS puncak"""
+    path = os.path.join(workdir, f"sessions_{n}.json")
+    JsonStore(path).compact(generate_data(n))
+    results = {"sessions": n}
+    for mode in ("dict", "compact"):
+        out = subprocess.run([sys.executable, __file__, "_load", mode, path],
+                             capture_output=True, text=True, check=True).stdout
+        child = json.loads(out)
+        results[f"{mode}_load"] = child["seconds"]
+        results[f"{mode}_peak_rss_kb"] = child["peak_rss_kb"]
+    return results
+
+
+def bench_theme(n, workdir, repeat=5):
+    """Membandingkan toggle tema (recolor) dengan jalur lama destroy-and-rebuild"""
+    from run_Analyzer_Pro import RunningApp, TAB_DEPS
+
+    JsonStore(os.path.join(workdir, "running_data.json")).compact(generate_data(n))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        app = RunningApp()
+        app.withdraw()
+        for name, value in (("jarak", "5"), ("waktu", "30"), ("berat", "65"), ("target_jarak", "10")):
+            app.vars[name].set(value)
+        app.analyze()
+        for name in TAB_DEPS:
+            app.notebook.select(app.tabs[name])
+            app.update()
+
+        def restyle():
+            app.toggle_theme()
+            app.update_idletasks()
+
+        def rebuild():
+            for tab in app.tabs.values():
+                for widget in tab.winfo_children():
+                    widget.destroy()
+            app.make_input_tab()
+            app.dirty_tabs.update(TAB_DEPS)
+            for name in TAB_DEPS:
+                app.render_tab(name)
+            app.update_idletasks()
+
+        results = {"sessions": n, "widgets": len(app.themed_widgets)}
+        results["restyle"] = min(timed(restyle)[0] for _ in range(repeat))
+        results["rebuild"] = min(timed(rebuild)[0] for _ in range(repeat))
+        app.destroy()
+        return results
+    finally:
+        os.chdir(cwd)
+
+
+def bench_report(athletes, scenario, jobs_list, workdir):
+    """Throughput laporan multi-atlet untuk beberapa ukuran process pool"""
+    from analyzer_report import athlete_files, build_report
+    club = os.path.join(workdir, "club")
+    os.makedirs(club)
+    generate_scenario(scenario, os.path.join(club, "atlet_000.json"))
+    for i in range(1, athletes):
+        shutil.copy(os.path.join(club, "atlet_000.json"), os.path.join(club, f"atlet_{i:03d}.json"))
+    paths = athlete_files(club)
+    for jobs in jobs_list:
+        elapsed, _ = timed(lambda: build_report(paths, "2025-12-31", jobs))
+        print(json.dumps({"athletes": athletes, "scenario": scenario, "jobs": jobs,
+                          "seconds": elapsed, "athletes_per_s": athletes / elapsed}), flush=True)
+
+
+def bench_trends(scenario, width=600, queries=500):
+    """Waktu bangun level tren dan query zoom/geser acak (target < 16 ms per redraw)"""
+    from analyzer_rollup import Rollup
+    from analyzer_trends import distance_series, pace_series, progress_series
+    days, per_day = SCENARIOS[scenario]
+    data = generate_data(days * per_day, per_day)
+    rollup = Rollup.build(data["history"])
+    builders = {
+        "distance": lambda: distance_series(data["daily_distances"]),
+        "pace": lambda: pace_series(rollup),
+        "progress": lambda: progress_series(data["daily_distances"], data["daily_targets"])
+    }
+    rng = random.Random(0)
+    for name, build in builders.items():
+        build_s, series = timed(build)
+        lo, hi = series.span()
+        times = []
+        for _ in range(queries):
+            span = (hi - lo) * rng.uniform(0.001, 1.0)
+            start = rng.uniform(lo, hi - span)
+            times.append(timed(lambda: series.query(start, start + span, width))[0])
+        print(json.dumps({"scenario": scenario, "series": name, "points": len(series),
+                          "build": build_s, "query_mean_ms": sum(times) / len(times) * 1000,
+                          "query_max_ms": max(times) * 1000}), flush=True)
+
+
+def bench_search(n, queries=200):
+    """Bangun indeks pencarian dan query rentang acak di atas n sesi"""
+    from analyzer_search import SessionIndex, parse_day
+    from analyzer_sessions import SessionStore
+    history = SessionStore()
+    history.add_days(generate_data(n)["history"])
+    build_s, index = timed(lambda: SessionIndex.build(history))
+    rng = random.Random(0)
+    first, last = index.keys["day"][0], index.keys["day"][-1]
+    example = {"pace": (None, 5.0), "jarak": (10, None),
+               "day": (parse_day("2025"), parse_day("2025", end=True))}
+    example_s, found = timed(lambda: index.query(**example))
+    times = []
+    for _ in range(queries):
+        day = rng.randrange(first, last + 1)
+        ranges = {"day": (day, day + rng.randrange(1, 3650)),
+                  "jarak": (rng.uniform(2, 15), None),
+                  "pace": (None, rng.uniform(4.6, 7.0))}
+        times.append(timed(lambda: index.query(**ranges))[0])
+    update_s, _ = timed(lambda: index.apply(make_op(rng, "2025-12-31", {"daily_targets": {}, "daily_distances": {}})))
+    return {"sessions": n, "build": build_s, "example_ms": example_s * 1000, "example_hits": len(found),
+            "query_mean_ms": sum(times) / len(times) * 1000, "query_max_ms": max(times) * 1000,
+            "update_ms": update_s * 1000}
+
+
+def bench_binary(n, workdir):
+    """Ukuran dan waktu load: JSON indent=2 lama, snapshot JSON, format biner ber-mmap"""
+    from analyzer_binary import BinaryStore, json_to_binary
+    data = generate_data(n)
+    legacy = os.path.join(workdir, f"legacy_{n}.json")
+    with open(legacy, "w") as f:
+        json.dump({key: data[key] for key in ("history", "daily_targets", "daily_distances")}, f, indent=2)
+    snapshot = os.path.join(workdir, f"snapshot_{n}.json")
+    JsonStore(snapshot).compact(data)
+    binary, _, _ = json_to_binary(snapshot, os.path.join(workdir, f"binary_{n}.runb"))
+    tanggal = min(data["history"])
+    del data
+
+    results = {"sessions": n, "legacy_json_bytes": os.path.getsize(legacy),
+               "snapshot_json_bytes": os.path.getsize(snapshot), "binary_bytes": os.path.getsize(binary)}
+    results["legacy_json_load"], _ = timed(lambda: JournalStore(legacy).load())
+    results["snapshot_json_load"], _ = timed(lambda: JournalStore(snapshot).load())
+    store = BinaryStore(binary)
+    results["binary_load"], loaded = timed(store.load)
+    results["binary_read_date"], _ = timed(lambda: store.sessions(tanggal))
+    results["binary_read_all"], _ = timed(lambda: [store.sessions(t) for t in loaded["history"]])
+    store.close()
+    return results
+
+
+def brute_stats(data, anchor):
+    """Statistik yang sama dengan RunningStats.summary, dihitung ulang dari seluruh data"""
+    from analyzer_search import to_day
+    sessions = [(to_day(t), sesi["jarak"], sesi["waktu"] / sesi["jarak"])
+                for t, runs in data["history"].items() for sesi in runs]
+    windows = {}
+    for n in (7, 28, 365):
+        inside = [s for s in sessions if anchor - n < s[0] <= anchor]
+        windows[n] = (sum(data["daily_distances"].get(date.fromordinal(d).isoformat(), 0)
+                          for d in range(anchor - n + 1, anchor + 1)),
+                      min((s[2] for s in inside), default=None))
+    met = {to_day(t) for t, target in data["daily_targets"].items()
+           if target and data["daily_distances"].get(t, 0) >= target}
+    longest = current = 0
+    for d in met:
+        if d - 1 not in met:
+            end = d
+            while end + 1 in met:
+                end += 1
+            longest = max(longest, end - d + 1)
+            if d <= anchor <= end:
+                current = anchor - d + 1
+            elif end == anchor - 1:
+                current = anchor - d
+    return {
+        "windows": windows,
+        "best_today": min((s[2] for s in sessions if s[0] == anchor), default=None),
+        "pr_pace": min((s[2] for s in sessions), default=None),
+        "pr_jarak": max((s[1] for s in sessions), default=None),
+        "streak": current,
+        "longest_streak": longest
+    }
+
+
+def stats_mismatch(engine, brute):
+    """Daftar field yang berbeda antara RunningStats.summary dan brute_stats"""
+    def close(a, b):
+        if a is None or b is None:
+            return a is b
+        return abs(a - b) <= 1e-9 * max(1.0, abs(b))
+
+    bad = []
+    for n, (jarak, pace) in brute["windows"].items():
+        if not close(engine["windows"][n][0], jarak) or not close(engine["windows"][n][1], pace):
+            bad.append(f"window {n}: {engine['windows'][n]} != {(jarak, pace)}")
+    for key in ("pr_pace", "pr_jarak"):
+        value = engine[key] and engine[key][1]
+        if not close(value, brute[key]):
+            bad.append(f"{key}: {value} != {brute[key]}")
+    for key in ("best_today", "streak", "longest_streak"):
+        if not close(engine[key], brute[key]):
+            bad.append(f"{key}: {engine[key]} != {brute[key]}")
+    return bad
+
+
+def bench_stats(n_ops, check_every=50, seed=0, scenario="20y-interval"):
+    """Op acak (sesi, tanggal lama, hapus, ganti target, clear) dicek terhadap hitung ulang penuh"""
+    from analyzer_stats import RunningStats
+    rng = random.Random(seed)
+    data = {"history": {}, "daily_targets": {}, "daily_distances": {}}
+    stats = RunningStats()
+    anchor = date(2025, 1, 1).toordinal()
+    checks = rebuilds = 0
+    apply_s = 0.0
+    for i in range(n_ops):
+        roll = rng.random()
+        if roll < 0.1:
+            # hari acuan maju (kadang lompat jauh, kadang mundur)
+            anchor += rng.choice((1, 1, 1, 2, 3, 30, 400, -5))
+            op = None
+        elif roll < 0.14 and data["history"]:
+            op = {"op": "delete", "date": rng.choice(list(data["history"]))}
+        elif roll < 0.142:
+            op = {"op": "clear"}
+        else:
+            hari = anchor - min(int(rng.expovariate(0.05)), 500) + rng.choice((0, 0, 0, 0, 1))
+            tanggal = date.fromordinal(hari).isoformat()
+            op = make_op(rng, tanggal, data)
+            if rng.random() < 0.1:
+                op["target"] = rng.choice((None, 5, 25))
+        if op is not None:
+            apply_op(data, op)
+            elapsed, _ = timed(lambda: stats.apply(op))
+            apply_s += elapsed
+        if i % check_every == 0 or op is None:
+            checks += 1
+            bad = stats_mismatch(stats.summary(anchor), brute_stats(data, anchor))
+            if i % (check_every * 10) == 0:
+                rebuilds += 1
+                bad += stats_mismatch(RunningStats.build(data["history"], data["daily_targets"]).summary(anchor),
+                                      brute_stats(data, anchor))
+            if bad:
+                raise AssertionError(f"op ke-{i}, hari {date.fromordinal(anchor)}: " + "; ".join(bad))
+
+    days, per_day = SCENARIOS[scenario]
+    scenario = generate_data(days * per_day, per_day)
+    build_s, built = timed(lambda: RunningStats.build(scenario["history"], scenario["daily_targets"]))
+    today = max(scenario["history"])
+    ops = [make_op(rng, today, scenario) for _ in range(1000)]
+    append_s, _ = timed(lambda: [built.apply(op) for op in ops])
+    summary_s, _ = timed(lambda: built.summary(date.fromisoformat(today).toordinal()))
+    return {"ops": n_ops, "checks": checks, "rebuild_checks": rebuilds,
+            "apply_mean_us": apply_s / n_ops * 1e6, "build_20y_interval": build_s,
+            "append_today_us": append_s / len(ops) * 1e6, "summary_ms": summary_s * 1000}
+
+
+def brute_training(data, anchor):
+    """(akut, kronis) hari acuan, dihitung ulang dari hari pertama seluruh data"""
+    from analyzer_search import to_day
+    from analyzer_training import LA, LC, session_load
+    load = {}
+    for tanggal, runs in data["history"].items():
+        load[to_day(tanggal)] = sum(session_load(sesi["jarak"], sesi["waktu"]) for sesi in runs)
+    acute = chronic = 0.0
+    for d in range(min(load, default=anchor + 1), anchor + 1):
+        acute += LA * (load.get(d, 0.0) - acute)
+        chronic += LC * (load.get(d, 0.0) - chronic)
+    return acute, chronic
+
+
+def bench_training(n_ops, check_every=50, seed=0, scenario="20y-interval"):
+    """Op acak dicek terhadap EWMA yang dihitung ulang penuh, lalu waktu update per sesi"""
+    from analyzer_training import TrainingLoad
+    rng = random.Random(seed)
+    data = {"history": {}, "daily_targets": {}, "daily_distances": {}}
+    model = TrainingLoad()
+    anchor = date(2025, 1, 1).toordinal()
+    checks = 0
+    for i in range(n_ops):
+        roll = rng.random()
+        if roll < 0.1:
+            anchor += rng.choice((1, 1, 1, 2, 3, 30, 400, -5))
+            op = None
+        elif roll < 0.14 and data["history"]:
+            op = {"op": "delete", "date": rng.choice(list(data["history"]))}
+        elif roll < 0.142:
+            op = {"op": "clear"}
+        else:
+            hari = anchor - min(int(rng.expovariate(0.05)), 500) + rng.choice((0, 0, 0, 0, 1))
+            op = make_op(rng, date.fromordinal(hari).isoformat(), data)
+        if op is not None:
+            apply_op(data, op)
+            model.apply(op)
+        if i % check_every == 0 or op is None:
+            checks += 1
+            for engine in (model, TrainingLoad.build(data["history"])) if i % (check_every * 10) == 0 else (model,):
+                got, want = engine.at(anchor), brute_training(data, anchor)
+                if any(abs(a - b) > 1e-9 * max(1.0, abs(b)) for a, b in zip(got, want)):
+                    raise AssertionError(f"op ke-{i}, hari {date.fromordinal(anchor)}: {got} != {want}")
+
+    days, per_day = SCENARIOS[scenario]
+    scenario = generate_data(days * per_day, per_day)
+    build_s, built = timed(lambda: TrainingLoad.build(scenario["history"]))
+    today = max(scenario["history"])
+    anchor = date.fromisoformat(today).toordinal()
+    first_s, _ = timed(lambda: built.summary(anchor))
+    ops = [make_op(rng, today, scenario) for _ in range(1000)]
+    times = []
+    for op in ops:
+        times.append(timed(lambda: (built.apply(op), built.summary(anchor)))[0])
+    oldest = min(scenario["history"])
+    delete_s, _ = timed(lambda: (built.apply({"op": "delete", "date": oldest}), built.summary(anchor)))
+    return {"ops": n_ops, "checks": checks, "build_20y_interval": build_s, "first_summary_ms": first_s * 1000,
+            "session_today_us": sum(times) / len(times) * 1e6, "session_today_max_us": max(times) * 1e6,
+            "delete_oldest_ms": delete_s * 1000}
+
+
+def ingest_client(address, n, batch, seed):
+    """Proses klien: mengirim n sesi ke /sessions dalam batch lewat satu koneksi keep-alive"""
+    import http.client
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(address[1], address[2])
+    sent = 0
+    while sent < n:
+        k = min(batch, n - sent)
+        sessions = []
+        for _ in range(k):
+            j = round(rng.uniform(2, 21), 2)
+            sessions.append({"date": f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                             "time": f"{rng.randrange(5, 22):02d}:{rng.randrange(60):02d}",
+                             "jarak": j, "waktu": round(j * rng.uniform(4.5, 7.5), 1),
+                             "berat": rng.choice((55, 62, 70, 78))})
+        conn.request("POST", "/sessions", json.dumps(sessions), {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        if response.status != 202:
+            raise RuntimeError(f"status {response.status}")
+        sent += k
+    conn.close()
+
+
+def bench_ingest(clients, n, batch, scenario="5y"):
+    """Klien di proses terpisah mengirim sesi; thread utama meniru loop Tk (after tiap DRAIN_MS)"""
+    import multiprocessing
+    from analyzer_ingest import DRAIN_MS, IngestServer
+    from analyzer_rollup import Rollup
+    from analyzer_search import SessionIndex
+    from analyzer_sessions import SessionStore
+    from analyzer_stats import RunningStats
+    days, per_day = SCENARIOS[scenario]
+    raw = generate_data(days * per_day, per_day)
+    history = SessionStore()
+    history.add_days(raw["history"])
+    data = {"history": history, "daily_targets": raw["daily_targets"],
+            "daily_distances": raw["daily_distances"], "rollup": Rollup.build(history)}
+    # indeks yang juga diperbarui per op di GUI
+    indexes = [SessionIndex.build(history), RunningStats.build(history, data["daily_targets"])]
+
+    server = IngestServer(("tcp", "127.0.0.1", 0)).start()
+    procs = [multiprocessing.Process(target=ingest_client, args=(server.address, n, batch, i))
+             for i in range(clients)]
+    total = clients * n
+    applied = 0
+    ticks, drains = [], []
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    last = time.perf_counter()
+    while applied < total:
+        time.sleep(max(0.0, last + DRAIN_MS / 1000 - time.perf_counter()))
+        now = time.perf_counter()
+        ticks.append(now - last)
+        last = now
+        for op in server.ops(data):
+            for index in indexes:
+                index.apply(op)
+            applied += 1
+        drains.append(time.perf_counter() - now)
+        if now - start > 300:
+            break
+    elapsed = time.perf_counter() - start
+    for proc in procs:
+        proc.join()
+    server.close()
+    ticks.sort()
+    return {"clients": clients, "sessions": total, "batch": batch, "applied": applied,
+            "seconds": elapsed, "sessions_per_s": applied / elapsed,
+            "drain_max_ms": max(drains) * 1000, "tick_p99_ms": ticks[int(len(ticks) * 0.99)] * 1000,
+            "tick_max_ms": ticks[-1] * 1000}
+
+
+def measure_merge(output, inputs):
+    """Dijalankan di proses terpisah agar RSS puncak hanya milik merge"""
+    from analyzer_merge import merge_files
+    start = time.perf_counter()
+    data, summary, _ = merge_files(inputs, output, "json")
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss_kb": peak_rss_kb(),
+                      "sessions": data["history"].session_total(),
+                      "duplicates": sum(item["duplicates"] for item in summary)}))
+
+
+def bench_merge(scenario, devices, extra, workdir):
+    """Perangkat berbagi riwayat yang sama lalu menambah sesinya sendiri; hasil merge dicek"""
+    from analyzer_sessions import SessionStore
+    days, per_day = SCENARIOS[scenario]
+    base = generate_data(days * per_day, per_day)
+    dates = sorted(base["history"])
+    inputs = []
+    for i in range(devices):
+        rng = random.Random(100 + i)
+        history = SessionStore()
+        history.add_days(base["history"])
+        data = {"history": history, "daily_targets": dict(base["daily_targets"]),
+                "daily_distances": dict(base["daily_distances"])}
+        path = os.path.join(workdir, f"device{i}.json")
+        # bergantian: snapshot JSON + journal, folder shard, file biner
+        kind = ("journal", "shard", "binary")[i % 3]
+        store = open_store(path, kind)
+        ops = []
+        for n in range(extra):
+            if n == extra // 2:
+                store.commit(data, None)
+                store.close()
+                if kind == "journal":
+                    store.load()
+            op = make_op(rng, rng.choice(dates[-365:]), data)
+            apply_op(data, op)
+            ops.append(op)
+        # separuh sesi baru perangkat journal hanya ada di journal-nya
+        if kind == "journal":
+            store.append(ops[extra // 2:])
+        else:
+            store.commit(data, None)
+        store.close()
+        inputs.append({"journal": path, "shard": shard_path(path),
+                       "binary": os.path.splitext(path)[0] + ".runb"}[kind])
+    expected = days * per_day + devices * extra
+    del base, data, history
+
+    output = os.path.join(workdir, "merged.json")
+    out = subprocess.run([sys.executable, __file__, "_merge", output, *inputs],
+                         capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout)
+    merged = JournalStore(output).load()
+    wrong_totals = sum(1 for t in merged["history"]
+                       if abs(merged["history"][t][-1]["total_jarak_harian"] - merged["daily_distances"][t]) > 1e-6)
+    return {"scenario": scenario, "devices": devices, "inputs": [os.path.basename(p) for p in inputs],
+            "expected_sessions": expected, **result, "ok": result["sessions"] == expected and not wrong_totals}
+
+
+# tanggal data awal uji concurrency; penulis memilih acak agar sering mengenai tanggal yang belum dimuat
+CONCURRENCY_DAYS = [(date(2024, 1, 1) + timedelta(days=i)).isoformat() for i in range(366)]
+
+
+def concurrent_writer(path, kind, writer, n, compact_every):
+    """Proses penulis: menyimpan n sesi satu per satu seperti save_data di GUI"""
+    store = open_store(path, kind)
+    store.compact_every = compact_every
+    data = store.load()
+    rng = random.Random(writer)
+    for i in range(n):
+        op = make_op(rng, rng.choice(CONCURRENCY_DAYS), data)
+        # kal unik per (penulis, urutan) untuk mengecek sesi hilang/ganda
+        op["session"]["kal"] = writer * 1000000 + i
+        apply_op(data, op)
+        store.commit(data, [op])
+    store.close()
+
+
+def history_kal(history):
+    return [sesi["kal"] for tanggal in list(history) for sesi in history[tanggal]]
+
+
+def concurrent_watcher(path, kind, writer, n, compact_every, stop, results):
+    """Proses GUI: ikut menulis n sesi sambil mengikuti perubahan lewat poll()/changes().
+
+    Pemadatannya lebih sering dari penulis lain, sehingga op penulis lain di
+    tanggal yang belum dimuat sering ikut dipadatkan sebelum diterapkan.
+    """
+    store = open_store(path, kind)
+    store.compact_every = max(1, compact_every // 10)
+    data = store.load()
+    rng = random.Random(writer)
+    applied = reloads = written = 0
+
+    def follow():
+        nonlocal data, applied, reloads
+        store.poll()
+        _, ops, stale = store.changes()
+        if not stale and any(op["op"] != "session" or store.folded(data["history"], op) for op in ops):
+            stale = True
+        if stale:
+            data = store.load()
+            reloads += 1
+            return
+        for op in ops:
+            apply_op(data, op)
+            applied += 1
+
+    while not stop.is_set() or written < n:
+        if written < n:
+            op = make_op(rng, rng.choice(CONCURRENCY_DAYS), data)
+            op["session"]["kal"] = writer * 1000000 + written
+            apply_op(data, op)
+            # sync di commit membaca op proses lain; pemadatannya bisa terjadi sebelum follow()
+            store.commit(data, [op])
+            written += 1
+        follow()
+        time.sleep(0.005)
+    follow()
+    results.put({"applied": applied, "reloads": reloads, "kal": sorted(history_kal(data["history"]))})
+    store.close()
+
+
+def bench_concurrency(kinds, writers, n, compact_every, workdir):
+    """Beberapa proses menulis data yang sama bersamaan; tidak boleh ada sesi yang hilang"""
+    import multiprocessing
+    results = []
+    for kind in kinds:
+        path = os.path.join(workdir, kind, DATA_FILE)
+        os.makedirs(os.path.dirname(path))
+        # satu sesi awal per tanggal: tanggal sudah ada tetapi belum dimuat penulis
+        base = {"history": {}, "daily_targets": {}, "daily_distances": {}}
+        rng = random.Random(-1)
+        for i, tanggal in enumerate(CONCURRENCY_DAYS):
+            op = make_op(rng, tanggal, base)
+            op["session"]["kal"] = -1 - i
+            apply_op(base, op)
+        store = open_store(path, kind)
+        store.commit(base, None)
+        store.close()
+        stop = multiprocessing.Event()
+        watched = multiprocessing.Queue()
+        watcher = multiprocessing.Process(target=concurrent_watcher,
+                                          args=(path, kind, writers, n, compact_every, stop, watched))
+        watcher.start()
+        procs = [multiprocessing.Process(target=concurrent_writer, args=(path, kind, w, n, compact_every))
+                 for w in range(writers)]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        seen = watched.get()
+        watcher.join()
+
+        store = open_store(path, kind)
+        kal = sorted(history_kal(store.load()["history"]))
+        store.close()
+        expected = sorted([-1 - i for i in range(len(CONCURRENCY_DAYS))] +
+                          [w * 1000000 + i for w in range(writers + 1) for i in range(n)])
+        results.append({"storage": kind, "writers": writers, "sessions": len(expected), "seconds": elapsed,
+                        "writes_per_s": len(expected) / elapsed,
+                        "lost": len(set(expected) - set(kal)), "duplicates": len(kal) - len(set(kal)),
+                        "watcher_applied": seen["applied"], "watcher_reloads": seen["reloads"],
+                        "watcher_ok": seen["kal"] == expected, "ok": kal == expected})
+    return results
+
+
+def bench_copy(n, workdir, n_ops=50):
+    """Salinan history untuk build di thread latar: data GUI tidak berubah dan salinan
+    tetap berisi keadaan saat disalin walau op berikutnya sudah dipadatkan ke disk"""
+    from analyzer_search import SessionIndex
+    data = generate_data(n)
+    results = []
+    for kind in ("shard", "binary", "sqlite"):
+        path = os.path.join(workdir, kind, DATA_FILE)
+        os.makedirs(os.path.dirname(path))
+        store = open_store(path, kind)
+        store.commit(data, None)
+        store.compact_every = 1
+        gui = store.load()
+        history = gui["history"]
+        copy = history.copy()
+        rng = random.Random(1)
+        touched = [t for t in rng.sample(sorted(history), n_ops) if t not in history.loaded]
+        for tanggal in touched:
+            op = make_op(rng, tanggal, gui)
+            apply_op(gui, op)
+            # compact_every=1: shard/file di disk langsung memuat op ini
+            store.commit(gui, [op])
+        changed = sum(1 for t in touched if len(copy[t]) != len(data["history"][t]))
+        SessionIndex.build(history.copy())
+        expected = {t: len(runs) + (t in touched) for t, runs in data["history"].items()}
+        emptied = sum(1 for t in expected if len(history[t]) != expected[t])
+        store.close()
+        results.append({"storage": kind, "ops": len(touched), "copy_changed": changed,
+                        "gui_changed": emptied, "ok": not changed and not emptied})
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_suite(name, workdir, repeat):
+    """Satu skenario suite; dijalankan di proses terpisah agar memori tiap skenario terpisah"""
+    path = os.path.join(workdir, DATA_FILE)
+    days, sessions = generate_scenario(name, path)
+    results = {}
+
+    def measure(key, fn, prepare=None):
+        best = None
+        for _ in range(repeat):
+            if prepare:
+                prepare()
+            reset_peak_rss()
+            elapsed, _ = timed(fn)
+            best = elapsed if best is None else min(best, elapsed)
+        results[key] = {"seconds": best, "peak_rss_kb": peak_rss_kb()}
+
+    # load pertama memindahkan JSON ke backend aktif (mis. shard), jadi diukur sekali saja
+    reset_peak_rss()
+    elapsed, _ = timed(lambda: open_store(path).load())
+    results["migrate"] = {"seconds": elapsed, "peak_rss_kb": peak_rss_kb()}
+    report = {"scenario": name, "days": days, "sessions": sessions, "results": results}
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        error = None
+        try:
+            from tkinter import TclError
+            from run_Analyzer_Pro import RunningApp
+        except ImportError as e:
+            error = e
+        else:
+            try:
+                reset_peak_rss()
+                elapsed, app = timed(RunningApp)
+            except TclError as e:
+                error = e
+        if error is not None:
+            report["gui"] = f"tidak tersedia: {error}"
+            store = open_store(path)
+            measure("load_data", store.load)
+            data = store.load()
+            op = make_op(random.Random(1), max(data["history"]), data)
+            apply_op(data, op)
+            measure("save_data", lambda: store.commit(data, [op]))
+            return report
+        results["startup"] = {"seconds": elapsed, "peak_rss_kb": peak_rss_kb()}
+        app.withdraw()
+        for key, value in (("jarak", "5"), ("waktu", "30"), ("berat", "65"), ("target_jarak", "10")):
+            app.vars[key].set(value)
+
+        def idle(fn, *args):
+            return lambda: (fn(*args), app.update_idletasks())
+
+        def drop_detail():
+            for cached in app.detail_windows.values():
+                cached["window"].destroy()
+            app.detail_windows.clear()
+
+        measure("load_data", app.load_data)
+        measure("analyze", idle(app.analyze))
+        # save_data hanya menyerahkan ops ke thread; tulis disk diukur langsung lewat store
+        app.persist.close()
+        op = make_op(random.Random(1), max(app.history), app.data())
+
+        def save():
+            app.record(op)
+            app.store.commit(app.data(), app.pending_ops)
+            app.pending_ops = []
+        measure("save_data", save)
+        app.notebook.select(app.tabs["History"])
+        measure("show_history", idle(app.show_history))
+        app.notebook.select(app.tabs["Gizi"])
+        measure("show_gizi", idle(app.show_gizi))
+        measure("show_date_detail", idle(app.show_date_detail, max(app.history)), prepare=drop_detail)
+        results["widgets"] = len(app.themed_widgets)
+        app.store.close()
+        app.destroy()
+        return report
+    finally:
+        os.chdir(cwd)
+
+
+def bench_suite(names, repeat):
+    """Menjalankan tiap skenario di proses anak; hasil JSON bisa dibandingkan antar commit"""
+    meta = {"commit": git_commit(), "python": platform.python_version(),
+            "platform": platform.platform(), "repeat": repeat}
+    reports = []
+    for name in names:
+        out = subprocess.run([sys.executable, __file__, "_suite", name, "--repeat", str(repeat)],
+                             capture_output=True, text=True, check=True).stdout
+        report = dict(json.loads(out.splitlines()[-1]), **meta)
+        print(json.dumps(report), flush=True)
+        reports.append(report)
+    return reports
+
+
+def compare(old_path, new_path):
+    """Rasio waktu dan memori hasil suite baru terhadap yang lama (<1 berarti lebih baik)"""
+    with open(old_path) as f:
+        old = {r["scenario"]: r for r in json.load(f)}
+    with open(new_path) as f:
+        new = json.load(f)
+    for report in new:
+        base = old.get(report["scenario"])
+        if base is None:
+            continue
+        for key, value in report["results"].items():
+            before = base["results"].get(key)
+            if not isinstance(value, dict) or not isinstance(before, dict) or not before["seconds"]:
+                continue
+            print(f"{report['scenario']:>14} {key:<18} "
+                  f"waktu x{value['seconds'] / before['seconds']:.2f}  "
+                  f"memori x{value['peak_rss_kb'] / max(1, before['peak_rss_kb']):.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("storage", help="JSON vs journal vs SQLite vs shard per bulan")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    p = sub.add_parser("theme", help="toggle tema: recolor vs rebuild")
+    p.add_argument("--sessions", type=int, default=10000)
+    p = sub.add_parser("sessions", help="history dict vs SessionStore")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000000])
+    p = sub.add_parser("generate", help="tulis running_data.json sintetis untuk satu skenario")
+    p.add_argument("scenario", choices=list(SCENARIOS))
+    p.add_argument("path", nargs="?", default=DATA_FILE)
+    p = sub.add_parser("suite", help="waktu dan memori puncak load/save/analyze/show_* per skenario")
+    p.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--output", help="simpan hasil sebagai file JSON")
+    p = sub.add_parser("compare", help="bandingkan dua file hasil suite")
+    p.add_argument("old")
+    p.add_argument("new")
+    p = sub.add_parser("report", help="laporan multi-atlet: throughput per jumlah proses")
+    p.add_argument("--athletes", type=int, default=32)
+    p.add_argument("--scenario", choices=list(SCENARIOS), default="5y")
+    p.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    p = sub.add_parser("trends", help="level-of-detail grafik tren: bangun level dan query")
+    p.add_argument("--scenario", choices=list(SCENARIOS), default="20y-interval")
+    p.add_argument("--width", type=int, default=600)
+    p = sub.add_parser("search", help="indeks pencarian: waktu bangun, query dan update")
+    p.add_argument("--sessions", type=int, nargs="+", default=[1000000])
+    p = sub.add_parser("binary", help="format biner ber-mmap vs JSON: ukuran dan waktu load")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    p = sub.add_parser("stats", help="statistik bergulir dan rekor: cek vs hitung ulang, waktu update")
+    p.add_argument("--ops", type=int, default=20000)
+    p = sub.add_parser("training", help="beban latihan akut/kronis: cek vs hitung ulang, waktu update")
+    p.add_argument("--ops", type=int, default=20000)
+    p = sub.add_parser("ingest", help="uji beban endpoint ingest: sesi/detik dan jeda loop GUI")
+    p.add_argument("--clients", type=int, default=4)
+    p.add_argument("--sessions", type=int, default=25000, help="sesi per klien")
+    p.add_argument("--batch", type=int, nargs="+", default=[1, 100])
+    p = sub.add_parser("merge", help="merge data beberapa perangkat: waktu, memori puncak dan cek hasil")
+    p.add_argument("--scenario", choices=list(SCENARIOS), default="20y-interval")
+    p.add_argument("--devices", type=int, default=3)
+    p.add_argument("--extra", type=int, default=2000, help="sesi baru per perangkat")
+    p = sub.add_parser("concurrency", help="uji beberapa proses menulis data yang sama: sesi hilang/ganda")
+    p.add_argument("--storage", nargs="+", default=["journal", "json", "shard", "binary", "sqlite"])
+    p.add_argument("--writers", type=int, default=4)
+    p.add_argument("--sessions", type=int, default=500, help="sesi per proses")
+    p.add_argument("--compact-every", type=int, default=50)
+    p = sub.add_parser("copy", help="salinan history untuk build latar: isolasi dari data GUI dan pemadatan")
+    p.add_argument("--sessions", type=int, default=3000)
+    p = sub.add_parser("_merge")
+    p.add_argument("output")
+    p.add_argument("inputs", nargs="+")
+    p = sub.add_parser("_load")
+    p.add_argument("mode", choices=["dict", "compact"])
+    p.add_argument("path")
+    p = sub.add_parser("_suite")
+    p.add_argument("scenario", choices=list(SCENARIOS))
+    p.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "_load":
+        return measure_load(args.mode, args.path)
+    if args.command == "_merge":
+        return measure_merge(args.output, args.inputs)
+    if args.command == "generate":
+        days, sessions = generate_scenario(args.scenario, args.path)
+        print(f"{days} hari, {sessions} sesi ditulis ke {args.path}")
+        return
+    if args.command == "compare":
+        return compare(args.old, args.new)
+
+    workdir = tempfile.mkdtemp(prefix="run_bench_")
+    try:
+        if args.command == "storage":
+            for n in args.sizes:
+                print(json.dumps(bench_storage(n, workdir)), flush=True)
+        elif args.command == "theme":
+            print(json.dumps(bench_theme(args.sessions, workdir)), flush=True)
+        elif args.command == "sessions":
+            for n in args.sizes:
+                print(json.dumps(bench_sessions(n, workdir)), flush=True)
+        elif args.command == "binary":
+            for n in args.sizes:
+                print(json.dumps(bench_binary(n, workdir)), flush=True)
+        elif args.command == "ingest":
+            for batch in args.batch:
+                print(json.dumps(bench_ingest(args.clients, args.sessions, batch)), flush=True)
+        elif args.command == "concurrency":
+            for result in bench_concurrency(args.storage, args.writers, args.sessions, args.compact_every, workdir):
+                print(json.dumps(result), flush=True)
+        elif args.command == "copy":
+            for result in bench_copy(args.sessions, workdir):
+                print(json.dumps(result), flush=True)
+        elif args.command == "merge":
+            print(json.dumps(bench_merge(args.scenario, args.devices, args.extra, workdir)), flush=True)
+        elif args.command == "training":
+            print(json.dumps(bench_training(args.ops)), flush=True)
+        elif args.command == "stats":
+            print(json.dumps(bench_stats(args.ops)), flush=True)
+        elif args.command == "search":
+            for n in args.sessions:
+                print(json.dumps(bench_search(n)), flush=True)
+        elif args.command == "trends":
+            bench_trends(args.scenario, args.width)
+        elif args.command == "report":
+            bench_report(args.athletes, args.scenario, args.jobs, workdir)
+        elif args.command == "_suite":
+            print(json.dumps(run_suite(args.scenario, workdir, args.repeat)), flush=True)
+        elif args.command == "suite":
+            reports = bench_suite(args.scenarios, args.repeat)
+            if args.output:
+                with open(args.output, "w") as f:
+                    json.dump(reports, f, indent=2)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Format biner berukuran tetap untuk sesi lari, dibaca lewat mmap.
+
+Isi file (little-endian):
+    header   : magic "RUNB", versi, jumlah tanggal, jumlah sesi, journal_seq,
+               offset bagian extras
+    tabel    : satu entri per tanggal (urut): ordinal tanggal, indeks sesi
+               pertama, jumlah sesi, total jarak/waktu/kalori
+    sesi     : satu record per sesi: menit jam mulai, jarak, waktu, kalori,
+               target (NaN jika tidak ada)
+    extras   : JSON kecil berisi daily_targets dan jam yang bukan "HH:MM"
+
+Saat start hanya header dan tabel tanggal yang dibaca; sesi satu tanggal
+diambil dengan memotong mapping. Pace, kecepatan dan total_jarak_harian
+dihitung dari record seperti di SessionStore.
+"""
+from datetime import date
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+
+from analyzer_core import hitung_pace, hitung_speed
+from analyzer_lock import LOCK_SUFFIX
+from analyzer_rollup import Rollup
+from analyzer_sessions import NO_TIME
+from analyzer_storage import (COMPACT_EVERY, JOURNAL_SUFFIX, JournalStore, LazyHistory, SharedJournal,
+                              apply_op, atomic_write, copy_latest, empty_data, read_ops,
+                              session_count)
+
+MAGIC = b"RUNB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQQ")
+DAY = struct.Struct("<iIIddd")
+RECORD = struct.Struct("<Hdddd")
+
+
+def binary_path(path):
+    return os.path.splitext(path)[0] + ".runb"
+
+
+def to_record(sesi):
+    """dict sesi -> (tuple record, jam asli jika bukan "HH:MM")"""
+    jam = sesi.get("time", "")
+    try:
+        h, m = jam.split(":")
+        menit, odd = int(h) * 60 + int(m), None
+    except (AttributeError, ValueError):
+        menit, odd = NO_TIME, jam
+    target = sesi.get("target")
+    return (menit, sesi["jarak"], sesi["waktu"], sesi["kal"],
+            math.nan if target is None else target), odd
+
+
+def to_session(record, total, odd=None):
+    menit, jarak, waktu, kal, target = record
+    return {
+        "time": odd if menit == NO_TIME else f"{menit // 60:02d}:{menit % 60:02d}",
+        "jarak": jarak,
+        "waktu": waktu,
+        "pace": hitung_pace(jarak, waktu),
+        "speed": hitung_speed(jarak, waktu),
+        "kal": kal,
+        "target": None if math.isnan(target) else target,
+        "total_jarak_harian": total
+    }
+
+
+class Day:
+    """Isi satu tanggal saat menulis: bytes record apa adanya atau daftar tuple record"""
+
+    __slots__ = ("raw", "records", "odd")
+
+    def __init__(self, raw=b"", records=None, odd=None):
+        self.raw = raw
+        self.records = records
+        self.odd = odd or {}
+
+    def unpacked(self):
+        if self.records is None:
+            self.records = list(RECORD.iter_unpack(self.raw))
+            self.raw = None
+        return self.records
+
+    def packed(self):
+        if self.records is None:
+            return self.raw
+        return b"".join(RECORD.pack(*r) for r in self.records)
+
+
+def days_from_history(history):
+    """{tanggal: Day} dari history dict/SessionStore/LazyHistory"""
+    days = {}
+    for tanggal in history:
+        day = Day(records=[])
+        for pos, sesi in enumerate(history[tanggal]):
+            record, odd = to_record(sesi)
+            day.records.append(record)
+            if odd is not None:
+                day.odd[pos] = odd
+        days[tanggal] = day
+    return days
+
+
+def write_binary(f, days, targets, seq):
+    """Menulis file biner dari {tanggal: Day} (urutan tanggal diurutkan di sini)"""
+    dates = sorted(days)
+    chunks, table = [], []
+    first = 0
+    for tanggal in dates:
+        raw = days[tanggal].packed()
+        count = len(raw) // RECORD.size
+        jarak = waktu = kal = 0.0
+        for _, j, w, k, _ in RECORD.iter_unpack(raw):
+            jarak += j
+            waktu += w
+            kal += k
+        table.append(DAY.pack(date.fromisoformat(tanggal).toordinal(), first, count, jarak, waktu, kal))
+        chunks.append(raw)
+        first += count
+    extras = json.dumps({
+        "daily_targets": targets,
+        "odd_times": {t: days[t].odd for t in dates if days[t].odd}
+    }).encode()
+    extras_offset = HEADER.size + DAY.size * len(dates) + RECORD.size * first
+    f.write(HEADER.pack(MAGIC, VERSION, 0, len(dates), first, seq, extras_offset))
+    f.write(b"".join(table))
+    f.write(b"".join(chunks))
+    f.write(extras)
+
+
+class BinaryFile:
+    """File biner yang di-mmap: tabel tanggal dibaca sekali, record diambil per tanggal"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, n_dates, self.n_sessions, self.seq, extras = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Bukan file biner Run Analyzer: {path}")
+        self.table = {}
+        for ordinal, first, count, jarak, waktu, kal in DAY.iter_unpack(
+                self.map[HEADER.size:HEADER.size + DAY.size * n_dates]):
+            self.table[date.fromordinal(ordinal).isoformat()] = (first, count, jarak, waktu, kal)
+        self.records_start = HEADER.size + DAY.size * n_dates
+        raw = json.loads(self.map[extras:])
+        self.targets = raw["daily_targets"]
+        self.odd = {t: {int(pos): jam for pos, jam in odd.items()} for t, odd in raw["odd_times"].items()}
+
+    def raw(self, tanggal):
+        first, count = self.table[tanggal][:2]
+        start = self.records_start + first * RECORD.size
+        return self.map[start:start + count * RECORD.size]
+
+    def sessions(self, tanggal):
+        if tanggal not in self.table:
+            return []
+        odd = self.odd.get(tanggal, {})
+        total = 0
+        runs = []
+        for pos, record in enumerate(RECORD.iter_unpack(self.raw(tanggal))):
+            total += record[1]
+            runs.append(to_session(record, total, odd.get(pos)))
+        return runs
+
+    def days(self):
+        """{tanggal: Day} berisi bytes record asli, untuk ditulis ulang tanpa di-unpack"""
+        return {t: Day(raw=self.raw(t), odd=dict(self.odd.get(t, {}))) for t in self.table}
+
+    def close(self):
+        self.map.close()
+
+
+class BinaryStore(SharedJournal):
+    """Backend RUN_ANALYZER_STORAGE=binary: file biner + journal, dipadatkan sendiri"""
+
+    lazy = True
+
+    def __init__(self, path, json_path=None, compact_every=COMPACT_EVERY, readonly=False):
+        self.path = path
+        self.json_path = json_path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.file = None
+        self.seq = 0
+        self.targets = {}
+        self.journal = []
+        # mapping dibaca thread GUI dan diganti thread penyimpanan
+        self.lock = threading.RLock()
+        self.init_shared(path + LOCK_SUFFIX, readonly)
+        self.readonly = readonly
+
+    def open(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+            self.file = BinaryFile(self.path)
+
+    def load(self):
+        """Header dan tabel tanggal saja; sesi dibaca per tanggal saat dibutuhkan"""
+        with self.file_lock:
+            if not os.path.exists(self.path):
+                if self.readonly:
+                    raise FileNotFoundError(f"File biner tidak ditemukan: {self.path}")
+                if not self.json_path or copy_latest(self.json_path, self, self.path) is None:
+                    self.commit(empty_data(), None)
+            ops = self.reopen()
+            table = self.file.table
+            rollup = Rollup()
+            for tanggal, (_, count, jarak, waktu, kal) in table.items():
+                rollup.add(tanggal, jarak, waktu, kal, count)
+            data = {
+                "history": LazyHistory({t: entry[1] for t, entry in table.items()}, self.sessions),
+                "daily_targets": dict(self.targets),
+                "daily_distances": {t: entry[2] for t, entry in table.items()},
+                "rollup": rollup
+            }
+            for op in ops:
+                apply_op(data, op)
+                self.absorb(op)
+                self.seq = op["seq"]
+            self.loaded()
+        return data
+
+    def reopen(self):
+        """Membuka ulang file biner; mengembalikan op journal yang belum masuk file"""
+        self.seq = 0
+        self.targets = {}
+        if os.path.exists(self.path):
+            self.open()
+            self.seq = self.file.seq
+            self.targets = dict(self.file.targets)
+        self.journal = []
+        ops, offset, tail = read_ops(self.journal_path)
+        self.mark_read(offset, tail)
+        return [op for op in ops if op["seq"] > self.seq]
+
+    def absorb(self, op):
+        self.track(op)
+
+    def sessions(self, tanggal):
+        with self.lock:
+            return self.file.sessions(tanggal)
+
+    def track(self, op):
+        self.journal.append(op)
+        if op["op"] == "session" and op.get("target") is not None:
+            self.targets[op["date"]] = op["target"]
+        elif op["op"] == "delete":
+            self.targets.pop(op["date"], None)
+        elif op["op"] == "clear":
+            self.targets.clear()
+
+    def needs_compact(self, n_ops):
+        # file dipadatkan sendiri dari journal, tanpa salinan data dari GUI
+        return False
+
+    def commit(self, data, ops):
+        """Menyimpan perubahan; ops=None berarti tulis ulang file dari data"""
+        if ops is None:
+            return self.compact(data)
+        self.append(ops)
+
+    def append(self, ops):
+        if not ops:
+            return
+        with self.file_lock:
+            self.sync()
+            self.write_ops(ops)
+            if len(self.journal) >= self.compact_every:
+                self.compact_journal()
+
+    def compact_journal(self):
+        """Menerapkan journal ke file; tanggal yang tidak berubah disalin sebagai bytes"""
+        with self.lock:
+            days = self.file.days() if self.file is not None else {}
+        for op in self.journal:
+            kind = op["op"]
+            if kind == "session":
+                day = days.setdefault(op["date"], Day(records=[]))
+                record, odd = to_record(op["session"])
+                if odd is not None:
+                    day.odd[len(day.unpacked())] = odd
+                day.unpacked().append(record)
+            elif kind == "delete":
+                days.pop(op["date"], None)
+            elif kind == "clear":
+                days.clear()
+        self.write(days)
+
+    def compact(self, data, ops=()):
+        with self.file_lock:
+            self.sync()
+            # data menggantikan semuanya: proses lain harus memuat ulang
+            self.seq += len(ops) or 1
+            self.targets = dict(data["daily_targets"])
+            self.write(days_from_history(data["history"]))
+
+    def write(self, days):
+        with self.lock:
+            # Windows tidak bisa mengganti file yang masih di-mmap
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            try:
+                atomic_write(self.path, lambda f: write_binary(f, days, self.targets, self.seq), mode="wb")
+                self.compacted()
+                self.journal = []
+            finally:
+                # file baru, atau file lama yang utuh jika penulisan gagal
+                if os.path.exists(self.path):
+                    self.open()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def json_to_binary(json_path, out_path=None):
+    """Data terbaru untuk running_data.json (backend yang terakhir ditulis) -> file biner"""
+    out_path = out_path or binary_path(json_path)
+    store = BinaryStore(out_path)
+    try:
+        counts = copy_latest(json_path, store, out_path)
+    finally:
+        store.close()
+    if counts is None:
+        raise FileNotFoundError(f"Data tidak ditemukan: {json_path}")
+    return (out_path, *counts)
+
+
+def binary_to_json(bin_path, json_path):
+    """File biner (+ journal) -> running_data.json (format snapshot yang dibaca JournalStore)"""
+    store = BinaryStore(bin_path, readonly=True)
+    try:
+        data = store.load()
+        history = data["history"]
+        counts = (len(history), sum(session_count(history, t) for t in history))
+        JournalStore(json_path).compact(data)
+    finally:
+        store.close()
+    return counts
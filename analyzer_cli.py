@@ -0,0 +1,169 @@
+"""Perintah baris-perintah Run Analyzer (tanpa GUI).
+
+Contoh:
+    python run_Analyzer_Pro.py migrate-sqlite
+    python run_Analyzer_Pro.py stats --period week
+    python run_Analyzer_Pro.py import export.csv lari.gpx --berat 65
+    python run_Analyzer_Pro.py report data_klub/ --format csv --output minggu.csv
+    python run_Analyzer_Pro.py to-binary
+    python run_Analyzer_Pro.py to-json running_data.runb --output running_data.json
+    python run_Analyzer_Pro.py merge laptop.json desktop.shards
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from analyzer_import import import_files
+from analyzer_storage import (DATA_FILE, default_kind, migrate_json_to_sqlite, open_readonly, open_store,
+                              sqlite_path, store_path)
+
+
+def cmd_migrate_sqlite(args):
+    db_path = args.db or sqlite_path(args.data)
+    days, sessions = migrate_json_to_sqlite(args.data, db_path)
+    print(f"{days} hari, {sessions} sesi dipindahkan ke {db_path}")
+    return 0
+
+
+def cmd_to_binary(args):
+    from analyzer_binary import json_to_binary
+    path, days, sessions = json_to_binary(args.data, args.output)
+    json_size = f", JSON {os.path.getsize(args.data)} byte" if os.path.exists(args.data) else ""
+    print(f"{days} hari, {sessions} sesi ditulis ke {path} ({os.path.getsize(path)} byte{json_size})")
+    return 0
+
+
+def cmd_to_json(args):
+    from analyzer_binary import binary_to_json
+    days, sessions = binary_to_json(args.binary, args.output)
+    print(f"{days} hari, {sessions} sesi ditulis ke {args.output}")
+    return 0
+
+
+def cmd_stats(args):
+    try:
+        import analyzer_analytics as analytics
+    except ImportError:
+        print("Perintah stats membutuhkan numpy (pip install numpy)")
+        return 1
+    # hanya membaca: tanpa migrasi, kunci atau file baru
+    store = open_readonly(args.data)
+    try:
+        arrays = analytics.HistoryArrays.from_history(store.load()["history"])
+    finally:
+        store.close()
+    derived = analytics.derive(arrays)
+    print(json.dumps({
+        "summary": analytics.summary(arrays, derived),
+        args.period: analytics.rows(analytics.aggregate(arrays, args.period, derived))
+    }, indent=2))
+    return 0
+
+
+def cmd_import(args):
+    start = time.perf_counter()
+    store = open_store(args.data)
+    data = store.load()
+    ops = import_files(args.files, data, args.berat)
+    store.commit(data, ops)
+    store.close()
+    print(f"{len(ops)} sesi diimpor dalam {time.perf_counter() - start:.2f} detik")
+    return 0
+
+
+def cmd_report(args):
+    from analyzer_report import athlete_files, build_report, write_csv
+    paths = athlete_files(args.directory)
+    if not paths:
+        print(f"Tidak ada file data atlet di {args.directory}")
+        return 1
+    start = time.perf_counter()
+    rows = build_report(paths, args.date, args.jobs)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(rows, out)
+        else:
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+    finally:
+        if args.output:
+            out.close()
+    print(f"{len(rows)} atlet diringkas dalam {time.perf_counter() - start:.2f} detik", file=sys.stderr)
+    for row in rows:
+        if row["error"]:
+            print(f"{row['athlete']}: gagal dibaca ({row['error']})", file=sys.stderr)
+    return 0
+
+
+def cmd_merge(args):
+    from analyzer_merge import merge_files
+    start = time.perf_counter()
+    data, summary, output = merge_files(args.inputs, args.output, args.storage)
+    if args.output and os.path.splitext(os.path.basename(args.output))[0] == os.path.splitext(DATA_FILE)[0]:
+        # running_data di backend lain tidak akan pernah dibaca aplikasi
+        active = store_path(os.path.join(os.path.dirname(args.output), DATA_FILE))
+        if os.path.abspath(output) != os.path.abspath(active):
+            print(f"Peringatan: aplikasi (RUN_ANALYZER_STORAGE={default_kind()}) membaca {active}, "
+                  f"bukan {output}", file=sys.stderr)
+    for item in summary:
+        print(f"{item['input']}: {item['sessions']} sesi, {item['added']} baru, "
+              f"{item['duplicates']} ganda")
+    print(f"{len(data['history'])} hari, {data['history'].session_total()} sesi ditulis ke "
+          f"{output} dalam {time.perf_counter() - start:.2f} detik")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="run_Analyzer_Pro.py")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("migrate-sqlite", help="pindahkan data JSON ke database SQLite")
+    p.add_argument("--data", default=DATA_FILE, help="file JSON sumber")
+    p.add_argument("--db", help="file database tujuan (default: <data>.db)")
+    p.set_defaults(func=cmd_migrate_sqlite)
+
+    p = sub.add_parser("to-binary", help="ubah data JSON ke format biner (RUN_ANALYZER_STORAGE=binary)")
+    p.add_argument("--data", default=DATA_FILE, help="file JSON sumber")
+    p.add_argument("--output", help="file biner tujuan (default: <data>.runb)")
+    p.set_defaults(func=cmd_to_binary)
+
+    p = sub.add_parser("to-json", help="ubah file biner kembali ke JSON")
+    p.add_argument("binary")
+    p.add_argument("--output", default=DATA_FILE)
+    p.set_defaults(func=cmd_to_json)
+
+    p = sub.add_parser("merge", help="gabungkan data beberapa perangkat tanpa sesi ganda")
+    p.add_argument("inputs", nargs="+", help="file JSON, folder .shards, file .runb atau .db")
+    p.add_argument("--output", help=f"tujuan (default: {DATA_FILE} di backend aktif)")
+    p.add_argument("--storage", help="backend tujuan (default: dari ekstensi --output, "
+                                     "selain itu RUN_ANALYZER_STORAGE)")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("stats", help="agregat harian/mingguan/bulanan seluruh riwayat")
+    p.add_argument("--data", default=DATA_FILE)
+    p.add_argument("--period", choices=["day", "week", "month"], default="month")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("import", help="import sesi dari file CSV/GPX/TCX")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--data", default=DATA_FILE)
+    p.add_argument("--berat", type=float, help="berat badan (kg) jika tidak ada di file")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("report", help="laporan mingguan semua atlet dalam satu folder")
+    p.add_argument("directory", help="folder berisi file data atlet (*.json)")
+    p.add_argument("--date", help="tanggal laporan YYYY-MM-DD (default: hari ini)")
+    p.add_argument("--format", choices=["json", "csv"], default="json")
+    p.add_argument("--output", help="file tujuan (default: stdout)")
+    p.add_argument("--jobs", type=int, help="jumlah proses (default: jumlah core)")
+    p.set_defaults(func=cmd_report)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,27 @@
+"""Rumus inti Run Analyzer.
+
+Semua fungsi bekerja untuk angka tunggal (analyze di GUI) maupun array
+NumPy (analitik batch), sehingga rumus cukup diubah di satu tempat.
+"""
+
+KAL_PER_KG_KM = 0.653
+
+
+def hitung_pace(jarak, waktu):
+    """Pace dalam menit/km"""
+    return waktu / jarak
+
+
+def hitung_speed(jarak, waktu):
+    """Kecepatan dalam km/jam"""
+    return (jarak / waktu) * 60
+
+
+def hitung_kalori(jarak, berat):
+    """Perkiraan kalori terbakar"""
+    return jarak * berat * KAL_PER_KG_KM
+
+
+def berat_dari_kalori(jarak, kal):
+    """Berat badan saat sesi, dihitung balik dari kalori yang tersimpan"""
+    return kal / (jarak * KAL_PER_KG_KM)
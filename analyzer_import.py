@@ -0,0 +1,195 @@
+"""Import massal sesi lari dari ekspor jam tangan (CSV, GPX, TCX).
+
+File dibaca secara streaming (csv reader / iterparse) lewat rantai
+generator: parser -> sesi mentah -> op "session" yang sama dengan analyze().
+Pemanggil menerapkan op ke data lalu menyimpan sekali di akhir.
+"""
+import csv
+from datetime import datetime
+from itertools import islice
+import math
+import os
+import xml.etree.ElementTree as ET
+
+from analyzer_core import hitung_kalori, hitung_pace, hitung_speed
+from analyzer_storage import apply_op
+
+# sesi mentah per potongan saat file dibaca di thread latar (GUI)
+IMPORT_CHUNK = 1000
+
+CSV_COLUMNS = {
+    "date": ("date", "tanggal"),
+    "time": ("time", "jam"),
+    "start": ("start", "start_time", "timestamp", "waktu_mulai"),
+    "jarak": ("jarak", "distance", "distance_km"),
+    "jarak_m": ("distance_m", "distance_meters"),
+    "waktu": ("waktu", "duration", "duration_min"),
+    "waktu_s": ("duration_s", "duration_sec", "elapsed_time"),
+    "berat": ("berat", "weight", "weight_kg"),
+    "target": ("target", "target_jarak")
+}
+
+
+def parse_time(text):
+    """Waktu ISO -> datetime lokal naif; GPX/TCX memakai UTC (Z) sedangkan history memakai jam setempat"""
+    mulai = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+    if mulai.tzinfo is not None:
+        mulai = mulai.astimezone().replace(tzinfo=None)
+    return mulai
+
+
+def local_tag(elem):
+    return elem.tag.rsplit("}", 1)[-1]
+
+
+def read_csv(path):
+    """Baris CSV -> (mulai, jarak km, waktu menit, berat|None, target|None)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        col = {key: next((fields[a] for a in aliases if a in fields), None)
+               for key, aliases in CSV_COLUMNS.items()}
+
+        for row in reader:
+            if col["start"] and row[col["start"]]:
+                mulai = parse_time(row[col["start"]])
+            else:
+                jam = row[col["time"]] if col["time"] and row[col["time"]] else "00:00"
+                mulai = datetime.strptime(f"{row[col['date']].strip()} {jam.strip()[:5]}", "%Y-%m-%d %H:%M")
+
+            if col["jarak"]:
+                jarak = float(row[col["jarak"]])
+            else:
+                jarak = float(row[col["jarak_m"]]) / 1000
+            if col["waktu"]:
+                waktu = float(row[col["waktu"]])
+            else:
+                waktu = float(row[col["waktu_s"]]) / 60
+
+            berat = float(row[col["berat"]]) if col["berat"] and row[col["berat"]] else None
+            target = float(row[col["target"]]) if col["target"] and row[col["target"]] else None
+            yield mulai, jarak, waktu, berat, target
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Jarak dua titik GPS dalam km"""
+    r = 6371.0088
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.asin(math.sqrt(a))
+
+
+def read_gpx(path):
+    """Satu sesi per <trk>: jarak dari titik-titik GPS, waktu dari titik pertama/terakhir"""
+    jarak, prev, first, last = 0.0, None, None, None
+    for event, elem in ET.iterparse(path, events=("end",)):
+        tag = local_tag(elem)
+        if tag == "trkpt":
+            lat, lon = float(elem.get("lat")), float(elem.get("lon"))
+            if prev is not None:
+                jarak += haversine(prev[0], prev[1], lat, lon)
+            prev = (lat, lon)
+            for child in elem:
+                if local_tag(child) == "time" and child.text:
+                    last = parse_time(child.text)
+                    first = first or last
+            elem.clear()
+        elif tag == "trk":
+            if first is not None and last > first and jarak > 0:
+                yield first, jarak, (last - first).total_seconds() / 60, None, None
+            jarak, prev, first, last = 0.0, None, None, None
+            elem.clear()
+
+
+def read_tcx(path):
+    """Satu sesi per <Activity>: jumlah DistanceMeters dan TotalTimeSeconds semua lap"""
+    jarak, detik, mulai = 0.0, 0.0, None
+    for event, elem in ET.iterparse(path, events=("end",)):
+        tag = local_tag(elem)
+        if tag == "Lap":
+            mulai = mulai or parse_time(elem.get("StartTime"))
+            for child in elem:
+                name = local_tag(child)
+                if name == "DistanceMeters":
+                    jarak += float(child.text)
+                elif name == "TotalTimeSeconds":
+                    detik += float(child.text)
+            elem.clear()
+        elif tag == "Trackpoint":
+            elem.clear()
+        elif tag == "Activity":
+            if mulai is not None and jarak > 0 and detik > 0:
+                yield mulai, jarak / 1000, detik / 60, None, None
+            jarak, detik, mulai = 0.0, 0.0, None
+            elem.clear()
+
+
+READERS = {".csv": read_csv, ".gpx": read_gpx, ".tcx": read_tcx}
+
+
+def read_sessions(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Format tidak didukung: {path}")
+    return READERS[ext](path)
+
+
+def read_chunks(path, size=IMPORT_CHUNK):
+    """Sesi mentah satu file dalam potongan paling banyak size baris"""
+    rows = read_sessions(path)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def positive(value):
+    """Angka berhingga > 0; NaN/inf dari file lolos perbandingan <= 0"""
+    return value is not None and math.isfinite(value) and value > 0
+
+
+def session_ops(rows, data, berat=None):
+    """Sesi mentah -> op "session"; op langsung diterapkan agar total harian berurutan"""
+    if not positive(berat):
+        berat = None
+    for mulai, jarak, waktu, berat_sesi, target in rows:
+        if not positive(berat_sesi):
+            berat_sesi = berat
+        if berat_sesi is None:
+            raise ValueError("Berat badan tidak ada di file; isi berat default")
+        if not (positive(jarak) and positive(waktu)):
+            continue
+        if target is not None and not math.isfinite(target):
+            continue
+        tanggal = mulai.strftime("%Y-%m-%d")
+        if target is None:
+            target_sesi = data["daily_targets"].get(tanggal, 0)
+        else:
+            target_sesi = target
+        op = {
+            "op": "session",
+            "date": tanggal,
+            "session": {
+                "time": mulai.strftime("%H:%M"),
+                "jarak": jarak,
+                "waktu": waktu,
+                "pace": hitung_pace(jarak, waktu),
+                "speed": hitung_speed(jarak, waktu),
+                "kal": hitung_kalori(jarak, berat_sesi),
+                "target": target_sesi,
+                "total_jarak_harian": data["daily_distances"].get(tanggal, 0) + jarak
+            },
+            "target": target
+        }
+        apply_op(data, op)
+        yield op
+
+
+def import_files(paths, data, berat=None):
+    """Mengimpor semua file ke data di memori; mengembalikan daftar op untuk disimpan"""
+    ops = []
+    for path in paths:
+        ops.extend(session_ops(read_sessions(path), data, berat))
+    return ops
@@ -0,0 +1,279 @@
+"""Endpoint lokal untuk mengirim sesi lari tanpa lewat tab Input.
+
+Aktif dengan RUN_ANALYZER_INGEST=127.0.0.1:8765 (hanya alamat loopback)
+atau RUN_ANALYZER_INGEST=unix:/path/ke/socket. Server HTTP kecil berbasis
+asyncio berjalan di thread sendiri, di samping event loop Tk.
+
+    POST /sessions   satu sesi (objek JSON) atau daftar sesi
+    GET  /health     status dan jumlah sesi yang diterima
+
+Bentuk sesi sama dengan record history dari analyze(), ditambah "date":
+    {"date": "2025-03-14", "time": "06:30", "jarak": 5.2, "waktu": 28.5,
+     "kal": 330, "target": 8}
+date dan time boleh kosong (hari/jam sekarang); kal boleh diganti "berat"
+(kg). pace, speed dan total_jarak_harian selalu dihitung ulang.
+
+Satu request divalidasi utuh lalu masuk antrean sebagai satu batch; thread
+GUI mengambil antrean dengan after() dan menerapkan batch yang ada sekaligus
+(dibatasi waktu), lalu UI dirender ulang sekali untuk semuanya.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime
+import json
+import math
+import os
+import queue
+import re
+import threading
+import time
+
+from analyzer_core import hitung_kalori, hitung_pace, hitung_speed
+from analyzer_storage import apply_op
+
+INGEST_ENV = "RUN_ANALYZER_INGEST"
+LOOPBACK = ("127.0.0.1", "localhost", "::1")
+MAX_BODY = 16 * 1024 * 1024
+MAX_BATCH = 10000
+DRAIN_MS = 16
+DRAIN_BUDGET = 0.008
+# jarak minimum antar render ulang yang dipicu ingest, dalam detik
+REFRESH_INTERVAL = 0.25
+TIME_PATTERN = re.compile(r"([0-9]{2}):([0-9]{2})")
+
+
+def parse_number(raw, key):
+    """Angka berhingga dari field key; NaN/inf akan merusak indeks pace dan statistik"""
+    value = raw[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{key} harus angka")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{key} harus angka berhingga")
+    return value
+
+
+def parse_session(raw, now=None):
+    """Memvalidasi satu sesi kiriman; mengembalikan dict sesi + "date" atau ValueError"""
+    if not isinstance(raw, dict):
+        raise ValueError("sesi harus objek JSON")
+    now = now or datetime.now()
+    tanggal = raw.get("date") or now.strftime("%Y-%m-%d")
+    jam = raw.get("time") or now.strftime("%H:%M")
+    if not isinstance(tanggal, str) or not isinstance(jam, str):
+        raise ValueError("date dan time harus teks")
+    # fromisoformat menerima juga 20250314 dan 2025-W11-5; history memakai kunci YYYY-MM-DD
+    tanggal = datetime.strptime(tanggal, "%Y-%m-%d").date().isoformat()
+    match = TIME_PATTERN.fullmatch(jam)
+    if not match or not (int(match[1]) < 24 and int(match[2]) < 60):
+        raise ValueError(f"jam harus HH:MM: {jam}")
+    jarak = parse_number(raw, "jarak")
+    waktu = parse_number(raw, "waktu")
+    if jarak <= 0 or waktu <= 0:
+        raise ValueError("jarak dan waktu harus > 0")
+    if raw.get("kal") is not None:
+        kal = parse_number(raw, "kal")
+    elif raw.get("berat") is not None:
+        berat = parse_number(raw, "berat")
+        if berat <= 0:
+            raise ValueError("berat harus > 0")
+        kal = hitung_kalori(jarak, berat)
+    else:
+        raise ValueError("isi kal atau berat")
+    if kal < 0:
+        raise ValueError("kal tidak boleh negatif")
+    target = raw.get("target")
+    if target is not None:
+        target = parse_number(raw, "target")
+        if target <= 0:
+            raise ValueError("target harus > 0")
+    return {"date": tanggal, "time": jam, "jarak": jarak,
+            "waktu": waktu, "kal": kal, "target": target}
+
+
+def parse_body(body):
+    """Body request -> daftar sesi tervalidasi (ditolak semua jika satu saja salah)"""
+    raw = json.loads(body)
+    items = raw if isinstance(raw, list) else [raw]
+    if len(items) > MAX_BATCH:
+        raise ValueError(f"paling banyak {MAX_BATCH} sesi per request")
+    now = datetime.now()
+    sessions = []
+    for i, item in enumerate(items):
+        try:
+            sessions.append(parse_session(item, now))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"sesi ke-{i}: {e!r}") from None
+    return sessions
+
+
+def session_op(sesi, data):
+    """Sesi kiriman -> op "session", seperti yang dibuat analyze()"""
+    tanggal = sesi["date"]
+    target = sesi["target"]
+    return {
+        "op": "session",
+        "date": tanggal,
+        "session": {
+            "time": sesi["time"],
+            "jarak": sesi["jarak"],
+            "waktu": sesi["waktu"],
+            "pace": hitung_pace(sesi["jarak"], sesi["waktu"]),
+            "speed": hitung_speed(sesi["jarak"], sesi["waktu"]),
+            "kal": sesi["kal"],
+            "target": target if target is not None else data["daily_targets"].get(tanggal, 0),
+            "total_jarak_harian": data["daily_distances"].get(tanggal, 0) + sesi["jarak"]
+        },
+        "target": target
+    }
+
+
+def parse_address(text):
+    """"host:port" atau "unix:/path" -> ("tcp", host, port) / ("unix", path)"""
+    if text.startswith("unix:"):
+        return ("unix", text[5:])
+    host, _, port = text.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    if host not in LOOPBACK:
+        raise ValueError(f"Ingest hanya boleh di alamat loopback, bukan {host}")
+    return ("tcp", host, int(port))
+
+
+class IngestServer(threading.Thread):
+    """Server HTTP asyncio di thread latar; batch tervalidasi masuk ke self.batches"""
+
+    def __init__(self, address):
+        super().__init__(name="ingest", daemon=True)
+        self.address = parse_address(address) if isinstance(address, str) else address
+        self.batches = queue.SimpleQueue()
+        # sisa batch yang belum diterapkan karena jatah waktu giliran sebelumnya habis
+        self.rest = deque()
+        self.received = 0
+        self.ready = threading.Event()
+        self.error = None
+        self.loop = None
+        self.server = None
+
+    @classmethod
+    def from_env(cls):
+        """Server jika RUN_ANALYZER_INGEST diisi, selain itu None"""
+        address = os.environ.get(INGEST_ENV, "")
+        return cls(address) if address else None
+
+    def start(self):
+        super().start()
+        self.ready.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.listen())
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        self.loop.run_forever()
+        # koneksi keep-alive yang masih terbuka ditutup paksa
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    async def listen(self):
+        if self.address[0] == "unix":
+            if os.path.exists(self.address[1]):
+                os.unlink(self.address[1])
+            self.server = await asyncio.start_unix_server(self.handle, self.address[1])
+        else:
+            self.server = await asyncio.start_server(self.handle, self.address[1], self.address[2])
+            # port 0 -> port yang dipilih OS
+            self.address = ("tcp", self.address[1], self.server.sockets[0].getsockname()[1])
+
+    async def handle(self, reader, writer):
+        """Satu koneksi HTTP/1.1 (keep-alive) berisi satu atau lebih request"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    self.respond(writer, 413, {"error": "body terlalu besar"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, reply = self.route(method, path, body)
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                self.respond(writer, status, reply, close)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError, ValueError):
+            # koneksi rusak, request tidak valid, atau server ditutup
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok", "received": self.received}
+        if path != "/sessions":
+            return 404, {"error": "tidak ditemukan"}
+        if method != "POST":
+            return 405, {"error": "gunakan POST"}
+        try:
+            sessions = parse_body(body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        if sessions:
+            self.batches.put(sessions)
+            self.received += len(sessions)
+        return 202, {"accepted": len(sessions)}
+
+    def respond(self, writer, status, reply, close=False):
+        body = json.dumps(reply).encode()
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed", 413: "Payload Too Large"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + body)
+
+    def ops(self, data, budget=DRAIN_BUDGET):
+        """Menerapkan sesi yang mengantre ke data (di thread GUI) dan menghasilkan op-nya.
+
+        Berhenti saat jatah waktu habis; sisanya menunggu giliran berikutnya.
+        """
+        deadline = time.perf_counter() + budget
+        while True:
+            if not self.rest:
+                try:
+                    self.rest.extend(self.batches.get_nowait())
+                except queue.Empty:
+                    return
+            while self.rest:
+                if time.perf_counter() >= deadline:
+                    return
+                op = session_op(self.rest.popleft(), data)
+                apply_op(data, op)
+                yield op
+
+    def close(self):
+        if self.loop is not None and self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.join(2.0)
+        if self.address[0] == "unix" and os.path.exists(self.address[1]):
+            os.unlink(self.address[1])
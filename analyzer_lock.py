@@ -0,0 +1,115 @@
+"""Kunci file advisory agar beberapa proses Run Analyzer bisa menulis data yang sama.
+
+Kunci dipegang sebentar di sekitar baca-ekor-journal + tulis (lihat
+SharedJournal di analyzer_storage), bukan selama aplikasi berjalan. Isi
+file kunci adalah versi data hasil pemadatan terakhir. Di
+POSIX memakai fcntl.flock, di Windows msvcrt.locking pada byte pertama file
+kunci. Di dalam satu proses kunci bersifat reentrant dan juga menyerialkan
+thread (GUI dan thread penyimpanan).
+"""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+LOCK_SUFFIX = ".lock"
+VERSION_WIDTH = 20
+
+
+class FileLock:
+    """Kunci eksklusif antar proses pada <path>; bisa dipakai sebagai context manager"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+        self.depth = 0
+        self.thread_lock = threading.RLock()
+
+    def acquire(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self.lock_fd()
+            except BaseException:
+                if self.fd is not None:
+                    os.close(self.fd)
+                    self.fd = None
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+
+    def lock_fd(self):
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                # LK_LOCK sendiri hanya mencoba 10 kali lalu menyerah
+                msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(self.fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(self.fd)
+                self.fd = None
+        self.thread_lock.release()
+
+    def read_version(self):
+        """Versi yang dicatat di file kunci (None jika belum ada); kunci harus dipegang"""
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        raw = os.read(self.fd, VERSION_WIDTH).strip()
+        return int(raw) if raw else None
+
+    def write_version(self, version):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, str(version).encode().ljust(VERSION_WIDTH))
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class NoLock:
+    """Pengganti FileLock untuk store read-only: tidak membuat file apa pun.
+
+    Dipakai saat data hanya dibaca (laporan, input merge), mis. dari share
+    yang read-only; tulisan proses lain yang sedang berjalan bisa terbaca
+    setengah jalan di journal, tetapi baris yang belum lengkap dilewati.
+    """
+
+    def acquire(self):
+        pass
+
+    def release(self):
+        pass
+
+    def read_version(self):
+        return None
+
+    def write_version(self, version):
+        raise PermissionError("Store dibuka read-only")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
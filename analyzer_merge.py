@@ -0,0 +1,223 @@
+"""Menggabungkan data dari beberapa perangkat (laptop, desktop, ...) tanpa sesi ganda.
+
+Setiap input dibaca per tanggal secara streaming: snapshot running_data.json
+per potongan baris ditambah journal-nya (file lama json.dump dibaca
+sekaligus), atau per tanggal untuk folder shard, file .runb dan .db. Sesi
+masuk ke satu SessionStore (kolom array) yang menjadi sisi build hash-join:
+tiap tanggal input dicocokkan dengan sesi yang sudah ada di tanggal itu
+lewat key isi (jam, jarak, waktu).
+
+Sesi kembar dihitung sebagai multiset: dua sesi sama di satu input tetap
+dua, tetapi salinannya di input lain tidak ditambahkan lagi. Sesi per
+tanggal diurutkan menurut jam, lalu daily_distances dan total_jarak_harian
+dihitung ulang. Konflik daily_targets diselesaikan dengan aturan tetap:
+target dari input yang sesi terakhirnya di tanggal itu paling akhir; jika
+sama, target terbesar.
+
+Backend tujuan mengikuti ekstensi output (.json, .shards, .runb, .db)
+kecuali dipilih sendiri; tanpa output, hasil ditulis ke running_data di
+backend aktif (RUN_ANALYZER_STORAGE) agar langsung terbaca aplikasi.
+"""
+from array import array
+from collections import Counter
+import json
+import os
+
+from analyzer_search import to_minutes
+from analyzer_sessions import NO_TIME, SessionStore
+from analyzer_storage import (DATA_FILE, JOURNAL_SUFFIX, MANIFEST_FILE, SNAPSHOT_HEADER, LazyHistory,
+                              ShardStore, SqliteStore, open_store, snapshot_chunks, snapshot_seq)
+
+# ekstensi output -> backend tujuan bila tidak dipilih
+OUTPUT_KINDS = {".json": "journal", ".shards": "shard", ".runb": "binary", ".db": "sqlite"}
+
+
+def session_key(jam, jarak, waktu):
+    """Key isi sesi; jam berupa menit sejak tengah malam (atau teks aslinya)"""
+    return (jam, round(jarak, 6), round(waktu, 6))
+
+
+def journal_overlay(path, seq):
+    """Efek journal terhadap snapshot-nya: (clear, tanggal dihapus, sesi tambahan, target)"""
+    cleared = False
+    dropped, extra, targets = set(), {}, {}
+    journal_path = path + JOURNAL_SUFFIX
+    if not os.path.exists(journal_path):
+        return cleared, dropped, extra, targets
+    with open(journal_path, 'r') as f:
+        for line in f:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            if op["seq"] <= seq:
+                continue
+            kind = op["op"]
+            if kind == "clear":
+                cleared = True
+                dropped.clear()
+                extra.clear()
+                targets.clear()
+            elif kind == "delete":
+                dropped.add(op["date"])
+                extra.pop(op["date"], None)
+                targets[op["date"]] = None
+            elif kind == "session":
+                extra.setdefault(op["date"], []).append(op["session"])
+                if op.get("target") is not None:
+                    targets[op["date"]] = op["target"]
+    return cleared, dropped, extra, targets
+
+
+class JsonSource:
+    """running_data.json + journal, dibaca per tanggal"""
+
+    def __init__(self, path):
+        self.path = path
+        self.targets = {}
+
+    def days(self):
+        cleared, dropped, extra, targets = journal_overlay(self.path, snapshot_seq(self.path))
+        rest = {}
+        with open(self.path, 'r') as f:
+            if f.readline().rstrip("\n") == SNAPSHOT_HEADER:
+                chunks = snapshot_chunks(f, rest)
+            else:
+                f.seek(0)
+                rest = json.load(f)
+                chunks = [rest.pop("history", {})]
+            for chunk in chunks:
+                if cleared:
+                    continue
+                for tanggal, runs in chunk.items():
+                    if tanggal not in dropped:
+                        yield tanggal, runs + extra.pop(tanggal, [])
+        yield from extra.items()
+        if not cleared:
+            self.targets = {t: v for t, v in rest.get("daily_targets", {}).items() if t not in dropped}
+        for tanggal, target in targets.items():
+            if target is None:
+                self.targets.pop(tanggal, None)
+            else:
+                self.targets[tanggal] = target
+
+
+class StoreSource:
+    """Folder shard, file .runb atau .db: tanggal diambil satu per satu lewat LazyHistory"""
+
+    def __init__(self, store):
+        self.store = store
+        self.targets = {}
+
+    def days(self):
+        try:
+            data = self.store.load()
+            history = data["history"]
+            for tanggal in sorted(history):
+                runs = list(history[tanggal])
+                if isinstance(history, LazyHistory):
+                    history.loaded.pop(tanggal, None)
+                yield tanggal, runs
+            self.targets = data["daily_targets"]
+        finally:
+            self.store.close()
+
+
+def open_source(path):
+    """Input sesuai jenisnya, dibaca read-only tanpa kunci; file/folder yang tidak ada tidak dibuat"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Input tidak ditemukan: {path}")
+    if os.path.isdir(path):
+        if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            raise ValueError(f"Folder bukan data shard (tidak ada {MANIFEST_FILE}): {path}")
+        return StoreSource(ShardStore(path, readonly=True))
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".runb":
+        from analyzer_binary import BinaryStore
+        return StoreSource(BinaryStore(path, readonly=True))
+    if ext == ".db":
+        return StoreSource(SqliteStore(path, readonly=True))
+    return JsonSource(path)
+
+
+def row_key(history, row):
+    menit = history.menit[row]
+    jam = history.odd_times[row] if menit == NO_TIME else menit
+    return session_key(jam, history.jarak[row], history.waktu[row])
+
+
+def merge_day(history, tanggal, runs):
+    """Probe satu tanggal input ke history; mengembalikan (ditambah, ganda, jam terakhir)"""
+    rows = history.rows.get(tanggal)
+    existing = Counter(row_key(history, r) for r in rows) if rows is not None else Counter()
+    seen = Counter()
+    new = []
+    last = None
+    for sesi in runs:
+        menit = to_minutes(sesi.get("time"))
+        if menit != NO_TIME and (last is None or menit > last):
+            last = menit
+        key = session_key(menit if menit != NO_TIME else sesi.get("time"), sesi["jarak"], sesi["waktu"])
+        seen[key] += 1
+        if seen[key] > existing[key]:
+            new.append(history.add_row(sesi))
+    if new:
+        history.rows[tanggal] = (rows if rows is not None else array("I")) + array("I", new)
+    return len(new), len(runs) - len(new), last
+
+
+def merge_sources(paths):
+    """Menggabungkan semua input; mengembalikan (data, ringkasan per input)"""
+    history = SessionStore()
+    # tanggal -> (menit sesi terakhir di input pemilik target, target)
+    chosen = {}
+    summary = []
+    for path in paths:
+        source = open_source(path)
+        last = {}
+        added = duplicates = 0
+        for tanggal, runs in source.days():
+            n_added, n_dup, jam = merge_day(history, tanggal, runs)
+            added += n_added
+            duplicates += n_dup
+            if jam is not None:
+                last[tanggal] = max(jam, last.get(tanggal, jam))
+        for tanggal, target in source.targets.items():
+            if target is None:
+                continue
+            candidate = (last.get(tanggal, -1), target)
+            if tanggal not in chosen or candidate > chosen[tanggal]:
+                chosen[tanggal] = candidate
+        summary.append({"input": path, "sessions": added + duplicates, "added": added,
+                        "duplicates": duplicates})
+
+    # tanggal urut, sesi per tanggal urut jam (jam tidak dikenal di akhir)
+    menit, jarak = history.menit, history.jarak
+    history.rows = {t: array("I", sorted(history.rows[t], key=menit.__getitem__))
+                    for t in sorted(history.rows)}
+    data = {
+        "history": history,
+        "daily_targets": {t: chosen[t][1] for t in sorted(chosen)},
+        "daily_distances": {t: sum(jarak[r] for r in rows) for t, rows in history.rows.items()}
+    }
+    return data, summary
+
+
+def merge_files(paths, output=None, kind=None):
+    """Menggabungkan paths lalu menulis hasilnya ke output.
+
+    Backend kind, atau dari ekstensi output; tanpa output ditulis ke
+    running_data di backend aktif. Mengembalikan (data, ringkasan, path yang
+    benar-benar ditulis).
+    """
+    data, summary = merge_sources(paths)
+    if output is None:
+        output = DATA_FILE
+    else:
+        kind = kind or OUTPUT_KINDS.get(os.path.splitext(output)[1].lower())
+    store = open_store(output, kind)
+    try:
+        store.commit(data, None)
+    finally:
+        store.close()
+    return data, summary, getattr(store, "dir", None) or store.path
@@ -0,0 +1,155 @@
+"""Instrumentasi opsional untuk mencari bagian yang lambat.
+
+Aktif dengan RUN_ANALYZER_PROFILE=1 atau `python run_Analyzer_Pro.py --profile`.
+Setiap panggilan load_data/save_data/analyze/show_*/apply_theme diukur
+waktunya; untuk render, waktu geometry Tk (update_idletasks) dan jumlah
+widget yang dibuat/dihancurkan dicatat terpisah. Angka terakhir tampil di
+overlay pojok kanan bawah dan ditulis ke log berotasi.
+
+`--profile-analyze FILE` (RUN_ANALYZER_PROFILE_ANALYZE=FILE) menjalankan
+satu siklus analyze pertama di bawah cProfile dan menyimpan hasilnya ke FILE.
+"""
+import cProfile
+import io
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import pstats
+import time
+
+PROFILE_ENV = "RUN_ANALYZER_PROFILE"
+ANALYZE_ENV = "RUN_ANALYZER_PROFILE_ANALYZE"
+PROFILE_LOG = "run_analyzer_profile.log"
+PROFILED = ("load_data", "save_data", "analyze", "apply_theme")
+OVERLAY_LINES = 6
+
+
+def parse_profile_flags(argv):
+    """Mengubah --profile / --profile-analyze FILE menjadi env var; sisanya dikembalikan"""
+    rest = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--profile":
+            os.environ[PROFILE_ENV] = "1"
+        elif arg == "--profile-analyze":
+            os.environ[PROFILE_ENV] = "1"
+            os.environ[ANALYZE_ENV] = next(args, "analyze.prof")
+        else:
+            rest.append(arg)
+    return rest
+
+
+def widget_ids(root):
+    """Nama semua widget di bawah root (termasuk Toplevel)"""
+    names = set()
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        names.add(str(widget))
+        stack.extend(widget.winfo_children())
+    return names
+
+
+class Profiler:
+    """Pengukur waktu per method yang dipasang pada instance RunningApp"""
+
+    def __init__(self, log_path=PROFILE_LOG, analyze_out=None):
+        self.stats = {}
+        self.recent = []
+        self.analyze_out = analyze_out
+        self.overlay = None
+        self.overlay_pending = False
+        self.log = logging.getLogger("run_analyzer.profile")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        if not self.log.handlers:
+            handler = RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=3)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+
+    @classmethod
+    def from_env(cls):
+        """Profiler jika diaktifkan lewat env var, selain itu None"""
+        if os.environ.get(PROFILE_ENV, "") in ("", "0"):
+            return None
+        return cls(analyze_out=os.environ.get(ANALYZE_ENV) or None)
+
+    def install(self, app):
+        """Membungkus method yang diukur pada instance app (bukan pada class)"""
+        names = list(PROFILED) + sorted(n for n in dir(type(app)) if n.startswith("show_"))
+        for name in names:
+            setattr(app, name, self.wrap(app, name, getattr(app, name)))
+
+    def wrap(self, app, name, method):
+        render = name.startswith("show_") or name == "apply_theme"
+
+        def timed_call(*args, **kwargs):
+            before = widget_ids(app) if render else None
+            profile = None
+            if name == "analyze" and self.analyze_out:
+                profile = cProfile.Profile()
+                profile.enable()
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            layout = created = destroyed = None
+            if render or profile is not None:
+                start = time.perf_counter()
+                app.update_idletasks()
+                layout = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self.dump_profile(profile)
+            if before is not None:
+                after = widget_ids(app)
+                created, destroyed = len(after - before), len(before - after)
+            self.add(app, name, elapsed, layout, created, destroyed)
+            return result
+
+        return timed_call
+
+    def dump_profile(self, profile):
+        """Menyimpan satu siklus analyze ke file dan mencatat 15 fungsi teratas ke log"""
+        profile.dump_stats(self.analyze_out)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(15)
+        self.log.info("cProfile analyze -> %s\n%s", self.analyze_out, out.getvalue())
+        self.analyze_out = None
+
+    def add(self, app, name, elapsed, layout, created, destroyed):
+        stat = self.stats.setdefault(name, [0, 0.0, 0.0])
+        stat[0] += 1
+        stat[1] += elapsed
+        stat[2] = max(stat[2], elapsed)
+        line = f"{name} {elapsed * 1000:.2f} ms"
+        if layout is not None:
+            line += f" layout {layout * 1000:.2f} ms"
+        if created is not None:
+            line += f" widget +{created} -{destroyed}"
+        self.log.info(line)
+        self.recent = (self.recent + [line])[-OVERLAY_LINES:]
+        if self.overlay is not None and not self.overlay_pending:
+            self.overlay_pending = True
+            app.after_idle(self.update_overlay)
+
+    def attach_overlay(self, app):
+        """Label kecil di pojok kanan bawah window utama berisi pengukuran terakhir"""
+        import tkinter as tk
+        self.overlay = tk.Label(app, bg="#222222", fg="#ffd166", font=("Courier",8),
+                                justify="left", anchor="w", padx=6, pady=4)
+        self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+        self.update_overlay()
+
+    def update_overlay(self):
+        self.overlay_pending = False
+        if self.overlay is not None and self.overlay.winfo_exists():
+            self.overlay.configure(text="\n".join(self.recent) or "profiling aktif")
+            self.overlay.lift()
+
+    def close(self):
+        """Mencatat ringkasan total per method ke log"""
+        for name, (calls, total, worst) in sorted(self.stats.items(), key=lambda kv: -kv[1][1]):
+            self.log.info("total %s: %d panggilan, %.1f ms, terlama %.2f ms",
+                          name, calls, total * 1000, worst * 1000)
+        for handler in self.log.handlers:
+            handler.flush()
@@ -0,0 +1,119 @@
+"""Laporan mingguan banyak atlet tanpa GUI (tidak mengimpor tkinter).
+
+Setiap file data atlet (format running_data.json) diringkas di proses
+terpisah: progres hari ini terhadap target seperti tab Gizi, hasil sesi
+terakhir seperti tab Hasil, dan total minggu berjalan dari rollup. Data
+dibaca read-only dari backend yang terakhir dipakai aplikasi (folder shard,
+.runb, .db atau JSON), tanpa kunci, jadi share klub boleh read-only.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from datetime import date, timedelta
+import glob
+from itertools import repeat
+import os
+
+from analyzer_rollup import period_keys
+from analyzer_storage import DATA_FILE, MANIFEST_FILE, open_readonly
+
+REPORT_FIELDS = (
+    "athlete", "week", "target_harian", "jarak_hari_ini", "sisa_jarak", "persentase",
+    "tercapai", "pace", "speed", "kal", "sesi_terakhir", "minggu_jarak", "minggu_waktu",
+    "minggu_kal", "minggu_sesi", "minggu_pace", "minggu_target", "minggu_persentase",
+    "hari_tercapai", "hari_bertarget", "error"
+)
+# file yang menandai data atlet per backend; semuanya dibaca lewat path .json-nya
+BACKEND_FILES = ("{}.json", os.path.join("{}.shards", MANIFEST_FILE), "{}.runb", "{}.db")
+
+
+def athlete_files(directory):
+    """Data atlet: <dir>/<atlet>.* dan <dir>/<atlet>/running_data.* (JSON, shard, .runb atau .db)"""
+    files = []
+    for name in ("*", os.path.join("*", os.path.splitext(DATA_FILE)[0])):
+        found = set()
+        for pattern in BACKEND_FILES:
+            for match in glob.glob(os.path.join(directory, pattern.format(name))):
+                if os.path.basename(match) == MANIFEST_FILE:
+                    match = os.path.dirname(match)
+                found.add(os.path.splitext(match)[0] + ".json")
+        files += sorted(found)
+    return files
+
+
+def athlete_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if os.path.basename(path) == DATA_FILE:
+        return os.path.basename(os.path.dirname(path)) or stem
+    return stem
+
+
+def athlete_summary(path, hari):
+    """Ringkasan satu atlet untuk tanggal hari ("YYYY-MM-DD"); data yang rusak menjadi baris error"""
+    try:
+        store = open_readonly(path)
+        try:
+            return summarize(path, store.load(), hari)
+        finally:
+            store.close()
+    except Exception as e:
+        row = dict.fromkeys(REPORT_FIELDS)
+        row.update(athlete=athlete_name(path), week=period_keys(hari)[0], error=f"{type(e).__name__}: {e}")
+        return row
+
+
+def summarize(path, data, hari):
+    """Baris laporan dari data atlet yang sudah dimuat"""
+    history = data["history"]
+    targets = data["daily_targets"]
+    distances = data["daily_distances"]
+    minggu = period_keys(hari)[0]
+    row = dict.fromkeys(REPORT_FIELDS)
+    row.update(athlete=athlete_name(path), week=minggu)
+
+    # progres hari ini, seperti tab Gizi
+    target = targets.get(hari)
+    jarak = distances.get(hari, 0)
+    row["jarak_hari_ini"] = jarak
+    if target:
+        sisa = target - jarak
+        row.update(target_harian=target, sisa_jarak=max(0.0, sisa),
+                   persentase=jarak / target * 100, tercapai=sisa <= 0)
+
+    # sesi terakhir sampai tanggal laporan, seperti tab Hasil
+    past = [t for t in history if t <= hari]
+    if past:
+        terakhir = max(past)
+        sesi = history[terakhir][-1]
+        row.update(pace=sesi["pace"], speed=sesi["speed"], kal=sesi["kal"],
+                   sesi_terakhir=f"{terakhir} {sesi['time']}")
+
+    week_jarak, week_waktu, week_kal, week_sesi = data["rollup"].get("week", minggu)
+    row.update(minggu_jarak=week_jarak, minggu_waktu=week_waktu, minggu_kal=week_kal,
+               minggu_sesi=week_sesi, minggu_pace=week_waktu / week_jarak if week_jarak else None)
+
+    senin = date.fromisoformat(hari) - timedelta(days=date.fromisoformat(hari).weekday())
+    hari_minggu = [(senin + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    bertarget = [t for t in hari_minggu if targets.get(t)]
+    target_minggu = sum(targets[t] for t in bertarget)
+    row.update(
+        minggu_target=target_minggu,
+        minggu_persentase=sum(distances.get(t, 0) for t in bertarget) / target_minggu * 100
+        if target_minggu else None,
+        hari_tercapai=sum(1 for t in bertarget if distances.get(t, 0) >= targets[t]),
+        hari_bertarget=len(bertarget))
+    return row
+
+
+def build_report(paths, hari=None, jobs=None):
+    """Meringkas semua atlet paralel di process pool; urutan hasil sama dengan paths"""
+    hari = hari or date.today().strftime("%Y-%m-%d")
+    if jobs == 1:
+        return [athlete_summary(path, hari) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(athlete_summary, paths, repeat(hari), chunksize=1))
+
+
+def write_csv(rows, f):
+    writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
@@ -0,0 +1,93 @@
+"""Indeks ringkasan per minggu, bulan dan tahun.
+
+Setiap bucket menyimpan [jarak, waktu, kalori, jumlah sesi] dan diperbarui
+langsung saat sesi ditambah atau tanggal dihapus, sehingga tampilan ringkasan
+tidak perlu menelusuri seluruh history.
+"""
+from datetime import date
+from functools import lru_cache
+
+PERIODS = ("week", "month", "year")
+
+
+@lru_cache(maxsize=4096)
+def period_keys(tanggal):
+    """Key bucket untuk tanggal "YYYY-MM-DD": ("2025-W03", "2025-03", "2025")"""
+    tahun, minggu, _ = date.fromisoformat(tanggal).isocalendar()
+    return f"{tahun}-W{minggu:02d}", tanggal[:7], tanggal[:4]
+
+
+def today_keys():
+    return period_keys(date.today().strftime("%Y-%m-%d"))
+
+
+class Rollup:
+    """Total per periode yang dipelihara secara inkremental"""
+
+    def __init__(self):
+        self.buckets = {period: {} for period in PERIODS}
+        self.total = [0.0, 0.0, 0.0, 0]
+
+    def clear(self):
+        for buckets in self.buckets.values():
+            buckets.clear()
+        self.total = [0.0, 0.0, 0.0, 0]
+
+    def add(self, tanggal, jarak, waktu, kal, sesi=1):
+        for period, key in zip(PERIODS, period_keys(tanggal)):
+            bucket = self.buckets[period].get(key)
+            if bucket is None:
+                bucket = self.buckets[period][key] = [0.0, 0.0, 0.0, 0]
+            bucket[0] += jarak
+            bucket[1] += waktu
+            bucket[2] += kal
+            bucket[3] += sesi
+            if bucket[3] <= 0:
+                # hindari sisa pembulatan float saat bucket kosong lagi
+                del self.buckets[period][key]
+        total = self.total
+        total[0] += jarak
+        total[1] += waktu
+        total[2] += kal
+        total[3] += sesi
+
+    def add_session(self, tanggal, sesi):
+        self.add(tanggal, sesi["jarak"], sesi["waktu"], sesi["kal"])
+
+    def remove_day(self, tanggal, runs):
+        """Mengurangi total dengan semua sesi pada tanggal yang dihapus"""
+        jarak = waktu = kal = 0.0
+        n = 0
+        for sesi in runs:
+            jarak += sesi["jarak"]
+            waktu += sesi["waktu"]
+            kal += sesi["kal"]
+            n += 1
+        if n:
+            self.add(tanggal, -jarak, -waktu, -kal, -n)
+
+    def get(self, period, key):
+        """[jarak, waktu, kalori, sesi] untuk satu bucket (nol jika kosong)"""
+        return self.buckets[period].get(key, [0.0, 0.0, 0.0, 0])
+
+    @classmethod
+    def build(cls, history):
+        rollup = cls()
+        for tanggal, runs in history.items():
+            for sesi in runs:
+                rollup.add_session(tanggal, sesi)
+        return rollup
+
+    def copy(self):
+        return Rollup.from_json(self.to_json())
+
+    def to_json(self):
+        return {"total": self.total, **self.buckets}
+
+    @classmethod
+    def from_json(cls, raw):
+        rollup = cls()
+        rollup.total = list(raw["total"])
+        for period in PERIODS:
+            rollup.buckets[period] = {key: list(value) for key, value in raw[period].items()}
+        return rollup
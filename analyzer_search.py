@@ -0,0 +1,207 @@
+"""Indeks pencarian sesi: rentang tanggal, jarak, pace dan kalori.
+
+Setiap sesi menjadi satu baris di kolom array; untuk tiap kolom ada indeks
+terurut (array nilai + array nomor baris) yang dicari dengan bisect. Query
+memakai indeks dengan rentang tersempit lalu menyaring sisa syarat lewat
+kolom, jadi biayanya sebanding dengan jumlah kandidat, bukan jumlah sesi.
+
+Indeks diperbarui per op (session/delete/clear) sehingga tidak perlu
+dibangun ulang setelah analyze atau hapus tanggal.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from analyzer_sessions import NO_TIME, SessionStore
+
+KEYS = ("day", "jarak", "pace", "kal")
+# build() melapor progres setiap PROGRESS_EVERY tanggal
+PROGRESS_EVERY = 1000
+TYPECODES = {"day": "i", "jarak": "d", "pace": "d", "kal": "d"}
+
+
+def to_day(tanggal):
+    return date.fromisoformat(tanggal).toordinal()
+
+
+def to_minutes(jam):
+    try:
+        h, m = jam.split(":")
+        return int(h) * 60 + int(m)
+    except (AttributeError, ValueError):
+        return NO_TIME
+
+
+class SessionIndex:
+    """Kolom sesi + indeks terurut per kolom"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.cols = {key: array(code) for key, code in TYPECODES.items()}
+        self.pos = array("H")
+        self.menit = array("H")
+        self.keys = {key: array(code) for key, code in TYPECODES.items()}
+        self.ids = {key: array("I") for key in KEYS}
+        self.day_count = {}
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.pos) - self.dead
+
+    def add_row(self, day, jarak, waktu, kal, menit):
+        row = len(self.pos)
+        cols = self.cols
+        cols["day"].append(day)
+        cols["jarak"].append(jarak)
+        cols["pace"].append(waktu / jarak)
+        cols["kal"].append(kal)
+        self.pos.append(self.day_count.get(day, 0))
+        self.day_count[day] = self.day_count.get(day, 0) + 1
+        self.menit.append(menit)
+        return row
+
+    @classmethod
+    def build(cls, history, progress=None):
+        """Indeks untuk seluruh history (SessionStore dibaca langsung dari kolomnya).
+
+        progress(done, total, text) dipanggil berkala jika diberikan.
+        """
+        index = cls()
+        dates = sorted(history.rows if isinstance(history, SessionStore) else history)
+        total = len(dates) + len(KEYS)
+        if isinstance(history, SessionStore):
+            jarak, waktu, kal, menit = history.jarak, history.waktu, history.kal, history.menit
+            for i, tanggal in enumerate(dates):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                day = to_day(tanggal)
+                for r in history.rows[tanggal]:
+                    index.add_row(day, jarak[r], waktu[r], kal[r], menit[r])
+        else:
+            for i, tanggal in enumerate(dates):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                day = to_day(tanggal)
+                for sesi in history[tanggal]:
+                    index.add_row(day, sesi["jarak"], sesi["waktu"], sesi["kal"],
+                                  to_minutes(sesi.get("time")))
+        # baris ditambahkan urut tanggal, jadi indeks tanggal sudah terurut
+        for k, key in enumerate(KEYS):
+            if progress:
+                progress(len(dates) + k, total, f"urutkan {key}")
+            col = index.cols[key]
+            order = range(len(col)) if key == "day" else sorted(range(len(col)), key=col.__getitem__)
+            index.ids[key] = array("I", order)
+            index.keys[key] = array(TYPECODES[key], (col[i] for i in order))
+        return index
+
+    def add(self, tanggal, sesi):
+        row = self.add_row(to_day(tanggal), sesi["jarak"], sesi["waktu"], sesi["kal"],
+                           to_minutes(sesi.get("time")))
+        for key in KEYS:
+            value = self.cols[key][row]
+            i = bisect_right(self.keys[key], value)
+            self.keys[key].insert(i, value)
+            self.ids[key].insert(i, row)
+
+    def remove_day(self, tanggal):
+        day = to_day(tanggal)
+        keys, ids = self.keys["day"], self.ids["day"]
+        a, b = bisect_left(keys, day), bisect_right(keys, day)
+        rows = list(ids[a:b])
+        del keys[a:b]
+        del ids[a:b]
+        for key in KEYS[1:]:
+            keys, ids, col = self.keys[key], self.ids[key], self.cols[key]
+            for row in rows:
+                i = bisect_left(keys, col[row])
+                while ids[i] != row:
+                    i += 1
+                del keys[i]
+                del ids[i]
+        self.day_count.pop(day, None)
+        self.dead += len(rows)
+
+    def apply(self, op):
+        """Memperbarui indeks dengan op yang sama seperti apply_op"""
+        kind = op["op"]
+        if kind == "session":
+            self.add(op["date"], op["session"])
+        elif kind == "delete":
+            self.remove_day(op["date"])
+        elif kind == "clear":
+            self.clear()
+
+    def query(self, **ranges):
+        """Nomor baris sesi yang memenuhi semua rentang key=(lo, hi), terbaru dulu.
+
+        key: day (ordinal tanggal), jarak, pace, kal; lo/hi None berarti terbuka.
+        """
+        ranges = {key: r for key, r in ranges.items() if r is not None and r != (None, None)}
+        best = ("day", 0, len(self.keys["day"]))
+        for key, (lo, hi) in ranges.items():
+            keys = self.keys[key]
+            a = 0 if lo is None else bisect_left(keys, lo)
+            b = len(keys) if hi is None else bisect_right(keys, hi)
+            if b - a < best[2] - best[1]:
+                best = (key, a, b)
+        key, a, b = best
+        rows = self.ids[key][a:b]
+        for other, (lo, hi) in ranges.items():
+            if other == key:
+                continue
+            col = self.cols[other]
+            if lo is None:
+                rows = [r for r in rows if col[r] <= hi]
+            elif hi is None:
+                rows = [r for r in rows if col[r] >= lo]
+            else:
+                rows = [r for r in rows if lo <= col[r] <= hi]
+        rows = list(rows)
+        if key == "day":
+            rows.reverse()
+        else:
+            day = self.cols["day"]
+            rows.sort(key=lambda r: (-day[r], -r))
+        return rows
+
+    def session(self, row):
+        """(tanggal, nomor sesi di tanggal itu, jam, jarak, pace, kal) untuk ditampilkan"""
+        menit = self.menit[row]
+        return (date.fromordinal(self.cols["day"][row]).isoformat(), self.pos[row] + 1,
+                "--:--" if menit == NO_TIME else f"{menit // 60:02d}:{menit % 60:02d}",
+                self.cols["jarak"][row], self.cols["pace"][row], self.cols["kal"][row])
+
+
+def parse_day(text, end=False):
+    """"2025", "2025-03" atau "2025-03-14" -> ordinal awal (atau akhir jika end) periode"""
+    text = text.strip()
+    if not text:
+        return None
+    if len(text) == 4:
+        text = f"{text}-12-31" if end else f"{text}-01-01"
+    elif len(text) == 7:
+        if end:
+            tahun, bulan = int(text[:4]), int(text[5:])
+            nxt = date(tahun + bulan // 12, bulan % 12 + 1, 1)
+            return nxt.toordinal() - 1
+        text = f"{text}-01"
+    return to_day(text)
+
+
+def parse_pace(text):
+    """"4:30" atau "4.5" -> menit/km"""
+    text = text.strip()
+    if not text:
+        return None
+    if ":" in text:
+        m, s = text.split(":")
+        return int(m) + int(s) / 60
+    return float(text)
+
+
+def parse_number(text):
+    text = text.strip()
+    return float(text) if text else None
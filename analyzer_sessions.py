@@ -0,0 +1,202 @@
+"""Penyimpanan sesi di memori dalam bentuk kolom array bertipe.
+
+Satu sesi di history lama adalah dict 8 key; di sini satu sesi hanya satu
+baris di beberapa array('d') ditambah indeks baris per tanggal. Pace dan
+kecepatan dihitung dari jarak/waktu, total_jarak_harian dari jumlah
+kumulatif jarak di tanggal yang sama, sehingga tidak perlu disimpan.
+
+SessionStore berperilaku seperti dict {tanggal: [sesi, ...]}: tiap sesi
+dibaca sebagai dict biasa, jadi tab-tab GUI tidak perlu diubah.
+"""
+from array import array
+from collections.abc import MutableMapping, Sequence
+import math
+from operator import itemgetter
+
+from analyzer_core import hitung_pace, hitung_speed
+
+NO_TIME = 0xFFFF
+COLUMNS = itemgetter("jarak", "waktu", "kal")
+
+
+class MinuteCache(dict):
+    """"HH:MM" -> menit sejak tengah malam; hanya 1440 nilai berbeda"""
+
+    def __missing__(self, jam):
+        h, m = jam.split(":")
+        value = self[jam] = int(h) * 60 + int(m)
+        return value
+
+
+MINUTES = MinuteCache()
+
+
+class DayView(Sequence):
+    """Daftar sesi pada satu tanggal"""
+
+    __slots__ = ("store", "rows")
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        rows = self.rows
+        if i < 0:
+            i += len(rows)
+        jarak = self.store.jarak
+        total = 0
+        for r in rows[:i + 1]:
+            total += jarak[r]
+        return self.store.record(rows[i], total)
+
+    def __iter__(self):
+        jarak = self.store.jarak
+        total = 0
+        for r in self.rows:
+            total += jarak[r]
+            yield self.store.record(r, total)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def append(self, sesi):
+        self.rows.append(self.store.add_row(sesi))
+
+
+class SessionStore(MutableMapping):
+    """Peta tanggal -> DayView dengan data sesi di kolom array"""
+
+    def __init__(self):
+        self.rows = {}
+        self.clear()
+
+    def clear(self):
+        self.rows.clear()
+        self.jarak = array("d")
+        self.waktu = array("d")
+        self.kal = array("d")
+        self.target = array("d")
+        self.menit = array("H")
+        self.odd_times = {}
+        self.dead = 0
+
+    def add_row(self, sesi):
+        """Menambah satu sesi (dict) ke kolom; mengembalikan nomor barisnya"""
+        row = len(self.jarak)
+        self.jarak.append(sesi["jarak"])
+        self.waktu.append(sesi["waktu"])
+        self.kal.append(sesi["kal"])
+        target = sesi.get("target")
+        self.target.append(math.nan if target is None else target)
+        jam = sesi.get("time", "")
+        try:
+            h, m = jam.split(":")
+            self.menit.append(int(h) * 60 + int(m))
+        except ValueError:
+            self.menit.append(NO_TIME)
+            self.odd_times[row] = jam
+        return row
+
+    def record(self, row, total):
+        """Membentuk dict sesi seperti yang dulu disimpan analyze()"""
+        jarak = self.jarak[row]
+        waktu = self.waktu[row]
+        menit = self.menit[row]
+        target = self.target[row]
+        return {
+            "time": self.odd_times[row] if menit == NO_TIME else f"{menit // 60:02d}:{menit % 60:02d}",
+            "jarak": jarak,
+            "waktu": waktu,
+            "pace": hitung_pace(jarak, waktu),
+            "speed": hitung_speed(jarak, waktu),
+            "kal": self.kal[row],
+            "target": None if math.isnan(target) else target,
+            "total_jarak_harian": total
+        }
+
+    def add_rows(self, runs):
+        """Menambah banyak sesi sekaligus; mengembalikan array nomor barisnya"""
+        start = len(self.jarak)
+        try:
+            menit = array("H", [MINUTES[s["time"]] for s in runs])
+        except (KeyError, ValueError, AttributeError):
+            return array("I", [self.add_row(s) for s in runs])
+        jarak, waktu, kal = zip(*map(COLUMNS, runs)) if runs else ((), (), ())
+        self.jarak.extend(jarak)
+        self.waktu.extend(waktu)
+        self.kal.extend(kal)
+        self.target.extend([math.nan if s.get("target") is None else s["target"] for s in runs])
+        self.menit.extend(menit)
+        return array("I", range(start, len(self.jarak)))
+
+    def add_days(self, days):
+        """Menambah {tanggal: [sesi, ...]} dalam satu batch kolom"""
+        runs = [s for day in days.values() for s in day]
+        rows = self.add_rows(runs)
+        i = 0
+        for tanggal, day in days.items():
+            if tanggal in self.rows:
+                del self[tanggal]
+            self.rows[tanggal] = rows[i:i + len(day)]
+            i += len(day)
+
+    def json_hook(self, obj):
+        """object_hook untuk json.load: dict sesi langsung diubah jadi nomor baris"""
+        if "jarak" in obj and "waktu" in obj:
+            return self.add_row(obj)
+        return obj
+
+    def adopt(self, tanggal, runs):
+        """Mendaftarkan tanggal dari hasil json_hook (list nomor baris) atau list dict"""
+        self.rows[tanggal] = array("I", (r if isinstance(r, int) else self.add_row(r) for r in runs))
+
+    def __getitem__(self, tanggal):
+        return DayView(self, self.rows[tanggal])
+
+    def __setitem__(self, tanggal, runs):
+        if tanggal in self.rows:
+            del self[tanggal]
+        self.adopt(tanggal, runs)
+
+    def __delitem__(self, tanggal):
+        self.dead += len(self.rows.pop(tanggal))
+        if self.dead > len(self.jarak) // 2:
+            self.vacuum()
+
+    def __contains__(self, tanggal):
+        return tanggal in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def session_total(self):
+        return len(self.jarak) - self.dead
+
+    def copy(self):
+        """Salinan independen (untuk ditulis thread lain sementara data terus berubah)"""
+        other = SessionStore()
+        other.jarak, other.waktu = array("d", self.jarak), array("d", self.waktu)
+        other.kal, other.target = array("d", self.kal), array("d", self.target)
+        other.menit, other.odd_times = array("H", self.menit), dict(self.odd_times)
+        other.rows = {tanggal: array("I", rows) for tanggal, rows in self.rows.items()}
+        other.dead = self.dead
+        return other
+
+    def vacuum(self):
+        """Membuang baris milik tanggal yang sudah dihapus"""
+        old = SessionStore()
+        old.rows, old.jarak, old.waktu, old.kal = self.rows, self.jarak, self.waktu, self.kal
+        old.target, old.menit, old.odd_times = self.target, self.menit, self.odd_times
+        self.rows = {}
+        self.clear()
+        for tanggal, rows in old.rows.items():
+            self.rows[tanggal] = array("I", (self.add_row(old.record(r, 0)) for r in rows))
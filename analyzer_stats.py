@@ -0,0 +1,260 @@
+"""Statistik bergulir dan rekor pribadi yang diperbarui per op.
+
+Per tanggal hanya disimpan jarak total, pace terbaik, lari terjauh dan
+target. Jarak 7/28/365 hari adalah jumlah geser: saat hari acuan maju,
+jarak hari yang keluar jendela dikurangi dan hari yang masuk ditambah.
+Pace terbaik tiap jendela ada di depan deque monoton (pace naik dari depan
+ke belakang), jadi sesi baru di ujung jendela cukup O(1) amortisasi.
+
+Op di tengah jendela (impor tanggal lama, hapus tanggal) membangun ulang
+deque jendela itu dari data per tanggal, paling banyak 365 hari. Rekor
+sepanjang masa dicari ulang hanya jika tanggal pemegang rekor dihapus.
+Hari yang memenuhi target disimpan sebagai rentang hari berurutan (streak).
+"""
+from collections import Counter, deque
+from datetime import date
+
+from analyzer_search import PROGRESS_EVERY, to_day
+from analyzer_sessions import SessionStore
+
+WINDOWS = (7, 28, 365)
+
+
+class Window:
+    """Jarak total dan pace terbaik n hari sampai hari acuan (inklusif)"""
+
+    def __init__(self, n, stats):
+        self.n = n
+        self.stats = stats
+        self.anchor = None
+        self.jarak = 0.0
+        # (hari, pace) dengan pace naik dari depan ke belakang
+        self.best = deque()
+
+    def contains(self, day):
+        return self.anchor is not None and self.anchor - self.n < day <= self.anchor
+
+    def reset(self, anchor):
+        self.anchor = anchor
+        dist = self.stats.dist
+        self.jarak = sum(dist.get(d, 0.0) for d in range(anchor - self.n + 1, anchor + 1))
+        self.rebuild()
+
+    def rebuild(self):
+        self.best.clear()
+        if self.anchor is None:
+            return
+        best = self.stats.best
+        for d in range(self.anchor - self.n + 1, self.anchor + 1):
+            if d in best:
+                self.push(d, best[d])
+
+    def push(self, day, pace):
+        q = self.best
+        if q and q[-1][0] == day and q[-1][1] <= pace:
+            return
+        while q and q[-1][1] >= pace:
+            q.pop()
+        q.append((day, pace))
+
+    def advance(self, anchor):
+        """Menggeser jendela ke hari acuan baru"""
+        if self.anchor is None or anchor < self.anchor or anchor - self.anchor >= self.n:
+            return self.reset(anchor)
+        dist, best = self.stats.dist, self.stats.best
+        for d in range(self.anchor + 1, anchor + 1):
+            self.jarak += dist.get(d, 0.0) - dist.get(d - self.n, 0.0)
+            if d in best:
+                self.push(d, best[d])
+        self.anchor = anchor
+        q = self.best
+        while q and q[0][0] <= anchor - self.n:
+            q.popleft()
+
+    def add(self, day, jarak, pace):
+        """pace None berarti pace terbaik hari itu tidak berubah"""
+        if not self.contains(day):
+            return
+        self.jarak += jarak
+        if pace is None:
+            return
+        if not self.best or day >= self.best[-1][0]:
+            self.push(day, pace)
+        else:
+            self.rebuild()
+
+    def remove(self, day, jarak):
+        if self.contains(day):
+            self.jarak -= jarak
+            self.rebuild()
+
+    def clear(self):
+        self.jarak = 0.0
+        self.best.clear()
+
+
+class RunningStats:
+    """Jarak/pace bergulir, rekor pribadi dan streak target"""
+
+    def __init__(self):
+        self.windows = [Window(n, self) for n in WINDOWS]
+        self.clear()
+
+    def clear(self):
+        self.dist = {}
+        self.best = {}
+        self.longest = {}
+        self.target = {}
+        self.met = set()
+        # streak: awal -> akhir dan akhir -> awal, serta jumlah streak per panjang
+        self.starts = {}
+        self.ends = {}
+        self.lengths = Counter()
+        self.pr_pace = None
+        self.pr_jarak = None
+        for window in self.windows:
+            window.clear()
+
+    @classmethod
+    def build(cls, history, daily_targets, progress=None):
+        """Statistik untuk seluruh history (SessionStore dibaca langsung dari kolomnya)"""
+        stats = cls()
+        total = len(history)
+        if isinstance(history, SessionStore):
+            jarak, waktu = history.jarak, history.waktu
+            for i, (tanggal, rows) in enumerate(history.rows.items()):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                day = to_day(tanggal)
+                for r in rows:
+                    stats.add_session(day, jarak[r], waktu[r])
+        else:
+            for i, tanggal in enumerate(history):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                day = to_day(tanggal)
+                for sesi in history[tanggal]:
+                    stats.add_session(day, sesi["jarak"], sesi["waktu"])
+        for tanggal, target in daily_targets.items():
+            day = to_day(tanggal)
+            stats.target[day] = target
+            stats.update_met(day)
+        return stats
+
+    def apply(self, op):
+        """Memperbarui statistik dengan op yang sama seperti apply_op"""
+        kind = op["op"]
+        if kind == "session":
+            day = to_day(op["date"])
+            if op.get("target") is not None:
+                self.target[day] = op["target"]
+            self.add_session(day, op["session"]["jarak"], op["session"]["waktu"])
+        elif kind == "delete":
+            self.remove_day(to_day(op["date"]))
+        elif kind == "clear":
+            self.clear()
+
+    def add_session(self, day, jarak, waktu):
+        pace = waktu / jarak
+        self.dist[day] = self.dist.get(day, 0) + jarak
+        improved = day not in self.best or pace < self.best[day]
+        if improved:
+            self.best[day] = pace
+        if jarak > self.longest.get(day, 0):
+            self.longest[day] = jarak
+        if self.pr_pace is None or pace < self.pr_pace[1]:
+            self.pr_pace = (day, pace)
+        if self.pr_jarak is None or jarak > self.pr_jarak[1]:
+            self.pr_jarak = (day, jarak)
+        for window in self.windows:
+            window.add(day, jarak, pace if improved else None)
+        self.update_met(day)
+
+    def remove_day(self, day):
+        jarak = self.dist.pop(day, 0.0)
+        self.best.pop(day, None)
+        self.longest.pop(day, None)
+        self.target.pop(day, None)
+        for window in self.windows:
+            window.remove(day, jarak)
+        # rekor dicari ulang hanya jika pemegangnya ikut terhapus
+        if self.pr_pace is not None and self.pr_pace[0] == day:
+            self.pr_pace = min(self.best.items(), key=lambda kv: kv[1], default=None)
+        if self.pr_jarak is not None and self.pr_jarak[0] == day:
+            self.pr_jarak = max(self.longest.items(), key=lambda kv: kv[1], default=None)
+        self.update_met(day)
+
+    def update_met(self, day):
+        target = self.target.get(day)
+        met = bool(target) and self.dist.get(day, 0) >= target
+        if met and day not in self.met:
+            self.mark(day)
+        elif not met and day in self.met:
+            self.unmark(day)
+
+    def add_run(self, start, end):
+        self.starts[start] = end
+        self.ends[end] = start
+        self.lengths[end - start + 1] += 1
+
+    def drop_run(self, start, end):
+        del self.starts[start]
+        del self.ends[end]
+        length = end - start + 1
+        self.lengths[length] -= 1
+        if not self.lengths[length]:
+            del self.lengths[length]
+
+    def mark(self, day):
+        """Hari baru memenuhi target: gabungkan dengan streak di kiri/kanannya"""
+        self.met.add(day)
+        start = end = day
+        if day - 1 in self.ends:
+            start = self.ends[day - 1]
+            self.drop_run(start, day - 1)
+        if day + 1 in self.starts:
+            end = self.starts[day + 1]
+            self.drop_run(day + 1, end)
+        self.add_run(start, end)
+
+    def unmark(self, day):
+        """Hari tidak lagi memenuhi target: streak yang memuatnya dipecah dua"""
+        self.met.discard(day)
+        start = day
+        while start - 1 in self.met:
+            start -= 1
+        end = self.starts[start]
+        self.drop_run(start, end)
+        if start < day:
+            self.add_run(start, day - 1)
+        if day < end:
+            self.add_run(day + 1, end)
+
+    def current_streak(self, anchor):
+        """Streak sampai hari acuan; hari acuan yang belum tercapai belum memutus streak"""
+        if anchor in self.ends:
+            return anchor - self.ends[anchor] + 1
+        if anchor in self.met:
+            start = anchor
+            while start - 1 in self.met:
+                start -= 1
+            return anchor - start + 1
+        if anchor - 1 in self.ends:
+            return anchor - self.ends[anchor - 1]
+        return 0
+
+    def summary(self, anchor=None):
+        """Ringkasan untuk hari acuan (ordinal, default hari ini)"""
+        anchor = anchor if anchor is not None else date.today().toordinal()
+        windows = {}
+        for window in self.windows:
+            window.advance(anchor)
+            windows[window.n] = (window.jarak, window.best[0][1] if window.best else None)
+        return {
+            "windows": windows,
+            "best_today": self.best.get(anchor),
+            "pr_pace": self.pr_pace and (date.fromordinal(self.pr_pace[0]).isoformat(), self.pr_pace[1]),
+            "pr_jarak": self.pr_jarak and (date.fromordinal(self.pr_jarak[0]).isoformat(), self.pr_jarak[1]),
+            "streak": self.current_streak(anchor),
+            "longest_streak": max(self.lengths, default=0)
+        }
@@ -0,0 +1,1125 @@
+"""Lapisan penyimpanan data Run Analyzer.
+
+Data disimpan sebagai snapshot JSON (format running_data.json yang lama)
+ditambah journal append-only berisi perubahan sejak snapshot terakhir.
+Setiap sesi baru cukup menambah satu baris kecil ke journal; journal
+dipadatkan ke snapshot secara berkala.
+
+Backend default (RUN_ANALYZER_STORAGE=shard) memecah data per bulan dengan
+manifest ringkasan harian, sehingga start hanya membaca manifest dan shard
+bulan berjalan. Sebagai alternatif tersedia backend SQLite
+(RUN_ANALYZER_STORAGE=sqlite) yang juga hanya memuat ringkasan harian saat
+start; sesi per tanggal diambil dari database ketika tampilan membutuhkannya.
+RUN_ANALYZER_STORAGE=binary memakai file biner ber-mmap (analyzer_binary).
+
+Beberapa proses (dua jendela aplikasi, atau aplikasi dan skrip CLI) boleh
+memakai data yang sama: versi data adalah seq op terakhir di journal, dan
+setiap tulis mengunci file lalu hanya menambahkan delta-nya ke keadaan
+terbaru di disk (SharedJournal).
+"""
+from collections.abc import MutableMapping
+import datetime
+import json
+import os
+import pathlib
+import queue
+import re
+import sqlite3
+import threading
+import time
+import weakref
+
+from analyzer_lock import LOCK_SUFFIX, FileLock, NoLock
+from analyzer_rollup import Rollup
+from analyzer_sessions import SessionStore
+
+DATA_FILE = "running_data.json"
+DATA_KEYS = ("history", "daily_targets", "daily_distances")
+JOURNAL_SUFFIX = ".journal"
+COMPACT_EVERY = 500
+SNAPSHOT_HEADER = '{"snapshot_format": 2,'
+SNAPSHOT_CHUNK = 1000
+MANIFEST_FILE = "manifest.json"
+SESSION_FIELDS = ("time", "jarak", "waktu", "pace", "speed", "kal", "target", "total_jarak_harian")
+# op terakhir yang disisakan di journal setelah pemadatan, untuk proses lain yang belum membacanya
+JOURNAL_KEEP = 1000
+SEQ_PATTERN = re.compile(rb'"journal_seq": (\d+)')
+# PRAGMA user_version database SQLite setelah migrasi awal dari data lama diputuskan
+SQLITE_MIGRATED = 1
+
+
+def empty_data():
+    """Struktur data kosong"""
+    return {key: {} for key in DATA_KEYS}
+
+
+def apply_op(data, op):
+    """Menerapkan satu perubahan (op) ke data di memori (dan rollup jika ada)"""
+    kind = op["op"]
+    rollup = data.get("rollup")
+    if kind == "session":
+        tanggal = op["date"]
+        sesi = op["session"]
+        if tanggal not in data["history"]:
+            data["history"][tanggal] = []
+        data["history"][tanggal].append(sesi)
+        data["daily_distances"][tanggal] = data["daily_distances"].get(tanggal, 0) + sesi["jarak"]
+        if op.get("target") is not None:
+            data["daily_targets"][tanggal] = op["target"]
+        if rollup is not None:
+            rollup.add_session(tanggal, sesi)
+    elif kind == "delete":
+        if rollup is not None and op["date"] in data["history"]:
+            rollup.remove_day(op["date"], data["history"][op["date"]])
+        for key in DATA_KEYS:
+            data[key].pop(op["date"], None)
+    elif kind == "clear":
+        for key in DATA_KEYS:
+            data[key].clear()
+        if rollup is not None:
+            rollup.clear()
+    else:
+        raise ValueError(f"Op tidak dikenal: {kind}")
+
+
+def atomic_write(path, writer, mode='w'):
+    """Menulis ke file sementara lalu os.replace, sehingga file lama utuh jika gagal di tengah"""
+    tmp = f"{path}.tmp"
+    with open(tmp, mode) as f:
+        writer(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def write_snapshot(f, data, seq):
+    """Menulis snapshot berformat running_data.json, satu baris per tanggal.
+
+    Ditulis per tanggal agar history berbentuk kolom (SessionStore) tidak
+    perlu diubah seluruhnya menjadi dict sekaligus, dan agar read_snapshot
+    bisa membacanya baris demi baris.
+    """
+    f.write(SNAPSHOT_HEADER + '\n  "history": {')
+    sep = "\n"
+    for tanggal, runs in data["history"].items():
+        f.write(f"{sep}    {json.dumps(tanggal)}: {json.dumps(list(runs))}")
+        sep = ",\n"
+    f.write("\n  },\n")
+    f.write(f'  "daily_targets": {json.dumps(data["daily_targets"])},\n')
+    f.write(f'  "daily_distances": {json.dumps(data["daily_distances"])},\n')
+    if data.get("rollup") is not None:
+        f.write(f'  "rollup": {json.dumps(data["rollup"].to_json())},\n')
+    f.write(f'  "journal_seq": {seq}\n}}\n')
+
+
+def read_snapshot(f, history):
+    """Membaca snapshot ke history (SessionStore); mengembalikan key lainnya.
+
+    File tulisan write_snapshot dibaca per baris sehingga teks file tidak
+    pernah dimuat utuh; file lama (json.dump indent=2) dibaca sekaligus.
+    """
+    if f.readline().rstrip("\n") != SNAPSHOT_HEADER:
+        f.seek(0)
+        raw = json.load(f, object_hook=history.json_hook)
+        for tanggal, runs in raw.pop("history", {}).items():
+            history.adopt(tanggal, runs)
+        return raw
+
+    raw = {}
+    for days in snapshot_chunks(f, raw):
+        history.add_days(days)
+    return raw
+
+
+def snapshot_chunks(f, rest):
+    """Isi snapshot setelah baris header: {tanggal: [sesi, ...]} per SNAPSHOT_CHUNK tanggal.
+
+    Key lain (daily_targets, journal_seq, ...) diisikan ke dict rest setelah
+    history habis dibaca.
+    """
+    chunk = []
+    f.readline()  # "history": {
+    for line in f:
+        line = line.strip().rstrip(",")
+        if line == "}":
+            break
+        chunk.append(line)
+        if len(chunk) == SNAPSHOT_CHUNK:
+            yield json.loads("{" + ",".join(chunk) + "}")
+            chunk = []
+    if chunk:
+        yield json.loads("{" + ",".join(chunk) + "}")
+    rest.update(json.loads("{" + "".join(f)))
+
+
+def snapshot_seq(path):
+    """journal_seq di akhir snapshot, dibaca tanpa membaca seluruh file"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 256))
+        match = SEQ_PATTERN.search(f.read())
+    return int(match.group(1)) if match else 0
+
+
+def read_ops(path, offset=0, tail=b""):
+    """Op di journal mulai offset byte.
+
+    Mengembalikan (ops, offset setelah baris utuh terakhir, baris utuh terakhir).
+    """
+    ops = []
+    if not os.path.exists(path):
+        return ops, 0, b""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # baris terakhir bisa terpotong jika proses mati saat menulis
+                break
+            offset += len(line)
+            tail = line
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                continue
+    return ops, offset, tail
+
+
+class SharedJournal:
+    """Journal yang boleh ditulis beberapa proses sekaligus; versi data = seq op.
+
+    Setiap tulis memegang FileLock, membaca dulu ekor journal yang ditulis
+    proses lain sejak terakhir dibaca (sync), lalu menambahkan op sendiri
+    dengan seq berikutnya. Op proses lain dikumpulkan untuk GUI lewat
+    changes(); poll() hanya memanggil os.stat selama journal tidak berubah.
+
+    Pemadatan mencatat seq-nya di file kunci dan menyisakan JOURNAL_KEEP op
+    terakhir agar proses lain yang sedikit tertinggal masih bisa membaca
+    deltanya. Yang tertinggal lebih jauh (seq tidak bersambung) ditandai
+    stale dan harus memuat ulang. Subclass menyediakan absorb(op) dan
+    reopen().
+    """
+
+    # store yang membaca sesi dari file hasil pemadatan (shard, biner) juga
+    # stale setiap kali proses lain memadatkan, karena file lamanya dihapus
+    lazy = False
+
+    def init_shared(self, lock_path, readonly=False):
+        self.file_lock = NoLock() if readonly else FileLock(lock_path)
+        self.journal_state = None
+        self.synced = False
+        self.offset = 0
+        # baris terakhir sebelum offset, untuk mengenali journal yang sudah ditulis ulang
+        self.tail = b""
+        # seq pemadatan terakhir yang diketahui (dari file kunci)
+        self.base = None
+        self.incoming = []
+        self.stale = False
+        self.external = False
+        self.epoch = 0
+
+    def journal_stat(self):
+        try:
+            st = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def mark_read(self, offset, tail):
+        """Posisi baca journal terbaru; dipanggil dengan kunci file dipegang"""
+        self.offset = offset
+        self.tail = tail
+        self.journal_state = self.journal_stat()
+        self.base = self.file_lock.read_version()
+        self.synced = True
+
+    def tail_matches(self):
+        """Apakah baris terakhir yang dibaca masih ada tepat sebelum offset.
+
+        Nomor inode tidak bisa dipakai: inode journal lama bisa dipakai ulang
+        oleh journal hasil pemadatan berikutnya.
+        """
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self.offset - len(self.tail))
+            return f.read(len(self.tail)) == self.tail
+
+    def loaded(self):
+        """Dipanggil di akhir load(): data pemanggil kini sama dengan isi disk"""
+        self.epoch += 1
+        self.incoming = []
+        self.stale = False
+        self.external = False
+
+    def poll(self):
+        """Cek murah (stat); journal baru dibaca jika berubah sejak dibaca terakhir"""
+        if not self.synced or self.journal_stat() != self.journal_state:
+            with self.file_lock:
+                self.sync()
+
+    def sync(self):
+        """Membaca op baru dari proses lain; kunci file harus sudah dipegang"""
+        if not self.synced:
+            # store belum dimuat (mis. commit dari CLI): cukup posisi terbaru di disk
+            ops = self.reopen()
+        else:
+            stat = self.journal_stat()
+            base = self.file_lock.read_version()
+            # proses lain memadatkan, atau journal diganti/dihapus
+            rewritten = base != self.base or (self.offset > 0 and (
+                stat is None or stat[1] < self.offset or not self.tail_matches()))
+            if not rewritten and stat == self.journal_state:
+                return
+            if rewritten:
+                ops, offset, tail = read_ops(self.journal_path)
+            else:
+                ops, offset, tail = read_ops(self.journal_path, self.offset, self.tail)
+            self.mark_read(offset, tail)
+            ops = [op for op in ops if op["seq"] > self.seq]
+            if ops:
+                gap = ops[0]["seq"] != self.seq + 1
+            else:
+                gap = rewritten and base is not None and base > self.seq
+            if gap or (rewritten and self.lazy):
+                self.stale = True
+                self.external = True
+                self.incoming = []
+                ops = self.reopen()
+            else:
+                self.incoming.extend(ops)
+                self.external = self.external or bool(ops)
+        for op in ops:
+            self.absorb(op)
+            self.seq = op["seq"]
+
+    def changes(self):
+        """(epoch, op dari proses lain, stale) sejak panggilan terakhir"""
+        with self.file_lock:
+            ops, self.incoming = self.incoming, []
+            stale, self.stale = self.stale, False
+            return self.epoch, ops, stale
+
+    def folded(self, history, op):
+        """True jika op sesi dari proses lain sudah ikut dipadatkan ke disk (oleh
+        pemadatan proses ini setelah op dibaca) sementara tanggalnya belum dimuat
+        history: menerapkannya akan menggandakan sesi, jadi data harus dimuat ulang"""
+        tanggal = op["date"]
+        if not self.lazy or tanggal not in history or tanggal in history.loaded:
+            return False
+        # dimuat dulu: shard/file diganti bersama base di bawah self.lock, jadi
+        # isi yang sudah memuat op selalu terlihat bersama base yang baru
+        history[tanggal]
+        return self.base is not None and op["seq"] <= self.base
+
+    def write_ops(self, ops):
+        """Memberi ops seq berikutnya lalu menambahkannya ke journal; kunci harus dipegang"""
+        lines = []
+        for op in ops:
+            self.seq += 1
+            op = dict(op, seq=self.seq)
+            self.absorb(op)
+            lines.append(json.dumps(op) + "\n")
+        raw = "".join(lines).encode()
+        with open(self.journal_path, 'ab') as f:
+            f.write(raw)
+        self.mark_read(self.offset + len(raw), lines[-1].encode())
+
+    def compacted(self):
+        """Setelah pemadatan: seq dicatat di file kunci, journal menyisakan JOURNAL_KEEP op terakhir"""
+        self.file_lock.write_version(self.seq)
+        ops = read_ops(self.journal_path)[0]
+        lines = [json.dumps(op) + "\n" for op in ops if op["seq"] > self.seq - JOURNAL_KEEP]
+        raw = "".join(lines).encode()
+        atomic_write(self.journal_path, lambda f: f.write(raw), mode='wb')
+        self.mark_read(len(raw), lines[-1].encode() if lines else b"")
+
+
+class LazyHistory(MutableMapping):
+    """Peta tanggal -> daftar sesi yang isinya baru dimuat saat diakses.
+
+    Salinan (copy) dibaca thread lain sementara data di disk bisa sudah
+    memuat op yang datang setelah salinan dibuat. Karena itu tanggal yang
+    dimuat atau dihapus di sini setelah salinan dibuat diberikan juga ke
+    salinan dalam keadaan sebelum op (seed), dan salinan mengambil tanggal
+    lain lewat reader() yang tidak mengubah cache store.
+    """
+
+    def __init__(self, counts, fetch, reader=None):
+        self.counts = dict(counts)
+        self.loaded = {}
+        self.fetch = fetch
+        self.reader = reader
+        self.copies = []
+
+    def __getitem__(self, tanggal):
+        runs = self.loaded.get(tanggal)
+        if runs is None:
+            if tanggal not in self.counts:
+                raise KeyError(tanggal)
+            runs = self.fetch(tanggal)
+            self.seed(tanggal, runs)
+            # setdefault: seed dari thread GUI menang atas hasil fetch yang lebih baru
+            runs = self.loaded.setdefault(tanggal, runs)
+        return runs
+
+    def __setitem__(self, tanggal, runs):
+        self.loaded[tanggal] = runs
+        self.counts[tanggal] = len(runs)
+
+    def __delitem__(self, tanggal):
+        if tanggal not in self.loaded and self.live_copies():
+            self[tanggal]
+        del self.counts[tanggal]
+        self.loaded.pop(tanggal, None)
+
+    def __contains__(self, tanggal):
+        return tanggal in self.counts
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def clear(self):
+        self.counts.clear()
+        self.loaded.clear()
+
+    def copy(self):
+        """Salinan yang bisa dibaca thread lain; isinya tetap seperti saat disalin"""
+        other = LazyHistory(self.counts, self.reader() if self.reader else self.fetch)
+        other.loaded = {tanggal: list(runs) for tanggal, runs in self.loaded.items()}
+        self.copies = self.live_copies() + [weakref.ref(other)]
+        return other
+
+    def live_copies(self):
+        return [ref for ref in self.copies if ref() is not None]
+
+    def seed(self, tanggal, runs):
+        """Isi tanggal sebelum op berikutnya untuk salinan yang belum memuatnya"""
+        for ref in self.copies:
+            other = ref()
+            if other is not None and tanggal in other.counts:
+                other.loaded.setdefault(tanggal, list(runs))
+
+    def count(self, tanggal):
+        """Jumlah sesi pada tanggal tanpa memuat isinya"""
+        if tanggal in self.loaded:
+            return len(self.loaded[tanggal])
+        return self.counts[tanggal]
+
+
+def session_count(history, tanggal):
+    """Jumlah sesi pada satu tanggal untuk dict biasa maupun LazyHistory"""
+    if isinstance(history, LazyHistory):
+        return history.count(tanggal)
+    return len(history[tanggal])
+
+
+class JournalStore(SharedJournal):
+    """Snapshot JSON + journal append-only"""
+
+    def __init__(self, path, compact_every=COMPACT_EVERY, readonly=False):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.seq = 0
+        self.pending = 0
+        self.init_shared(path + LOCK_SUFFIX, readonly)
+
+    def load(self):
+        """Membaca snapshot lalu memutar ulang journal di atasnya"""
+        with self.file_lock:
+            data = self.read()
+            self.loaded()
+        return data
+
+    def read(self):
+        data = empty_data()
+        history = SessionStore()
+        self.seq = 0
+        self.pending = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                raw = read_snapshot(f, history)
+            data["daily_targets"] = raw.get("daily_targets", {})
+            data["daily_distances"] = raw.get("daily_distances", {})
+            self.seq = raw.get("journal_seq", 0)
+            if "rollup" in raw:
+                data["rollup"] = Rollup.from_json(raw["rollup"])
+        data["history"] = history
+        if "rollup" not in data or data["rollup"].total[3] != history.session_total():
+            data["rollup"] = Rollup.build(history)
+
+        ops, offset, tail = read_ops(self.journal_path)
+        for op in ops:
+            if op["seq"] <= self.seq:
+                continue
+            apply_op(data, op)
+            self.seq = op["seq"]
+            self.pending += 1
+        self.mark_read(offset, tail)
+        return data
+
+    def reopen(self):
+        self.seq = snapshot_seq(self.path) if os.path.exists(self.path) else 0
+        self.pending = 0
+        ops, offset, tail = read_ops(self.journal_path)
+        self.mark_read(offset, tail)
+        return [op for op in ops if op["seq"] > self.seq]
+
+    def absorb(self, op):
+        self.pending += 1
+
+    def needs_compact(self, n_ops):
+        """Apakah menyimpan n_ops lagi sebaiknya langsung menjadi snapshot"""
+        return self.pending + n_ops >= self.compact_every
+
+    def commit(self, data, ops):
+        """Menyimpan perubahan; ops=None berarti tulis ulang snapshot penuh"""
+        if ops is None:
+            return self.compact(data)
+        if not ops:
+            return
+        if self.needs_compact(len(ops)):
+            # batch besar (mis. import): cukup satu snapshot
+            return self.compact(data, ops)
+        self.append(ops)
+
+    def append(self, ops):
+        """Menambahkan ops ke journal"""
+        if not ops:
+            return
+        with self.file_lock:
+            self.sync()
+            self.write_ops(ops)
+
+    def compact(self, data, ops=()):
+        """Menulis snapshot penuh (yang sudah memuat ops) lalu memangkas journal.
+
+        ops juga ditulis ke journal agar proses lain cukup membaca deltanya.
+        Jika proses lain sudah menulis sejak data dimuat, data pemanggil tidak
+        memuat perubahan itu, jadi snapshot dibangun dari isi disk terbaru.
+        """
+        with self.file_lock:
+            self.sync()
+            if ops:
+                self.write_ops(ops)
+                if self.external:
+                    data = self.read()
+            else:
+                # data menggantikan semuanya: proses lain harus memuat ulang
+                self.seq += 1
+            atomic_write(self.path, lambda f: write_snapshot(f, data, self.seq))
+            # snapshot mencatat journal_seq, jadi crash di sini tidak menggandakan data
+            self.compacted()
+            self.pending = 0
+
+    def close(self):
+        pass
+
+
+class JsonStore(JournalStore):
+    """Perilaku lama: setiap simpan menulis ulang seluruh file"""
+
+    def needs_compact(self, n_ops):
+        return True
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    time TEXT, jarak REAL, waktu REAL, pace REAL, speed REAL,
+    kal REAL, target REAL, total_jarak_harian REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_date ON sessions(date);
+CREATE TABLE IF NOT EXISTS daily_targets (date TEXT PRIMARY KEY, target REAL);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    date TEXT PRIMARY KEY, distance REAL NOT NULL, sessions INTEGER NOT NULL,
+    waktu REAL NOT NULL, kal REAL NOT NULL
+);
+"""
+
+
+class SqliteStore:
+    """Database SQLite lokal dengan tabel sesi, target dan total harian"""
+
+    def __init__(self, path, json_path=None, readonly=False):
+        self.path = path
+        self.json_path = json_path
+        self.readonly = readonly
+        self.conn = None
+        # koneksi dipakai thread GUI (baca per tanggal) dan thread penyimpanan
+        self.lock = threading.RLock()
+        # SQLite mengunci sendiri antar proses; perubahan proses lain terlihat dari data_version
+        self.data_version = None
+        self.stale = False
+        self.epoch = 0
+        self.created = False
+
+    def connect(self):
+        if self.conn is None:
+            if self.readonly:
+                uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro"
+                self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=30)
+                return self.conn
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self.created = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'").fetchone() is None
+            self.conn.executescript(SCHEMA)
+            self._upgrade(self.conn)
+        return self.conn
+
+    def _upgrade(self, conn):
+        """Database lama belum punya total waktu/kalori per hari"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(daily_totals)")}
+        if "waktu" in columns:
+            return
+        with conn:
+            conn.execute("ALTER TABLE daily_totals ADD COLUMN waktu REAL NOT NULL DEFAULT 0")
+            conn.execute("ALTER TABLE daily_totals ADD COLUMN kal REAL NOT NULL DEFAULT 0")
+            conn.execute(
+                "UPDATE daily_totals SET "
+                "waktu = (SELECT COALESCE(SUM(waktu), 0) FROM sessions s WHERE s.date = daily_totals.date), "
+                "kal = (SELECT COALESCE(SUM(kal), 0) FROM sessions s WHERE s.date = daily_totals.date)")
+
+    def load(self):
+        """Memuat target dan total harian; sesi dimuat per tanggal saat diakses"""
+        conn = self.connect()
+        if not self.readonly and conn.execute("PRAGMA user_version").fetchone()[0] < SQLITE_MIGRATED:
+            # hanya database yang baru dibuat diisi dari data lama; database yang
+            # sengaja dikosongkan (clear) tidak boleh terisi kembali
+            if self.created and self.json_path:
+                copy_latest(self.json_path, self, self.path)
+            with self.lock, conn:
+                conn.execute(f"PRAGMA user_version = {SQLITE_MIGRATED}")
+
+        distances, counts = {}, {}
+        rollup = Rollup()
+        for tanggal, distance, sessions, waktu, kal in conn.execute(
+                "SELECT date, distance, sessions, waktu, kal FROM daily_totals"):
+            distances[tanggal] = distance
+            counts[tanggal] = sessions
+            rollup.add(tanggal, distance, waktu, kal, sessions)
+        targets = dict(conn.execute("SELECT date, target FROM daily_targets"))
+        with self.lock:
+            self.data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            self.stale = False
+            self.epoch += 1
+        return {
+            "history": LazyHistory(counts, self.sessions),
+            "daily_targets": targets,
+            "daily_distances": distances,
+            "rollup": rollup
+        }
+
+    def sessions(self, tanggal):
+        """Semua sesi pada satu tanggal, urut sesuai waktu input"""
+        with self.lock:
+            rows = self.connect().execute(
+                f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions WHERE date = ? ORDER BY id",
+                (tanggal,)).fetchall()
+        return [dict(zip(SESSION_FIELDS, row)) for row in rows]
+
+    def needs_compact(self, n_ops):
+        return False
+
+    def poll(self):
+        """data_version berubah hanya jika koneksi lain (proses lain) menulis"""
+        with self.lock:
+            version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+            if self.data_version is not None and version != self.data_version:
+                self.stale = True
+            self.data_version = version
+
+    def changes(self):
+        """Perubahan proses lain tidak tersedia sebagai op: cukup tandai stale"""
+        with self.lock:
+            stale, self.stale = self.stale, False
+            return self.epoch, [], stale
+
+    def append(self, ops):
+        self.commit(None, ops)
+
+    def compact(self, data, ops=()):
+        self.commit(data, None)
+
+    def commit(self, data, ops):
+        """Menerapkan ops sebagai SQL; ops=None berarti tulis ulang semua tabel"""
+        with self.lock, self.connect() as conn:
+            if ops is None:
+                conn.execute("DELETE FROM sessions")
+                conn.execute("DELETE FROM daily_targets")
+                conn.execute("DELETE FROM daily_totals")
+                for tanggal, runs in data["history"].items():
+                    self._insert_sessions(conn, tanggal, runs)
+                conn.executemany("INSERT INTO daily_targets VALUES (?, ?)",
+                                 data["daily_targets"].items())
+                return
+            for op in ops:
+                self._apply(conn, op)
+
+    def _insert_sessions(self, conn, tanggal, runs):
+        conn.executemany(
+            f"INSERT INTO sessions (date, {', '.join(SESSION_FIELDS)}) "
+            f"VALUES (?{', ?' * len(SESSION_FIELDS)})",
+            ((tanggal,) + tuple(sesi.get(k) for k in SESSION_FIELDS) for sesi in runs))
+        conn.execute("INSERT OR IGNORE INTO daily_totals VALUES (?, 0, 0, 0, 0)", (tanggal,))
+        conn.execute(
+            "UPDATE daily_totals SET distance = distance + ?, sessions = sessions + ?, "
+            "waktu = waktu + ?, kal = kal + ? WHERE date = ?",
+            (sum(sesi["jarak"] for sesi in runs), len(runs),
+             sum(sesi["waktu"] for sesi in runs), sum(sesi["kal"] for sesi in runs), tanggal))
+
+    def _apply(self, conn, op):
+        kind = op["op"]
+        if kind == "session":
+            self._insert_sessions(conn, op["date"], [op["session"]])
+            if op.get("target") is not None:
+                conn.execute("INSERT OR REPLACE INTO daily_targets VALUES (?, ?)",
+                             (op["date"], op["target"]))
+        elif kind == "delete":
+            for table in ("sessions", "daily_targets", "daily_totals"):
+                conn.execute(f"DELETE FROM {table} WHERE date = ?", (op["date"],))
+        elif kind == "clear":
+            for table in ("sessions", "daily_targets", "daily_totals"):
+                conn.execute(f"DELETE FROM {table}")
+        else:
+            raise ValueError(f"Op tidak dikenal: {kind}")
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+class ShardStore(SharedJournal):
+    """Data dipecah per bulan: manifest kecil + satu file shard per bulan + journal.
+
+    Manifest berisi target harian dan ringkasan [sesi, jarak, waktu, kalori]
+    per tanggal, cukup untuk tab History dan rollup. Sesi bulan berjalan
+    dimuat saat start; bulan lain baru dibaca saat tanggalnya dibuka.
+
+    Shard hasil pemadatan ditulis dengan nama baru lalu manifest diganti
+    secara atomik, jadi manifest selalu menunjuk shard yang cocok dengan
+    journal_seq-nya.
+    """
+
+    lazy = True
+
+    def __init__(self, path, json_path=None, compact_every=COMPACT_EVERY, readonly=False):
+        self.dir = path
+        self.json_path = json_path
+        self.manifest_path = os.path.join(path, MANIFEST_FILE)
+        self.journal_path = self.manifest_path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.shards = {}
+        self.days = {}
+        self.targets = {}
+        self.seq = 0
+        self.journal = []
+        self.months = {}
+        # shard dibaca thread GUI dan diganti thread penyimpanan
+        self.lock = threading.RLock()
+        # di luar folder agar bisa dikunci sebelum folder dibuat
+        self.init_shared(path + LOCK_SUFFIX, readonly)
+        self.readonly = readonly
+
+    def load(self):
+        """Memuat manifest dan shard bulan ini lalu memutar ulang journal"""
+        with self.file_lock:
+            if not os.path.exists(self.manifest_path):
+                if self.readonly:
+                    raise FileNotFoundError(f"Data shard tidak ditemukan: {self.dir}")
+                os.makedirs(self.dir, exist_ok=True)
+                if not self.json_path or copy_latest(self.json_path, self, self.dir) is None:
+                    self.commit(empty_data(), None)
+            data = self.read()
+            self.loaded()
+        return data
+
+    def read(self):
+        ops = self.reopen()
+        history = LazyHistory({t: day[0] for t, day in self.days.items()}, self.sessions, self.reader)
+        bulan = datetime.date.today().strftime("%Y-%m")
+        for tanggal, runs in self.read_month(bulan).items():
+            if tanggal in history:
+                history.loaded[tanggal] = runs
+        rollup = Rollup()
+        for tanggal, (sessions, jarak, waktu, kal) in self.days.items():
+            rollup.add(tanggal, jarak, waktu, kal, sessions)
+        data = {
+            "history": history,
+            "daily_targets": dict(self.targets),
+            "daily_distances": {t: day[1] for t, day in self.days.items()},
+            "rollup": rollup
+        }
+        for op in ops:
+            apply_op(data, op)
+            self.absorb(op)
+            self.seq = op["seq"]
+        return data
+
+    def reopen(self):
+        """Membaca ulang manifest; mengembalikan op journal yang belum masuk shard"""
+        manifest = {"shards": {}, "days": {}, "daily_targets": {}, "journal_seq": 0}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        with self.lock:
+            self.shards = manifest["shards"]
+            self.months = {}
+        self.days = manifest["days"]
+        self.targets = manifest["daily_targets"]
+        self.seq = manifest["journal_seq"]
+        self.journal = []
+        ops, offset, tail = read_ops(self.journal_path)
+        self.mark_read(offset, tail)
+        return [op for op in ops if op["seq"] > self.seq]
+
+    def absorb(self, op):
+        self.summarize(op)
+        self.journal.append(op)
+
+    def shard_path(self, name):
+        return os.path.join(self.dir, name)
+
+    def read_month(self, bulan, retry=True):
+        """{tanggal: [sesi, ...]} satu bulan dari shard di disk"""
+        with self.lock:
+            name = self.shards.get(bulan)
+            if name is None:
+                return {}
+            try:
+                with open(self.shard_path(name), 'r') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                if not retry:
+                    raise
+        # shard sudah diganti pemadatan proses lain: manifest dibaca ulang (data jadi stale)
+        with self.file_lock:
+            self.sync()
+        return self.read_month(bulan, retry=False)
+
+    def sessions(self, tanggal):
+        """Sesi satu tanggal; shard bulannya dibaca sekali untuk semua tanggal di bulan itu"""
+        bulan = tanggal[:7]
+        month = self.months.get(bulan)
+        if month is None:
+            month = self.read_month(bulan)
+            with self.lock:
+                month = self.months.setdefault(bulan, month)
+        # diambil (pop) agar list hanya dimiliki LazyHistory
+        return month.pop(tanggal, [])
+
+    def reader(self):
+        """Fetch untuk salinan LazyHistory: bulan terakhir di-cache sendiri, self.months tidak disentuh"""
+        cache = {}
+
+        def fetch(tanggal):
+            bulan = tanggal[:7]
+            if bulan not in cache:
+                cache.clear()
+                cache[bulan] = self.read_month(bulan)
+            return cache[bulan].pop(tanggal, [])
+        return fetch
+
+    def summarize(self, op):
+        """Memperbarui ringkasan manifest dengan satu op"""
+        kind = op["op"]
+        if kind == "session":
+            sesi = op["session"]
+            day = self.days.setdefault(op["date"], [0, 0.0, 0.0, 0.0])
+            day[0] += 1
+            day[1] += sesi["jarak"]
+            day[2] += sesi["waktu"]
+            day[3] += sesi["kal"]
+            if op.get("target") is not None:
+                self.targets[op["date"]] = op["target"]
+        elif kind == "delete":
+            self.days.pop(op["date"], None)
+            self.targets.pop(op["date"], None)
+        elif kind == "clear":
+            self.days.clear()
+            self.targets.clear()
+
+    def needs_compact(self, n_ops):
+        # shard dipadatkan sendiri dari journal, tanpa salinan data dari GUI
+        return False
+
+    def commit(self, data, ops):
+        """Menyimpan perubahan; ops=None berarti tulis ulang semua shard dari data"""
+        if ops is None:
+            return self.compact(data)
+        self.append(ops)
+
+    def append(self, ops):
+        """Menambahkan ops ke journal; shard yang tersentuh dipadatkan tiap compact_every op"""
+        if not ops:
+            return
+        with self.file_lock:
+            self.sync()
+            self.write_ops(ops)
+            if len(self.journal) >= self.compact_every:
+                self.compact_journal()
+
+    def compact_journal(self):
+        """Menerapkan journal ke shard bulan yang berubah saja"""
+        months = {}
+        for op in self.journal:
+            kind = op["op"]
+            if kind == "clear":
+                months = {bulan: {} for bulan in self.shards}
+                continue
+            bulan = op["date"][:7]
+            if bulan not in months:
+                months[bulan] = self.read_month(bulan)
+            if kind == "session":
+                months[bulan].setdefault(op["date"], []).append(op["session"])
+            else:
+                months[bulan].pop(op["date"], None)
+        self.write_shards(months)
+
+    def compact(self, data, ops=()):
+        """Menulis ulang semua shard dari data (migrasi/impor besar)"""
+        with self.file_lock:
+            self.sync()
+            # data menggantikan semuanya: proses lain harus memuat ulang
+            self.seq += len(ops) or 1
+            self.replace(data)
+
+    def replace(self, data):
+        months = {bulan: {} for bulan in self.shards}
+        for tanggal, runs in data["history"].items():
+            months.setdefault(tanggal[:7], {})[tanggal] = list(runs)
+        self.days = {}
+        for days in months.values():
+            for tanggal, runs in days.items():
+                self.days[tanggal] = [len(runs), sum(s["jarak"] for s in runs),
+                                      sum(s["waktu"] for s in runs), sum(s["kal"] for s in runs)]
+        self.targets = dict(data["daily_targets"])
+        self.write_shards(months)
+
+    def write_shards(self, months):
+        """Menulis shard baru, mengganti manifest, lalu membuang shard lama"""
+        os.makedirs(self.dir, exist_ok=True)
+        shards = dict(self.shards)
+        for bulan, days in months.items():
+            if days:
+                name = f"{bulan}.{self.seq}.json"
+                atomic_write(self.shard_path(name), lambda f, days=days: json.dump(days, f))
+                shards[bulan] = name
+            else:
+                shards.pop(bulan, None)
+        manifest = {"shards": shards, "days": self.days,
+                    "daily_targets": self.targets, "journal_seq": self.seq}
+        with self.lock:
+            atomic_write(self.manifest_path, lambda f: json.dump(manifest, f))
+            self.compacted()
+            self.journal = []
+            self.shards = shards
+            keep = set(shards.values()) | {MANIFEST_FILE, os.path.basename(self.journal_path)}
+            for name in os.listdir(self.dir):
+                if name not in keep and name.endswith(".json"):
+                    os.remove(self.shard_path(name))
+
+    def close(self):
+        pass
+
+
+class PersistWorker(threading.Thread):
+    """Thread penyimpanan: permintaan simpan beruntun digabung menjadi satu tulis.
+
+    Thread GUI hanya mengirim ops (dan salinan data bila perlu snapshot), jadi
+    tidak pernah menunggu disk. Saat menganggur, thread ini memeriksa
+    perubahan dari proses lain tiap poll_interval detik dan menaruhnya di
+    self.changes sebagai (epoch, ops, stale).
+    """
+
+    STOP = object()
+
+    def __init__(self, store, delay=0.25, poll_interval=1.0):
+        super().__init__(name="persist", daemon=True)
+        self.store = store
+        self.delay = delay
+        self.poll_interval = poll_interval
+        self.queue = queue.Queue()
+        self.changes = queue.SimpleQueue()
+
+    def submit(self, ops, snapshot=None):
+        self.queue.put((list(ops), snapshot))
+
+    def flush(self, timeout=5.0):
+        """Menunggu semua permintaan yang sudah dikirim tertulis"""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def run(self):
+        stop = False
+        while not stop:
+            try:
+                item = self.queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                self.poll()
+                continue
+            if item is self.STOP:
+                break
+            if not isinstance(item, threading.Event):
+                # debounce: beri waktu permintaan berikutnya masuk ke batch yang sama
+                time.sleep(self.delay)
+            batch = [item]
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self.STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            writes = [item for item in batch if not isinstance(item, threading.Event)]
+            try:
+                if writes:
+                    self.write(writes)
+            except Exception as e:
+                print(f"Error saving data: {e}")
+            self.publish()
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def poll(self):
+        try:
+            self.store.poll()
+        except Exception as e:
+            print(f"Error membaca perubahan data: {e}")
+        self.publish()
+
+    def publish(self):
+        epoch, ops, stale = self.store.changes()
+        if ops or stale:
+            self.changes.put((epoch, ops, stale))
+
+    def write(self, batch):
+        last = None
+        for i, (ops, snapshot) in enumerate(batch):
+            if snapshot is not None:
+                last = i
+        if last is None:
+            self.store.append([op for ops, _ in batch for op in ops])
+            return
+        # snapshot terakhir sudah memuat semua ops sebelumnya; sisanya masuk journal
+        self.store.compact(batch[last][1], [op for ops, _ in batch[:last + 1] for op in ops])
+        self.store.append([op for ops, _ in batch[last + 1:] for op in ops])
+
+    def close(self, timeout=5.0):
+        """Menunggu semua permintaan tertulis, paling lama timeout detik"""
+        self.queue.put(self.STOP)
+        self.join(timeout)
+        return not self.is_alive()
+
+
+def sqlite_path(path):
+    return os.path.splitext(path)[0] + ".db"
+
+
+def shard_path(path):
+    return os.path.splitext(path)[0] + ".shards"
+
+
+def migrate_json_to_sqlite(json_path, db_path=None):
+    """Memindahkan data terbaru untuk running_data.json ke database SQLite sekali jalan"""
+    db_path = db_path or sqlite_path(json_path)
+    store = SqliteStore(db_path)
+    try:
+        counts = copy_latest(json_path, store, db_path)
+        if counts is None:
+            store.commit(empty_data(), None)
+            counts = (0, 0)
+    finally:
+        store.close()
+    return counts
+
+
+STORES = {"journal": JournalStore, "json": JsonStore}
+
+
+def modified(path):
+    """Waktu ubah terakhir file data beserta journal-nya"""
+    times = [os.path.getmtime(p) for p in (path, path + JOURNAL_SUFFIX) if os.path.exists(p)]
+    return max(times)
+
+
+def open_readonly(path, exclude=None):
+    """Store read-only (tanpa kunci, tanpa menulis) untuk data yang disimpan di path.
+
+    Backend dikenali dari file yang ada di samping path: folder shard, .runb,
+    .db atau JSON itu sendiri; jika ada beberapa (pernah ganti backend),
+    dipilih yang terakhir diubah. exclude: path store yang tidak ikut dipilih
+    (tujuan migrasi).
+    """
+    from analyzer_binary import BinaryStore, binary_path
+    candidates = [
+        (os.path.join(shard_path(path), MANIFEST_FILE), shard_path(path),
+         lambda: ShardStore(shard_path(path), readonly=True)),
+        (binary_path(path), binary_path(path), lambda: BinaryStore(binary_path(path), readonly=True)),
+        (sqlite_path(path), sqlite_path(path), lambda: SqliteStore(sqlite_path(path), readonly=True)),
+        (path, path, lambda: JournalStore(path, readonly=True))
+    ]
+    skip = os.path.abspath(exclude) if exclude else None
+    existing = [(modified(marker), make) for marker, target, make in candidates
+                if os.path.exists(marker) and os.path.abspath(target) != skip]
+    if not existing:
+        raise FileNotFoundError(f"Data tidak ditemukan: {path}")
+    return max(existing, key=lambda c: c[0])[1]()
+
+
+def copy_latest(path, target, exclude):
+    """Mengisi store target dengan data terbaru untuk path (backend yang terakhir ditulis,
+    selain exclude). Mengembalikan (hari, sesi), atau None jika belum ada data sama sekali."""
+    try:
+        source = open_readonly(path, exclude)
+    except FileNotFoundError:
+        return None
+    try:
+        data = source.load()
+        history = data["history"]
+        counts = (len(history), sum(session_count(history, t) for t in history))
+        target.commit(data, None)
+    finally:
+        source.close()
+    return counts
+
+
+def default_kind():
+    """Backend yang dipakai aplikasi: RUN_ANALYZER_STORAGE (default: shard)"""
+    return os.environ.get("RUN_ANALYZER_STORAGE", "shard")
+
+
+def store_path(path, kind=None):
+    """File/folder yang ditulis open_store(path, kind)"""
+    kind = kind or default_kind()
+    if kind == "sqlite":
+        return sqlite_path(path)
+    if kind == "shard":
+        return shard_path(path)
+    if kind == "binary":
+        from analyzer_binary import binary_path
+        return binary_path(path)
+    return path
+
+
+def open_store(path, kind=None):
+    """Membuat backend penyimpanan sesuai RUN_ANALYZER_STORAGE (default: shard)"""
+    kind = kind or default_kind()
+    if kind == "sqlite":
+        return SqliteStore(sqlite_path(path), json_path=path)
+    if kind == "shard":
+        return ShardStore(shard_path(path), json_path=path)
+    if kind == "binary":
+        from analyzer_binary import BinaryStore, binary_path
+        return BinaryStore(binary_path(path), json_path=path)
+    if kind not in STORES:
+        raise ValueError(f"Backend penyimpanan tidak dikenal: {kind}")
+    return STORES[kind](path)
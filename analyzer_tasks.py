@@ -0,0 +1,188 @@
+"""Menjalankan pekerjaan berat tanpa memblokir event loop Tk.
+
+Pekerjaan latar berjalan di ThreadPoolExecutor dan mengirim progres serta
+hasilnya lewat queue. Thread GUI mengambil queue itu dengan widget.after()
+setiap POLL_MS, paling lama POLL_BUDGET detik per giliran, lalu memanggil
+callback di thread GUI. Progres yang menumpuk digabung menjadi yang terbaru.
+Pekerjaan latar hanya membaca salinan data atau file dan tidak menyentuh
+widget.
+
+Pekerjaan yang harus mengubah data milik GUI (misalnya menerapkan op hasil
+impor) dijalankan dengan iterate(): generator dilanjutkan sedikit demi
+sedikit di after() sampai jatah waktunya habis.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import time
+
+POLL_MS = 16
+POLL_BUDGET = 0.008
+
+
+class Cancelled(Exception):
+    """Dilempar Task.check() setelah task dibatalkan"""
+
+
+class Task:
+    """Satu pekerjaan: dibatalkan lewat cancel(), melapor lewat progress()"""
+
+    def __init__(self, runner, name, on_done=None, on_progress=None, on_error=None, on_cancel=None):
+        self.runner = runner
+        self.name = name
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.cancel_event = threading.Event()
+        self.finished = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+
+    def progress(self, done, total=None, text=""):
+        """Melaporkan progres (boleh dari thread latar); sekaligus titik pembatalan"""
+        self.check()
+        self.runner.events.put((self, "progress", (done, total, text)))
+
+
+class TaskRunner:
+    """Thread pool + queue yang dibaca thread GUI lewat after()"""
+
+    def __init__(self, widget, workers=2, poll_ms=POLL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task")
+        self.events = queue.SimpleQueue()
+        self.tasks = {}
+        self.polling = None
+
+    def submit(self, name, fn, *args, **callbacks):
+        """fn(task, *args) di thread latar; task lama bernama sama dibatalkan.
+
+        callbacks: on_done(hasil), on_progress(done, total, text), on_error(exc),
+        on_cancel() -- semuanya dipanggil di thread GUI.
+        """
+        task = self.start(name, callbacks)
+        self.executor.submit(self.run, task, fn, args)
+        return task
+
+    def iterate(self, name, steps, budget=POLL_BUDGET, **callbacks):
+        """Menjalankan generator di thread GUI per potongan waktu.
+
+        Setiap nilai yang di-yield adalah (done, total, text) untuk progres,
+        atau None jika sedang menunggu data dari thread latar (giliran
+        berikutnya setelah poll_ms); nilai return generator diteruskan ke
+        on_done.
+        """
+        task = self.start(name, callbacks)
+
+        def step():
+            deadline = time.perf_counter() + budget
+            value = None
+            delay = 1
+            try:
+                while time.perf_counter() < deadline:
+                    if task.cancelled:
+                        steps.close()
+                        return self.finish(task, "cancel", None)
+                    item = next(steps)
+                    if item is None:
+                        delay = self.poll_ms
+                        break
+                    value = item
+            except StopIteration as stop:
+                return self.finish(task, "done", stop.value)
+            except Exception as e:
+                return self.finish(task, "error", e)
+            if task.on_progress and value is not None:
+                task.on_progress(*value)
+            self.widget.after(delay, step)
+
+        self.widget.after_idle(step)
+        return task
+
+    def start(self, name, callbacks):
+        old = self.tasks.get(name)
+        if old is not None:
+            old.cancel()
+        task = Task(self, name, **callbacks)
+        self.tasks[name] = task
+        self.schedule()
+        return task
+
+    def run(self, task, fn, args):
+        try:
+            result = fn(task, *args)
+        except Cancelled:
+            self.events.put((task, "cancel", None))
+        except Exception as e:
+            self.events.put((task, "error", e))
+        else:
+            self.events.put((task, "cancel" if task.cancelled else "done", result))
+
+    def schedule(self):
+        if self.polling is None:
+            self.polling = self.widget.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        self.polling = None
+        deadline = time.perf_counter() + POLL_BUDGET
+        progress = {}
+        while time.perf_counter() < deadline:
+            try:
+                task, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                progress[task] = value
+                continue
+            progress.pop(task, None)
+            self.finish(task, kind, value)
+        for task, value in progress.items():
+            if not task.finished and not task.cancelled and task.on_progress:
+                task.on_progress(*value)
+        if self.tasks or not self.events.empty():
+            self.schedule()
+
+    def finish(self, task, kind, value):
+        if task.finished:
+            return
+        task.finished = True
+        if self.tasks.get(task.name) is task:
+            del self.tasks[task.name]
+        if kind == "done" and task.cancelled:
+            kind = "cancel"
+        if kind == "done" and task.on_done:
+            task.on_done(value)
+        elif kind == "error":
+            if task.on_error:
+                task.on_error(value)
+            else:
+                print(f"Error pada task {task.name}: {value}")
+        elif kind == "cancel" and task.on_cancel:
+            task.on_cancel()
+
+    def cancel(self, name=None):
+        """Membatalkan satu task (atau semua jika name None)"""
+        for task in list(self.tasks.values()):
+            if name is None or task.name == name:
+                task.cancel()
+
+    def busy(self):
+        return bool(self.tasks)
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.polling is not None:
+            self.widget.after_cancel(self.polling)
+            self.polling = None
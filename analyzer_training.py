@@ -0,0 +1,156 @@
+"""Beban latihan akut/kronis (EWMA) dan saran latihan untuk tab Jadwal.
+
+Beban satu sesi = durasi (menit) x intensitas, dengan intensitas
+(PACE_ACUAN / pace)^2 sebagai pengganti RPE/detak jantung yang tidak
+dicatat. Beban harian dirata-rata eksponensial:
+    akut_d   = akut_(d-1)   * (1 - LA) + LA * beban_d     (LA = 2 / (7 + 1))
+    kronis_d = kronis_(d-1) * (1 - LC) + LC * beban_d     (LC = 2 / (28 + 1))
+rasio = akut / kronis (acute:chronic workload ratio).
+
+Nilai per hari disimpan di cache array mulai hari pertama sampai hari
+terakhir yang pernah dibaca. Karena EWMA linear, sesi baru pada hari
+terakhir di cache cukup menambah LA*beban dan LC*beban ke nilai hari itu
+(O(1)). Sesi di tanggal lama atau tanggal yang dihapus memotong cache mulai
+tanggal itu; sisanya dihitung ulang saat dibaca berikutnya.
+"""
+from array import array
+from datetime import date
+
+from analyzer_search import PROGRESS_EVERY, to_day
+from analyzer_sessions import SessionStore
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+LA = 2 / (ACUTE_DAYS + 1)
+LC = 2 / (CHRONIC_DAYS + 1)
+PACE_ACUAN = 6.0
+# (batas atas rasio, saran, keterangan) -- dicek berurutan
+SARAN = [
+    (0.8, "Tambah Volume", "beban turun, naikkan jarak bertahap"),
+    (1.3, "Boleh Intensitas", "zona aman untuk interval/tempo"),
+    (1.5, "Latihan Ringan", "beban naik cepat, lari santai saja"),
+    (float("inf"), "Istirahat", "beban akut terlalu tinggi, risiko cedera")
+]
+
+
+def session_load(jarak, waktu):
+    """Beban satu sesi: menit x (PACE_ACUAN / pace)^2"""
+    pace = waktu / jarak
+    return waktu * (PACE_ACUAN / pace) ** 2
+
+
+def advice(acute, chronic, days):
+    """(saran, keterangan) untuk rasio akut/kronis; butuh riwayat minimal CHRONIC_DAYS hari"""
+    if days < CHRONIC_DAYS or chronic <= 0:
+        return "Belum Cukup Data", f"butuh riwayat lari {CHRONIC_DAYS} hari"
+    ratio = acute / chronic
+    for limit, saran, keterangan in SARAN:
+        if ratio < limit:
+            return saran, keterangan
+
+
+class TrainingLoad:
+    """Beban harian + cache EWMA akut/kronis per hari"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.load = {}
+        self.first = None
+        # cache[i] = nilai hari first + i; selalu valid dari awal sampai akhir array
+        self.acute = array("d")
+        self.chronic = array("d")
+
+    @classmethod
+    def build(cls, history, progress=None):
+        """Beban harian untuk seluruh history; cache diisi saat pertama dibaca"""
+        model = cls()
+        total = len(history)
+        if isinstance(history, SessionStore):
+            jarak, waktu = history.jarak, history.waktu
+            for i, (tanggal, rows) in enumerate(history.rows.items()):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                model.add_day(to_day(tanggal), sum(session_load(jarak[r], waktu[r]) for r in rows))
+        else:
+            for i, tanggal in enumerate(history):
+                if progress and i % PROGRESS_EVERY == 0:
+                    progress(i, total, tanggal)
+                model.add_day(to_day(tanggal), sum(session_load(s["jarak"], s["waktu"])
+                                                   for s in history[tanggal]))
+        return model
+
+    def apply(self, op):
+        """Memperbarui beban dengan op yang sama seperti apply_op"""
+        kind = op["op"]
+        if kind == "session":
+            self.add_day(to_day(op["date"]), session_load(op["session"]["jarak"], op["session"]["waktu"]))
+        elif kind == "delete":
+            self.remove_day(to_day(op["date"]))
+        elif kind == "clear":
+            self.clear()
+
+    def add_day(self, day, beban):
+        if not beban:
+            return
+        self.load[day] = self.load.get(day, 0.0) + beban
+        if self.first is None or day < self.first:
+            self.first = day
+            self.invalidate(day)
+            return
+        i = day - self.first
+        last = len(self.acute) - 1
+        if i == last:
+            self.acute[i] += LA * beban
+            self.chronic[i] += LC * beban
+        elif i < last:
+            self.invalidate(day)
+
+    def remove_day(self, day):
+        if self.load.pop(day, None) is None:
+            return
+        if not self.load:
+            return self.clear()
+        if day == self.first:
+            self.first = min(self.load)
+        self.invalidate(day)
+
+    def invalidate(self, day):
+        """Membuang cache mulai hari itu"""
+        i = max(0, day - self.first)
+        del self.acute[i:]
+        del self.chronic[i:]
+
+    def at(self, day):
+        """(akut, kronis) pada hari itu; cache diperpanjang sampai hari tersebut"""
+        if self.first is None or day < self.first:
+            return 0.0, 0.0
+        i = day - self.first
+        acute, chronic = self.acute, self.chronic
+        if i >= len(acute):
+            a = acute[-1] if acute else 0.0
+            c = chronic[-1] if chronic else 0.0
+            load = self.load
+            for d in range(self.first + len(acute), day + 1):
+                beban = load.get(d, 0.0)
+                a += LA * (beban - a)
+                c += LC * (beban - c)
+                acute.append(a)
+                chronic.append(c)
+        return acute[i], chronic[i]
+
+    def summary(self, anchor=None):
+        """Nilai hari acuan (ordinal, default hari ini) dan saran latihannya"""
+        anchor = anchor if anchor is not None else date.today().toordinal()
+        acute, chronic = self.at(anchor)
+        days = anchor - self.first + 1 if self.first is not None else 0
+        saran, keterangan = advice(acute, chronic, days)
+        return {
+            "acute": acute,
+            "chronic": chronic,
+            "ratio": acute / chronic if chronic > 0 else None,
+            "today": self.load.get(anchor, 0.0),
+            "saran": saran,
+            "keterangan": keterangan
+        }
@@ -0,0 +1,124 @@
+"""Deret tren (jarak, pace, progres target) dengan level-of-detail.
+
+Setiap deret disimpan sekali beserta piramida bucket min/max (level k
+berisi bucket 2**k titik). Saat digambar, rentang yang terlihat diringkas
+ke lebar plot dalam piksel: dengan LTTB bila titiknya sedikit, atau dari
+level min/max yang jumlah bucket-nya paling banyak setengah lebar plot.
+Biaya satu query sebanding dengan lebar plot, bukan dengan panjang riwayat.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+# sampai LTTB_LIMIT titik per piksel, titik asli diringkas dengan LTTB
+LTTB_LIMIT = 4
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: memilih threshold titik yang mempertahankan bentuk kurva"""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return xs, ys
+    every = (n - 2) / (threshold - 2)
+    out_x, out_y = [xs[0]], [ys[0]]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        span = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / span
+        avg_y = sum(ys[avg_start:avg_end]) / span
+        ax, ay = xs[a], ys[a]
+        best, best_area = avg_start - 1, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+class LodSeries:
+    """Deret (x naik) dengan level bucket min/max yang dihitung sekali"""
+
+    def __init__(self, xs, ys):
+        self.xs = list(xs)
+        self.ys = list(ys)
+        # level: (x titik minimum, y minimum, x titik maksimum, y maksimum) per bucket
+        self.levels = [(self.xs, self.ys, self.xs, self.ys)]
+        while len(self.levels[-1][0]) > 2:
+            lo_x, lo_y, hi_x, hi_y = self.levels[-1]
+            level = ([], [], [], [])
+            for i in range(0, len(lo_x), 2):
+                j = min(i + 1, len(lo_x) - 1)
+                lo = i if lo_y[i] <= lo_y[j] else j
+                hi = i if hi_y[i] >= hi_y[j] else j
+                level[0].append(lo_x[lo])
+                level[1].append(lo_y[lo])
+                level[2].append(hi_x[hi])
+                level[3].append(hi_y[hi])
+            self.levels.append(level)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def span(self):
+        if not self.xs:
+            return (0, 1)
+        if self.xs[0] == self.xs[-1]:
+            return (self.xs[0] - 1, self.xs[0] + 1)
+        return (self.xs[0], self.xs[-1])
+
+    def query(self, x0, x1, width):
+        """Titik yang perlu digambar untuk rentang [x0, x1] di plot selebar width piksel"""
+        width = max(3, int(width))
+        # satu titik di luar rentang di tiap sisi agar garis tidak terputus di tepi
+        i0 = max(0, bisect_left(self.xs, x0) - 1)
+        i1 = min(len(self.xs), bisect_right(self.xs, x1) + 1)
+        if i1 - i0 <= LTTB_LIMIT * width:
+            return lttb(self.xs[i0:i1], self.ys[i0:i1], width)
+        # jauh lebih banyak titik dari piksel: bucket min/max (puncak dan lembah tetap terlihat)
+        k = 0
+        while (i1 - i0) >> k > width // 2 and k + 1 < len(self.levels):
+            k += 1
+        lo_x, lo_y, hi_x, hi_y = self.levels[k]
+        xs, ys = [], []
+        for j in range(i0 >> k, ((i1 - 1) >> k) + 1):
+            if lo_x[j] <= hi_x[j]:
+                xs += (lo_x[j], hi_x[j])
+                ys += (lo_y[j], hi_y[j])
+            else:
+                xs += (hi_x[j], lo_x[j])
+                ys += (hi_y[j], lo_y[j])
+        return xs, ys
+
+
+def day_number(tanggal):
+    return date.fromisoformat(tanggal).toordinal()
+
+
+def distance_series(daily_distances):
+    """Jarak per hari"""
+    days = sorted(daily_distances)
+    return LodSeries([day_number(t) for t in days], [daily_distances[t] for t in days])
+
+
+def pace_series(rollup):
+    """Pace rata-rata per minggu dari rollup (tanpa memuat sesi satu per satu)"""
+    points = []
+    for key, (jarak, waktu, _, _) in rollup.buckets["week"].items():
+        if jarak > 0:
+            tahun, minggu = key.split("-W")
+            points.append((date.fromisocalendar(int(tahun), int(minggu), 1).toordinal(), waktu / jarak))
+    points.sort()
+    return LodSeries([x for x, _ in points], [y for _, y in points])
+
+
+def progress_series(daily_distances, daily_targets):
+    """Persentase jarak terhadap target pada hari yang punya target"""
+    days = sorted(t for t, target in daily_targets.items() if target and t in daily_distances)
+    return LodSeries([day_number(t) for t in days],
+                     [daily_distances[t] / daily_targets[t] * 100 for t in days])
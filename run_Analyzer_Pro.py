@@ -1,15 +1,311 @@
+import sys
+from analyzer_profile import Profiler, parse_profile_flags
+
+if __name__ == "__main__":
+    # perintah CLI (report, stats, import, ...) dijalankan sebelum tkinter diimpor
+    argv = parse_profile_flags(sys.argv[1:])
+    if argv:
+        from analyzer_cli import main
+        sys.exit(main(argv))
+
 import tkinter as tk 
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from collections import OrderedDict
 from datetime import datetime, date
-import json
 import os
+import queue
+import time
+from bisect import bisect_right
+from analyzer_core import hitung_kalori, hitung_pace, hitung_speed
+from analyzer_import import read_chunks, session_ops
+from analyzer_ingest import DRAIN_MS, REFRESH_INTERVAL, IngestServer
+from analyzer_rollup import Rollup, today_keys
+from analyzer_search import SessionIndex, parse_day, parse_number, parse_pace
+from analyzer_sessions import SessionStore
+from analyzer_stats import WINDOWS, RunningStats
+from analyzer_storage import DATA_FILE, PersistWorker, open_store, apply_op, session_count
+from analyzer_tasks import Cancelled, TaskRunner
+from analyzer_training import TrainingLoad
+from analyzer_trends import distance_series, pace_series, progress_series
 
 THEME = {
     "dark": {"bg":"#1e1e2e","frame":"#2d3047","card":"#3d405b","fg":"white"},
     "light":{"bg":"#f4f4f4","frame":"#ffffff","card":"#e6e6e6","fg":"black"}
 }
 
-DATA_FILE = "running_data.json"
+BULAN = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+         "Agustus", "September", "Oktober", "November", "Desember"]
+HISTORY_COLS = 3
+HISTORY_ROW_HEIGHT = 72
+DETAIL_ROW_HEIGHT = 104
+SEARCH_ROW_HEIGHT = 44
+DETAIL_CACHE_SIZE = 8
+# seberapa sering perubahan dari proses lain (dibaca thread penyimpanan) diterapkan, ms
+SYNC_MS = 250
+# potongan impor yang boleh menunggu diterapkan; thread baca berhenti sejenak jika penuh
+IMPORT_QUEUE = 4
+
+# state yang dibaca tiap tab: "sesi" = hasil analyze terakhir, "data" = history/target/jarak harian
+TAB_DEPS = {
+    "Hasil": {"sesi", "data"},
+    "Gizi": {"sesi", "data"},
+    "Jadwal": {"data"},
+    "History": {"data"},
+    "Trends": {"data"},
+    "Cari": {"data"}
+}
+TREND_CHARTS = ["Jarak harian", "Pace mingguan", "Progres vs target"]
+
+class LabelPool:
+    """Label yang dipakai ulang antar render: teks dan warna diganti, label berlebih disembunyikan"""
+
+    def __init__(self, parent, on_create=None):
+        self.parent = parent
+        self.on_create = on_create
+        self.labels = []
+        self.shown = []
+
+    def show(self, items):
+        """items: (text, fg, font, pady) untuk tiap label, berurutan dari atas"""
+        for i, item in enumerate(items):
+            text, fg, font, pady = item
+            if i == len(self.labels):
+                label = tk.Label(self.parent, text=text, fg=fg, font=font, bg=self.parent.cget("bg"))
+                self.labels.append(label)
+                self.shown.append(None)
+                if self.on_create:
+                    self.on_create(label)
+            if self.shown[i] != item:
+                self.labels[i].configure(text=text, fg=fg, font=font)
+                self.labels[i].pack(pady=pady)
+                self.shown[i] = item
+        for i in range(len(items), len(self.labels)):
+            if self.shown[i] is not None:
+                self.labels[i].pack_forget()
+                self.shown[i] = None
+
+
+class VirtualList:
+    """Daftar panjang yang digambar langsung di Canvas.
+
+    Hanya baris yang terlihat yang punya item Canvas; saat scroll, item baris
+    dipindah dan diisi ulang dengan data baris lain.
+    """
+
+    def __init__(self, parent, row_height, theme, make_row, fill_row, on_click=None):
+        self.row_height = row_height
+        self.make_row = make_row
+        self.fill_row = fill_row
+        self.on_click = on_click
+        self.count = 0
+        self.slots = []
+        self.card = theme["card"]
+        self.canvas = tk.Canvas(parent, bg=theme["bg"], highlightthickness=0,
+                                yscrollincrement=row_height)
+        self.scroll = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        if on_click:
+            self.canvas.bind("<Button-1>", self.on_press)
+
+    def set_count(self, n):
+        """Jumlah baris berubah / data diganti: semua baris terlihat diisi ulang"""
+        self.count = n
+        self.canvas.configure(scrollregion=(0, 0, 0, n * self.row_height))
+        for slot in self.slots:
+            slot["index"] = None
+        self.refresh()
+
+    def add_slot(self):
+        tag = f"slot{len(self.slots)}"
+        h = self.row_height
+        card = self.canvas.create_rectangle(0, 4, self.canvas.winfo_width(), h - 4,
+                                            fill=self.card, width=0, tags=(tag, "card"))
+        row = self.make_row(self.canvas, tag)
+        self.slots.append({"tag": tag, "card": card, "row": row, "y": 0, "index": None})
+
+    def on_press(self, event):
+        i = int(self.canvas.canvasy(event.y)) // self.row_height
+        if 0 <= i < self.count:
+            self.on_click(i)
+
+    def on_scroll(self, first, last):
+        self.scroll.set(first, last)
+        self.refresh()
+
+    def on_resize(self, event):
+        h = self.row_height
+        for slot in self.slots:
+            self.canvas.coords(slot["card"], 0, slot["y"] + 4, event.width, slot["y"] + h - 4)
+        self.refresh()
+
+    def refresh(self):
+        h = self.row_height
+        canvas = self.canvas
+        first = int(canvas.canvasy(0)) // h
+        visible = canvas.winfo_height() // h + 2
+        while len(self.slots) < min(visible, self.count):
+            self.add_slot()
+        for k, slot in enumerate(self.slots):
+            i = first + k
+            if k < visible and i < self.count:
+                y = i * h
+                if slot["y"] != y:
+                    canvas.move(slot["tag"], 0, y - slot["y"])
+                    slot["y"] = y
+                if slot["index"] != i:
+                    self.fill_row(canvas, slot["row"], i)
+                    slot["index"] = i
+                canvas.itemconfigure(slot["tag"], state="normal")
+            else:
+                canvas.itemconfigure(slot["tag"], state="hidden")
+
+    def apply_theme(self, t):
+        self.card = t["card"]
+        self.canvas.itemconfigure("card", fill=t["card"])
+        self.canvas.itemconfigure("fg", fill=t["fg"])
+
+
+class TrendChart:
+    """Grafik garis satu deret di Canvas dengan zoom (wheel) dan geser (drag).
+
+    Item Canvas dibuat sekali; setiap redraw hanya mengganti koordinat garis
+    dengan titik hasil LodSeries.query untuk rentang yang terlihat.
+    """
+
+    MARGIN = 50
+
+    def __init__(self, parent, theme):
+        self.series = None
+        self.view = (0, 1)
+        self.ref = None
+        self.unit = ""
+        self.drag = None
+        self.canvas = tk.Canvas(parent, bg=theme["frame"], highlightthickness=0, height=320)
+        self.canvas.pack(fill="both", expand=True)
+        c = self.canvas
+        self.axis = c.create_line(0, 0, 0, 0, fill="#888")
+        self.ref_line = c.create_line(0, 0, 0, 0, fill="#ffd166", dash=(4, 2))
+        self.line = c.create_line(0, 0, 0, 0, fill="#4ecdc4", width=2)
+        self.labels = {key: c.create_text(0, 0, fill=theme["fg"], font=("Arial",8), tags=("fg",))
+                       for key in ("ymax", "ymin", "xmin", "xmax")}
+        self.info = c.create_text(0, 0, fill="#888", font=("Arial",8), anchor="ne")
+        c.bind("<Configure>", lambda e: self.redraw())
+        c.bind("<MouseWheel>", lambda e: self.zoom(0.8 if e.delta > 0 else 1.25, e.x))
+        c.bind("<Button-4>", lambda e: self.zoom(0.8, e.x))
+        c.bind("<Button-5>", lambda e: self.zoom(1.25, e.x))
+        c.bind("<ButtonPress-1>", self.on_press)
+        c.bind("<B1-Motion>", self.on_drag)
+        c.bind("<Double-Button-1>", lambda e: self.reset())
+
+    def set_series(self, series, unit, ref=None, keep_view=False):
+        self.series = series
+        self.unit = unit
+        self.ref = ref
+        if not keep_view or self.view[0] < series.span()[0] - 7 or self.view[1] > series.span()[1] + 7:
+            self.view = series.span()
+        self.redraw()
+
+    def reset(self):
+        if self.series is not None:
+            self.view = self.series.span()
+            self.redraw()
+
+    def plot_width(self):
+        return max(1, self.canvas.winfo_width() - 2 * self.MARGIN)
+
+    def to_x(self, px):
+        x0, x1 = self.view
+        return x0 + (px - self.MARGIN) / self.plot_width() * (x1 - x0)
+
+    def zoom(self, factor, px):
+        """Zoom di sekitar posisi kursor; rentang minimal seminggu, maksimal seluruh data"""
+        if self.series is None or not len(self.series):
+            return
+        lo, hi = self.series.span()
+        x0, x1 = self.view
+        center = self.to_x(px)
+        span = min(max((x1 - x0) * factor, 7), max(hi - lo, 7))
+        ratio = (center - x0) / (x1 - x0) if x1 > x0 else 0.5
+        start = min(max(center - span * ratio, lo), max(lo, hi - span))
+        self.view = (start, start + span)
+        self.redraw()
+
+    def on_press(self, event):
+        self.drag = (event.x, self.view)
+
+    def on_drag(self, event):
+        if self.drag is None or self.series is None or not len(self.series):
+            return
+        px, (x0, x1) = self.drag
+        lo, hi = self.series.span()
+        shift = (px - event.x) / self.plot_width() * (x1 - x0)
+        shift = min(max(shift, lo - x0), max(lo - x0, hi - x1))
+        self.view = (x0 + shift, x1 + shift)
+        self.redraw()
+
+    def redraw(self):
+        start = time.perf_counter()
+        c = self.canvas
+        w, h = c.winfo_width(), c.winfo_height()
+        m = self.MARGIN
+        if w <= 2 * m or h <= 2 * m:
+            return  # belum di-map
+        c.coords(self.axis, m, m / 2, m, h - m, w - m, h - m)
+        if self.series is None or not len(self.series):
+            c.itemconfigure(self.line, state="hidden")
+            c.itemconfigure(self.ref_line, state="hidden")
+            for item in self.labels.values():
+                c.itemconfigure(item, text="")
+            c.itemconfigure(self.info, text="Belum ada data")
+            c.coords(self.info, w - m, 4)
+            return
+
+        x0, x1 = self.view
+        xs, ys = self.series.query(x0, x1, w - 2 * m)
+        values = ys + ([self.ref] if self.ref is not None else [])
+        y0, y1 = min(values), max(values)
+        if y1 - y0 < 1e-9:
+            y0, y1 = y0 - 1, y1 + 1
+        sx = (w - 2 * m) / (x1 - x0) if x1 > x0 else 0
+        sy = (h - 1.5 * m) / (y1 - y0)
+
+        coords = []
+        for x, y in zip(xs, ys):
+            coords += (m + (x - x0) * sx, h - m - (y - y0) * sy)
+        if len(coords) == 2:
+            coords += coords
+        c.coords(self.line, *coords)
+        c.itemconfigure(self.line, state="normal")
+        if self.ref is not None:
+            y = h - m - (self.ref - y0) * sy
+            c.coords(self.ref_line, m, y, w - m, y)
+            c.itemconfigure(self.ref_line, state="normal")
+        else:
+            c.itemconfigure(self.ref_line, state="hidden")
+
+        labels = self.labels
+        c.coords(labels["ymax"], m / 2, m / 2)
+        c.itemconfigure(labels["ymax"], text=f"{y1:.1f}")
+        c.coords(labels["ymin"], m / 2, h - m)
+        c.itemconfigure(labels["ymin"], text=f"{y0:.1f}")
+        c.coords(labels["xmin"], m + 30, h - m / 2)
+        c.itemconfigure(labels["xmin"], text=date.fromordinal(max(1, int(x0))).isoformat())
+        c.coords(labels["xmax"], w - m - 30, h - m / 2)
+        c.itemconfigure(labels["xmax"], text=date.fromordinal(max(1, int(x1))).isoformat())
+        elapsed = (time.perf_counter() - start) * 1000
+        c.coords(self.info, w - m, 4)
+        c.itemconfigure(self.info, text=f"{self.unit} | {len(self.series)} titik, "
+                                        f"{len(xs)} digambar, {elapsed:.1f} ms")
+
+    def apply_theme(self, t):
+        self.canvas.itemconfigure("fg", fill=t["fg"])
+
 
 class RunningApp(tk.Tk):
     def __init__(self):
@@ -18,53 +314,269 @@ class RunningApp(tk.Tk):
         self.geometry("700x750")
         self.mode = "dark"
         self.vars = {x: tk.StringVar() for x in ["jarak","waktu","berat","target_jarak"]}
-        self.history = {}
+        self.history = SessionStore()
         self.daily_targets = {}
         self.daily_distances = {}
+        self.rollup = Rollup()
+        self.store = open_store(DATA_FILE)
+        self.pending_ops = []
+        self.dirty_tabs = set(TAB_DEPS)
+        self.themed_widgets = []
+        self.themed_live = 0
+        self.canvas_views = []
+        self.detail_windows = OrderedDict()
+        self.data_version = 0
+        self.search_index = None
+        self.stats = None
+        self.training_load = None
+        # op yang masuk selama indeks dibangun di thread latar, per nama atribut indeks
+        self.backlogs = {}
+        self.task_state = {}
+        self.runner = TaskRunner(self)
+        self.profiler = Profiler.from_env()
+        if self.profiler:
+            self.profiler.install(self)
         
-       
         self.load_data()
+        self.persist = PersistWorker(self.store)
+        self.persist.start()
+        self.after(SYNC_MS, self.sync_external)
         
+        self.style = ttk.Style(self)
         self.make_gui()
+        if self.profiler:
+            self.profiler.attach_overlay(self)
         self.apply_theme()
+        self.show_all()
+        self.start_ingest()
         
         
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def load_data(self):
-        """Memuat data dari file JSON"""
+        """Memuat data dari backend penyimpanan (default: manifest + shard bulan ini)"""
+        self.search_index = None
+        self.stats = None
+        self.training_load = None
         try:
-            if os.path.exists(DATA_FILE):
-                with open(DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.history = data.get("history", {})
-                    self.daily_targets = data.get("daily_targets", {})
-                    self.daily_distances = data.get("daily_distances", {})
-                    
-                    
+            data = self.store.load()
+            self.history = data["history"]
+            self.daily_targets = data["daily_targets"]
+            self.daily_distances = data["daily_distances"]
+            self.rollup = data["rollup"]
         except Exception as e:
             print(f"Error loading data: {e}")
             
-            self.history = {}
+            self.history = SessionStore()
             self.daily_targets = {}
             self.daily_distances = {}
+            self.rollup = Rollup()
 
     def save_data(self):
-        """Menyimpan data ke file JSON"""
+        """Mengirim perubahan yang tertunda ke thread penyimpanan"""
+        if not self.pending_ops:
+            return
+        snapshot = None
+        if self.store.needs_compact(len(self.pending_ops)):
+            snapshot = self.snapshot_data()
+        self.persist.submit(self.pending_ops, snapshot)
+        self.pending_ops = []
+
+    def snapshot_data(self):
+        """Salinan data untuk thread penyimpanan agar tidak bentrok dengan perubahan baru"""
+        return {
+            "history": self.history.copy(),
+            "daily_targets": dict(self.daily_targets),
+            "daily_distances": dict(self.daily_distances),
+            "rollup": self.rollup.copy()
+        }
+
+    def data(self):
+        return {
+            "history": self.history,
+            "daily_targets": self.daily_targets,
+            "daily_distances": self.daily_distances,
+            "rollup": self.rollup
+        }
+
+    def start_ingest(self):
+        """Menjalankan endpoint ingest lokal jika RUN_ANALYZER_INGEST diisi"""
+        self.ingest = None
+        self.ingest_refresh = 0.0
+        self.ingest_dirty = False
         try:
-            data = {
-                "history": self.history,
-                "daily_targets": self.daily_targets,
-                "daily_distances": self.daily_distances
-            }
-            with open(DATA_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving data: {e}")
+            self.ingest = IngestServer.from_env()
+            if self.ingest:
+                self.ingest.start()
+        except (OSError, ValueError) as e:
+            print(f"Ingest tidak aktif: {e}")
+            self.ingest = None
+            return
+        if self.ingest:
+            self.after(DRAIN_MS, self.drain_ingest)
+
+    def drain_ingest(self):
+        """Menerapkan batch kiriman ingest; UI dirender ulang paling sering tiap REFRESH_INTERVAL"""
+        for op in self.ingest.ops(self.data()):
+            self.track(op)
+            self.ingest_dirty = True
+        if self.ingest_dirty and time.perf_counter() - self.ingest_refresh >= REFRESH_INTERVAL:
+            self.ingest_dirty = False
+            self.ingest_refresh = time.perf_counter()
+            self.save_data()
+            self.mark_dirty("data")
+        self.after(DRAIN_MS, self.drain_ingest)
+
+    def sync_external(self):
+        """Menerapkan op yang ditulis proses lain (instance lain atau skrip) ke data di memori"""
+        changed = reload = False
+        while True:
+            try:
+                epoch, ops, stale = self.persist.changes.get_nowait()
+            except queue.Empty:
+                break
+            if epoch != self.store.epoch:
+                # dibaca sebelum data dimuat ulang; sudah termasuk di data sekarang
+                continue
+            for op in ops:
+                # hapus/clear tidak komutatif dengan sesi lokal yang belum tertulis
+                if op["op"] != "session" or self.store.folded(self.history, op):
+                    reload = True
+                    break
+                apply_op(self.data(), op)
+                self.track(op, save=False)
+                changed = True
+            reload = reload or stale
+        if reload:
+            self.reload_data()
+        elif changed:
+            self.mark_dirty("data")
+        self.after(SYNC_MS, self.sync_external)
+
+    def reload_data(self):
+        """Memuat ulang data dari disk setelah perubahan lokal tertulis"""
+        self.save_data()
+        self.persist.flush()
+        for attr in list(self.backlogs):
+            self.runner.cancel(attr)
+        self.backlogs.clear()
+        self.load_data()
+        self.data_version += 1
+        for cached in self.detail_windows.values():
+            cached["window"].destroy()
+        self.detail_windows.clear()
+        self.show_all()
+
+    def record(self, op):
+        """Menerapkan perubahan ke data dan mencatatnya untuk disimpan"""
+        apply_op(self.data(), op)
+        self.track(op)
+
+    def track(self, op, save=True):
+        """Mencatat op yang sudah diterapkan: antrean simpan, versi data dan indeks"""
+        if save:
+            self.pending_ops.append(op)
+        self.data_version += 1
+        for index in (self.search_index, self.stats, self.training_load):
+            if index is not None:
+                index.apply(op)
+        for backlog in self.backlogs.values():
+            backlog.append(op)
+
+    def build_in_background(self, attr, text, tab, build, *args):
+        """Membangun self.<attr> di thread latar dari salinan data.
+
+        Op yang masuk selama pembangunan diputar ulang ke hasilnya, lalu tab
+        yang memakainya dirender ulang.
+        """
+        if attr in self.backlogs:
+            return
+        backlog = self.backlogs[attr] = []
+        history = self.history.copy() if hasattr(self.history, "copy") else dict(self.history)
+
+        def done(index):
+            if self.backlogs.get(attr) is not backlog:
+                # data dimuat ulang selama pembangunan: hasilnya sudah usang
+                return
+            del self.backlogs[attr]
+            for op in backlog:
+                index.apply(op)
+            setattr(self, attr, index)
+            self.dirty_tabs.add(tab)
+            self.render_tab(self.current_tab())
+
+        def stopped(*_):
+            if self.backlogs.get(attr) is backlog:
+                del self.backlogs[attr]
+
+        self.runner.submit(attr, lambda task: build(history, *args, progress=task.progress),
+                           **self.task_callbacks(attr, text, on_done=done, on_cancel=stopped,
+                                                 on_error=self.task_error(text, stopped)))
+
+    def task_callbacks(self, name, text, on_done=None, on_error=None, on_cancel=None):
+        """Callback TaskRunner yang sekaligus memperbarui bar progres"""
+        def progress(done, total=None, detail=""):
+            self.task_state.pop(name, None)
+            self.task_state[name] = (text, done, total, detail)
+            self.update_task_bar()
+
+        def finished(callback):
+            def call(*args):
+                if name not in self.runner.tasks:
+                    self.task_state.pop(name, None)
+                    self.update_task_bar()
+                if callback:
+                    callback(*args)
+            return call
+
+        self.task_state[name] = (text, 0, None, "")
+        self.update_task_bar()
+        return {"on_progress": progress, "on_done": finished(on_done),
+                "on_error": finished(on_error or self.task_error(text)), "on_cancel": finished(on_cancel)}
+
+    def task_error(self, text, then=None):
+        def show(e):
+            if then:
+                then()
+            messagebox.showerror("Error", f"{text} gagal: {e}")
+        return show
+
+    def update_task_bar(self):
+        """Bar progres tampil selama ada task; yang ditampilkan task terakhir yang melapor"""
+        if not hasattr(self, "task_bar"):
+            return
+        if not self.task_state:
+            self.task_bar.pack_forget()
+            return
+        text, done, total, detail = self.task_state[next(reversed(self.task_state))]
+        if total:
+            self.task_progress.configure(mode="determinate", maximum=total, value=done)
+        else:
+            self.task_progress.configure(mode="indeterminate")
+            self.task_progress.step(5)
+        label = f"{text} {detail}".strip()
+        if len(self.task_state) > 1:
+            label += f" (+{len(self.task_state) - 1} lainnya)"
+        self.set_text(self.task_label, label)
+        if not self.task_bar.winfo_ismapped():
+            self.task_bar.pack(fill="x", padx=20, pady=(0,5))
 
     def on_closing(self):
         """Handler saat aplikasi ditutup"""
+        # task yang belum selesai dibatalkan; op impor yang sudah diterapkan tetap disimpan
+        self.runner.shutdown()
+        if getattr(self, "ingest", None):
+            self.ingest.close()
+            # batch yang sudah diterima (202) tetap diterapkan dan disimpan
+            for op in self.ingest.ops(self.data(), budget=float("inf")):
+                self.track(op)
         self.save_data()
+        if self.persist.close(timeout=5.0):
+            self.store.close()
+        else:
+            print("Peringatan: penyimpanan belum selesai saat aplikasi ditutup")
+        if self.profiler:
+            self.profiler.close()
         self.destroy()
 
     def make_gui(self):
@@ -75,9 +587,10 @@ class RunningApp(tk.Tk):
         self.notebook.pack(expand=True, fill="both", padx=20, pady=10)
         
         self.tabs = {}
-        for name in ["Input","Hasil","Gizi","Jadwal","History"]:
+        for name in ["Input","Hasil","Gizi","Jadwal","History","Trends","Cari"]:
             self.tabs[name] = ttk.Frame(self.notebook)
             self.notebook.add(self.tabs[name], text=name)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.render_tab(self.current_tab()))
 
         self.make_input_tab()
         
@@ -90,27 +603,153 @@ class RunningApp(tk.Tk):
         
         tk.Button(button_frame, text="Clear History", command=self.clear_history,
                  bg="#ff6b6b", fg="white", font=("Arial",10), padx=15).pack(side="left", padx=5)
+        
+        tk.Button(button_frame, text="Import File", command=self.import_sessions,
+                 bg="#4ecdc4", fg="white", font=("Arial",10), padx=15).pack(side="left", padx=5)
+        self.register_theme(button_frame)
+
+        # bar progres task latar, disembunyikan jika tidak ada task
+        t = THEME[self.mode]
+        self.task_bar = tk.Frame(self, bg=t["bg"])
+        self.task_label = tk.Label(self.task_bar, text="", bg=t["bg"], fg=t["fg"],
+                                   font=("Arial",9), anchor="w")
+        self.task_label.pack(side="left", fill="x", expand=True)
+        tk.Button(self.task_bar, text="Batal", command=self.runner.cancel,
+                  bg="#ff6b6b", fg="white", font=("Arial",9), padx=10).pack(side="right")
+        self.task_progress = ttk.Progressbar(self.task_bar, length=220)
+        self.task_progress.pack(side="right", padx=10)
+        self.register_theme(self.task_bar)
 
     def clear_history(self):
         """Menghapus semua data history"""
         if messagebox.askyesno("Konfirmasi", "Apakah Anda yakin ingin menghapus semua history?"):
-            self.history = {}
-            self.daily_targets = {}
-            self.daily_distances = {}
+            self.record({"op": "clear"})
             self.save_data()
-            self.show_history()
+            for cached in self.detail_windows.values():
+                cached["window"].destroy()
+            self.detail_windows.clear()
+            self.mark_dirty("data")
             messagebox.showinfo("Sukses", "Semua history telah dihapus!")
 
+    def import_sessions(self):
+        """Mengimpor sesi dari file ekspor jam tangan (CSV/GPX/TCX).
+
+        File dibaca di thread latar per potongan IMPORT_CHUNK sesi lewat
+        antrean berukuran IMPORT_QUEUE, jadi memori tetap kecil sebesar apa
+        pun filenya. Op diterapkan di thread GUI sedikit demi sedikit sehingga
+        window tetap responsif dan impor bisa dibatalkan.
+        """
+        paths = filedialog.askopenfilenames(
+            title="Import Sesi Lari",
+            filetypes=[("Ekspor jam tangan", "*.csv *.gpx *.tcx"), ("Semua file", "*.*")])
+        if not paths:
+            return
+        try:
+            berat = float(self.vars["berat"].get())
+        except ValueError:
+            berat = None
+
+        chunks = queue.Queue(maxsize=IMPORT_QUEUE)
+
+        def put(task, item):
+            while True:
+                task.check()
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def read(task):
+            # potongan sesi, lalu None (selesai) atau exception (berhenti)
+            try:
+                for i, path in enumerate(paths):
+                    task.progress(i, len(paths), os.path.basename(path))
+                    for chunk in read_chunks(path):
+                        put(task, chunk)
+            except Cancelled:
+                raise
+            except Exception as e:
+                put(task, e)
+                return
+            put(task, None)
+
+        self.runner.submit("import-read", read, **self.task_callbacks("import-read", "Membaca file"))
+        self.apply_import(chunks, berat)
+
+    def apply_import(self, chunks, berat):
+        """Menerapkan potongan sesi dari thread baca per potongan waktu di thread GUI"""
+        count = 0
+
+        def steps():
+            nonlocal count
+            while True:
+                try:
+                    chunk = chunks.get_nowait()
+                except queue.Empty:
+                    yield None
+                    continue
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                for op in session_ops(chunk, self.data(), berat):
+                    self.track(op)
+                    count += 1
+                    yield count, None, f"{count} sesi"
+
+        def finish(show, title, message):
+            self.runner.cancel("import-read")
+            # op yang sudah diterapkan tetap disimpan agar data dan file konsisten
+            self.save_data()
+            self.mark_dirty("data")
+            show(title, message)
+
+        self.runner.iterate("import", steps(), **self.task_callbacks(
+            "import", "Menerapkan", on_done=lambda _: finish(
+                messagebox.showinfo, "Sukses", f"{count} sesi berhasil diimpor!"),
+            on_error=lambda e: finish(messagebox.showerror, "Error", f"Import berhenti setelah {count} sesi: {e}"),
+            on_cancel=lambda: finish(messagebox.showinfo, "Import", f"Import dibatalkan setelah {count} sesi")))
+
     def apply_theme(self):
+        """Mewarnai ulang widget yang terdaftar sesuai palet aktif tanpa membangun ulang UI"""
         t = THEME[self.mode]
         self.configure(bg=t["bg"])
         self.title_lbl.configure(bg=t["bg"], fg=t["fg"])
-        for tab in self.tabs.values():
-            for widget in tab.winfo_children(): 
-                widget.destroy()
-        self.make_input_tab()
-        if hasattr(self, "pace"): 
-            self.show_all()
+        self.style.configure("TFrame", background=t["frame"])
+        self.style.configure("TNotebook", background=t["bg"])
+        self.prune_themed()
+        for widget, roles in self.themed_widgets:
+            widget.configure({opt: t[role] for opt, role in roles.items()})
+        for view in self.canvas_views:
+            view.apply_theme(t)
+
+    def register_theme(self, root):
+        """Mencatat sekali widget di bawah root yang memakai warna palet aktif"""
+        t = THEME[self.mode]
+        roles = {color: role for role, color in t.items() if role != "fg"}
+        stack = [root]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.winfo_children())
+            try:
+                bg = widget.cget("bg")
+            except tk.TclError:
+                continue  # widget ttk diwarnai lewat ttk.Style
+            if bg not in roles:
+                continue  # tombol berwarna tetap (mis. #ff6b6b) tidak ikut tema
+            opts = {"bg": roles[bg]}
+            if "fg" in widget.keys() and widget.cget("fg") == t["fg"]:
+                opts["fg"] = "fg"
+            self.themed_widgets.append((widget, opts))
+        if len(self.themed_widgets) > 2 * self.themed_live + 256:
+            self.prune_themed()
+
+    def prune_themed(self):
+        """Membuang widget yang sudah dihancurkan dari daftar tema"""
+        self.themed_widgets = [(w, r) for w, r in self.themed_widgets if w.winfo_exists()]
+        self.themed_live = len(self.themed_widgets)
+        self.canvas_views = [v for v in self.canvas_views if v.canvas.winfo_exists()]
 
     def toggle_theme(self):
         self.mode = "light" if self.mode=="dark" else "dark"
@@ -132,6 +771,7 @@ class RunningApp(tk.Tk):
         tk.Button(f, text="Analisis", command=self.analyze,
                   bg="#ff6b6b", fg="white", font=("Arial",11,"bold"),
                   pady=8).pack(fill="x", pady=20)
+        self.register_theme(f)
 
     def analyze(self):
         try:
@@ -145,9 +785,11 @@ class RunningApp(tk.Tk):
             return messagebox.showerror("Error","Input tidak valid!")
         
         today = date.today().strftime("%Y-%m-%d")
-        self.pace = w/j
-        self.speed = (j/w)*60
-        self.kal = j*b*0.653
+        self.last_jarak = j
+        self.last_time = datetime.now().strftime("%H:%M")
+        self.pace = hitung_pace(j, w)
+        self.speed = hitung_speed(j, w)
+        self.kal = hitung_kalori(j, b)
         
         if t is not None:
             self.daily_targets[today] = t
@@ -160,17 +802,10 @@ class RunningApp(tk.Tk):
             else:
                 self.target_jarak = 0
         
-        if today not in self.daily_distances:
-            self.daily_distances[today] = 0
-        self.daily_distances[today] += j
-        
-        total_jarak_hari_ini = self.daily_distances[today]
+        total_jarak_hari_ini = self.daily_distances.get(today, 0) + j
         
-        if today not in self.history:
-            self.history[today] = []
-        
-        self.history[today].append({
-            "time": datetime.now().strftime("%H:%M"),
+        sesi = {
+            "time": self.last_time,
             "jarak": j,
             "waktu": w,
             "pace": self.pace,
@@ -178,52 +813,184 @@ class RunningApp(tk.Tk):
             "kal": self.kal,
             "target": self.target_jarak,
             "total_jarak_harian": total_jarak_hari_ini
-        })
+        }
+        self.record({"op": "session", "date": today, "session": sesi,
+                     "target": self.daily_targets.get(today)})
         
         
         self.save_data()
         
-        self.show_all()
+        self.mark_dirty("sesi", "data")
         self.notebook.select(1)
 
     def show_all(self):
-        self.show_hasil()
-        self.show_gizi()
-        self.show_jadwal()
-        self.show_history()
+        """Menandai semua tab kotor; tab tersembunyi baru dibangun saat dibuka"""
+        self.dirty_tabs.update(TAB_DEPS)
+        self.render_tab(self.current_tab())
+
+    def mark_dirty(self, *keys):
+        """Menandai tab yang bergantung pada state yang berubah lalu merender tab yang terlihat"""
+        for name, deps in TAB_DEPS.items():
+            if deps.intersection(keys):
+                self.dirty_tabs.add(name)
+        self.render_tab(self.current_tab())
+        if "data" in keys:
+            for cached in self.detail_windows.values():
+                if cached["version"] != self.data_version and cached["window"].winfo_viewable():
+                    self.fill_detail(cached)
+
+    def current_tab(self):
+        return self.notebook.tab(self.notebook.select(), "text")
+
+    def render_tab(self, name):
+        """Merender tab hanya jika state yang dibacanya berubah sejak render terakhir"""
+        if name not in self.dirty_tabs:
+            return
+        self.dirty_tabs.discard(name)
+        {
+            "Hasil": self.show_hasil,
+            "Gizi": self.show_gizi,
+            "Jadwal": self.show_jadwal,
+            "History": self.show_history,
+            "Trends": self.show_trends,
+            "Cari": self.show_search
+        }[name]()
+
+    def set_text(self, label, text):
+        """Mengubah teks label hanya jika nilainya berbeda"""
+        if label.cget("text") != text:
+            label.config(text=text)
 
     def show_hasil(self):
+        if not getattr(self, "hasil_view", None) or not self.hasil_view.winfo_exists():
+            self.make_hasil_view()
+
+        if hasattr(self, "pace"):
+            data = [
+                ("Pace", f"{self.pace:.2f} menit/km"),
+                ("Kecepatan", f"{self.speed:.1f} km/jam"),
+                ("Kalori Terbakar", f"{self.kal:.0f} kalori")
+            ]
+            for label, value in data:
+                self.set_text(self.hasil_values[label], value)
+
+        # dibangun sekali di thread latar, setelah itu diperbarui per op di track()
+        if self.stats is None:
+            self.build_in_background("stats", "Menghitung statistik", "Hasil",
+                                     RunningStats.build, dict(self.daily_targets))
+            for label, value in self.hasil_values.items():
+                if label not in ("Pace", "Kecepatan", "Kalori Terbakar"):
+                    self.set_text(value, "...")
+            return
+        summary = self.stats.summary()
+        for n, (jarak, pace) in summary["windows"].items():
+            text = f"{jarak:.1f} km" + (f"  |  terbaik {pace:.2f} menit/km" if pace is not None else "")
+            self.set_text(self.hasil_values[f"{n} Hari Terakhir"], text)
+        best = summary["best_today"]
+        pr_pace, pr_jarak = summary["pr_pace"], summary["pr_jarak"]
+        data = [
+            ("Pace Terbaik Hari Ini", f"{best:.2f} menit/km" if best is not None else "-"),
+            ("Rekor Pace", f"{pr_pace[1]:.2f} menit/km ({pr_pace[0]})" if pr_pace else "-"),
+            ("Lari Terjauh", f"{pr_jarak[1]:.2f} km ({pr_jarak[0]})" if pr_jarak else "-"),
+            ("Streak Target", f"{summary['streak']} hari (terpanjang {summary['longest_streak']} hari)")
+        ]
+        for label, value in data:
+            self.set_text(self.hasil_values[label], value)
+
+    def make_hasil_view(self):
         t = THEME[self.mode]
         tab = self.tabs["Hasil"]
         for w in tab.winfo_children(): w.destroy()
         
         f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
         f.pack(fill="both", expand=True)
+        self.hasil_view = f
         
         tk.Label(f, text="HASIL ANALISIS", bg=t["frame"],
                  fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
         
-        data = [
-            ("Pace", f"{self.pace:.2f} menit/km"),
-            ("Kecepatan", f"{self.speed:.1f} km/jam"),
-            ("Kalori Terbakar", f"{self.kal:.0f} kalori")
-        ]
-        
-        for label, value in data:
+        self.hasil_values = {}
+        for label in ["Pace", "Kecepatan", "Kalori Terbakar"]:
             frame = tk.Frame(f, bg=t["card"], padx=15, pady=10)
             frame.pack(fill="x", pady=5)
             tk.Label(frame, text=label, bg=t["card"], fg=t["fg"],
                      font=("Arial",11)).pack(side="left")
-            tk.Label(frame, text=value, bg=t["card"], fg="#4ecdc4",
-                     font=("Arial",11,"bold")).pack(side="right")
+            self.hasil_values[label] = tk.Label(frame, text="-", bg=t["card"], fg="#4ecdc4",
+                                                font=("Arial",11,"bold"))
+            self.hasil_values[label].pack(side="right")
+
+        tk.Label(f, text="STATISTIK & REKOR", bg=t["frame"],
+                 fg="#ffd166", font=("Arial",12,"bold")).pack(pady=(15,5))
+        labels = [f"{n} Hari Terakhir" for n in WINDOWS]
+        labels += ["Pace Terbaik Hari Ini", "Rekor Pace", "Lari Terjauh", "Streak Target"]
+        for label in labels:
+            frame = tk.Frame(f, bg=t["card"], padx=15, pady=5)
+            frame.pack(fill="x", pady=2)
+            tk.Label(frame, text=label, bg=t["card"], fg=t["fg"],
+                     font=("Arial",10)).pack(side="left")
+            self.hasil_values[label] = tk.Label(frame, text="", bg=t["card"], fg="#4ecdc4",
+                                                font=("Arial",10,"bold"))
+            self.hasil_values[label].pack(side="right")
+        self.register_theme(f)
 
     def show_gizi(self):
+        """Hanya angka progres, status, kalori dan input terbaru yang diperbarui"""
+        if not getattr(self, "gizi_view", None) or not self.gizi_view.winfo_exists():
+            self.make_gizi_view()
+
+        if not (hasattr(self, 'target_jarak') and self.target_jarak > 0):
+            self.gizi_body.pack_forget()
+            self.gizi_message.pack(expand=True, fill="both")
+            return
+        self.gizi_message.pack_forget()
+        self.gizi_body.pack(fill="x")
+
+        today = date.today().strftime("%Y-%m-%d")
+        current_target = self.daily_targets.get(today, self.target_jarak)
+        total_jarak_hari_ini = self.daily_distances.get(today, 0)
+        jarak_sekarang = self.last_jarak
+        sisa_jarak = current_target - total_jarak_hari_ini
+        persentase = (total_jarak_hari_ini / current_target) * 100 if current_target > 0 else 0
+
+        data_progres = [
+            ("Target Harian", f"{current_target:.1f} km"),
+            ("Jarak Hari Ini", f"{total_jarak_hari_ini:.1f} km"),
+            ("Sisa Jarak", f"{max(0.0, sisa_jarak):.2f} km"),
+            ("Persentase", f"{persentase:.1f}%")
+        ]
+        for label, value in data_progres:
+            self.set_text(self.gizi_values[label], value)
+
+        if sisa_jarak <= 0:
+            status = [
+                ("🎯 TARGET HARIAN TERCAPAI!", "#4ecdc4", ("Arial",12,"bold"), 0),
+                (f"Total lari hari ini: {total_jarak_hari_ini:.1f} km (Target: {current_target:.1f} km)",
+                 "#4ecdc4", ("Arial",10), (5,0))
+            ]
+            if total_jarak_hari_ini > current_target:
+                excess = total_jarak_hari_ini - current_target
+                status.append((f"⭐ Anda telah melewati target harian sebesar {excess:.1f} km!",
+                               "#ffd166", ("Arial",10, "bold"), (5,0)))
+        else:
+            status = [
+                ("📊 BELUM TERCAPAI", "#ff6b6b", ("Arial",12,"bold"), 0),
+                (f"Kurang {sisa_jarak:.2f} km untuk capai target harian", "#ff6b6b", ("Arial",10), (5,0)),
+                (f"Progress: {persentase:.1f}% dari {current_target:.1f} km", "#888", ("Arial",9), (2,0))
+            ]
+        self.gizi_status.show(status)
+
+        self.set_text(self.gizi_kal, f"{self.kal:.0f} kalori")
+        self.set_text(self.gizi_info, f"Input terbaru: {jarak_sekarang:.1f} km pada {self.last_time}")
+
+    def make_gizi_view(self):
+        """Membangun tab Gizi sekali: daftar makanan dan tips statis tidak pernah dibangun ulang"""
         t = THEME[self.mode]
         tab = self.tabs["Gizi"]
         for w in tab.winfo_children(): w.destroy()
         
         main_frame = tk.Frame(tab, bg=t["frame"])
         main_frame.pack(fill="both", expand=True)
+        self.gizi_view = main_frame
         
         canvas = tk.Canvas(main_frame, bg=t["frame"], highlightthickness=0)
         scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
@@ -239,165 +1006,182 @@ class RunningApp(tk.Tk):
         
         canvas.pack(side="left", fill="both", expand=True, padx=(25,0), pady=25)
         scrollbar.pack(side="right", fill="y", pady=25)
-        
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+
+        def scroll(step):
+            canvas.yview_scroll(step, "units")
         
         container = tk.Frame(scrollable_frame, bg=t["frame"])
         container.pack(expand=True, fill="both", padx=20, pady=10)
-       
+        
         tk.Label(container, text="PROGRES & NUTRISI", bg=t["frame"],
                  fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,25))
         
-        if hasattr(self, 'target_jarak') and self.target_jarak > 0:
-            today = date.today().strftime("%Y-%m-%d")
-            
-            current_target = self.daily_targets.get(today, self.target_jarak)
-            
-            total_jarak_hari_ini = self.daily_distances.get(today, 0)
-            
-            jarak_sekarang = float(self.vars["jarak"].get())
-            
-            sisa_jarak = current_target - total_jarak_hari_ini
-            persentase = (total_jarak_hari_ini / current_target) * 100 if current_target > 0 else 0
-            
-            progress_container = tk.Frame(container, bg=t["frame"])
-            progress_container.pack(fill="x", pady=(0,20))
-            
-            tk.Label(progress_container, text="PROGRES TARGET LARI HARIAN", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(0,15))
-            
-            data_progres = [
-                ("Target Harian", f"{current_target:.1f} km"),
-                ("Jarak Hari Ini", f"{total_jarak_hari_ini:.1f} km"),
-                ("Sisa Jarak", f"{abs(sisa_jarak):.2f} km"),
-                ("Persentase", f"{persentase:.1f}%")
-            ]
-            
-            progress_grid = tk.Frame(progress_container, bg=t["frame"])
-            progress_grid.pack()
-            
-            for i, (label, value) in enumerate(data_progres):
-                row_frame = tk.Frame(progress_grid, bg=t["card"], padx=25, pady=12)
-                row_frame.grid(row=i, column=0, sticky="ew", pady=3, padx=50)
-                
-                tk.Label(row_frame, text=label, bg=t["card"], fg=t["fg"],
-                         font=("Arial",11), width=20, anchor="center").pack(side="left", expand=True)
-                
-                tk.Label(row_frame, text=":", bg=t["card"], fg=t["fg"],
-                         font=("Arial",11), padx=10).pack(side="left")
-                
-                tk.Label(row_frame, text=value, bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",11,"bold"), width=15, anchor="center").pack(side="left", expand=True)
-            
-            status_container = tk.Frame(container, bg=t["card"], padx=30, pady=15)
-            status_container.pack(fill="x", pady=15, padx=80)
-            
-            if sisa_jarak <= 0:
-                tk.Label(status_container, text="🎯 TARGET HARIAN TERCAPAI!", bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",12,"bold")).pack()
-                tk.Label(status_container, text=f"Total lari hari ini: {total_jarak_hari_ini:.1f} km (Target: {current_target:.1f} km)", 
-                         bg=t["card"], fg="#4ecdc4", font=("Arial",10)).pack(pady=(5,0))
-                
-                if total_jarak_hari_ini > current_target:
-                    excess = total_jarak_hari_ini - current_target
-                    tk.Label(status_container, text=f"⭐ Anda telah melewati target harian sebesar {excess:.1f} km!",
-                             bg=t["card"], fg="#ffd166", font=("Arial",10, "bold")).pack(pady=(5,0))
-            else:
-                tk.Label(status_container, text="📊 BELUM TERCAPAI", bg=t["card"], fg="#ff6b6b",
-                         font=("Arial",12,"bold")).pack()
-                tk.Label(status_container, text=f"Kurang {sisa_jarak:.2f} km untuk capai target harian", 
-                         bg=t["card"], fg="#ff6b6b", font=("Arial",10)).pack(pady=(5,0))
-                tk.Label(status_container, text=f"Progress: {persentase:.1f}% dari {current_target:.1f} km",
-                         bg=t["card"], fg="#888", font=("Arial",9)).pack(pady=(2,0))
-           
-            tk.Label(container, text="KALORI TERBAKAR", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(20,10))
-            
-            kal_container = tk.Frame(container, bg=t["card"], padx=30, pady=15)
-            kal_container.pack(fill="x", pady=5, padx=150)
-            tk.Label(kal_container, text=f"{self.kal:.0f} kalori", bg=t["card"], fg="#ff6b6b",
-                     font=("Arial",14,"bold")).pack()
-          
-            info_frame = tk.Frame(container, bg=t["card"], padx=15, pady=10)
-            info_frame.pack(fill="x", pady=10, padx=80)
-            tk.Label(info_frame, text=f"Input terbaru: {jarak_sekarang:.1f} km pada {datetime.now().strftime('%H:%M')}",
-                     bg=t["card"], fg="#888", font=("Arial",9)).pack()
-            
-            tk.Label(container, text="REKOMENDASI NUTRISI", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,15))
-            
-            makanan = [
-                ("Dada Ayam (100g)", "31g protein", "Protein tinggi, rendah lemak"),
-                ("Telur (2 butir)", "13g protein", "Protein lengkap, mudah dicerna"),
-                ("Salmon (100g)", "25g protein", "Protein + Omega-3"),
-                ("Tahu (100g)", "8g protein", "Protein nabati"),
-                ("Nasi Merah (100g)", "23g karbo", "Karbohidrat kompleks"),
-                ("Oatmeal (50g)", "30g karbo", "Serat tinggi, energi tahan lama"),
-                ("Ubi (100g)", "20g karbo", "Vitamin A, karbo sehat"),
-                ("Pisang (1 buah)", "27g karbo", "Kalium, energi cepat")
-            ]
-            
-            makanan_container = tk.Frame(container, bg=t["frame"])
-            makanan_container.pack(fill="x", padx=50)
+        self.gizi_message = tk.Frame(container, bg=t["frame"], padx=20, pady=40)
+        tk.Label(self.gizi_message, text="Masukkan target jarak harian di tab Input", 
+                 bg=t["frame"], fg=t["fg"], font=("Arial",11)).pack(expand=True)
+        tk.Label(self.gizi_message, text="Target akan digunakan untuk menghitung progres harian", 
+                 bg=t["frame"], fg="#888", font=("Arial",9)).pack()
+
+        body = tk.Frame(container, bg=t["frame"])
+        self.gizi_body = body
+        
+        progress_container = tk.Frame(body, bg=t["frame"])
+        progress_container.pack(fill="x", pady=(0,20))
+        
+        tk.Label(progress_container, text="PROGRES TARGET LARI HARIAN", bg=t["frame"],
+                 fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(0,15))
+        
+        progress_grid = tk.Frame(progress_container, bg=t["frame"])
+        progress_grid.pack()
+        
+        self.gizi_values = {}
+        for i, label in enumerate(["Target Harian", "Jarak Hari Ini", "Sisa Jarak", "Persentase"]):
+            row_frame = tk.Frame(progress_grid, bg=t["card"], padx=25, pady=12)
+            row_frame.grid(row=i, column=0, sticky="ew", pady=3, padx=50)
             
-            for i, (nama, nutrisi, desc) in enumerate(makanan):
-                frame = tk.Frame(makanan_container, bg=t["card"], padx=15, pady=10)
-                frame.pack(fill="x", pady=4)
-             
-                content_frame = tk.Frame(frame, bg=t["card"])
-                content_frame.pack(expand=True)
-                
-                tk.Label(content_frame, text=nama, bg=t["card"], fg=t["fg"],
-                         font=("Arial",10,"bold"), width=25).pack(pady=(0,5))
-                
-                nutrisi_frame = tk.Frame(content_frame, bg=t["card"])
-                nutrisi_frame.pack()
-                
-                tk.Label(nutrisi_frame, text=nutrisi, bg=t["card"], fg="#ff6b6b",
-                         font=("Arial",9,"bold"), width=20).pack(side="left", padx=(0,10))
-                
-                tk.Label(nutrisi_frame, text=desc, bg=t["card"], fg="#888",
-                         font=("Arial",9), wraplength=200, justify="center").pack(side="left")
+            tk.Label(row_frame, text=label, bg=t["card"], fg=t["fg"],
+                     font=("Arial",11), width=20, anchor="center").pack(side="left", expand=True)
+            tk.Label(row_frame, text=":", bg=t["card"], fg=t["fg"],
+                     font=("Arial",11), padx=10).pack(side="left")
+            self.gizi_values[label] = tk.Label(row_frame, text="", bg=t["card"], fg="#4ecdc4",
+                                               font=("Arial",11,"bold"), width=15, anchor="center")
+            self.gizi_values[label].pack(side="left", expand=True)
+        
+        status_container = tk.Frame(body, bg=t["card"], padx=30, pady=15)
+        status_container.pack(fill="x", pady=15, padx=80)
+        self.gizi_status = LabelPool(status_container, on_create=lambda w: (
+            self.register_theme(w), self.bind_wheel(w, scroll)))
+        
+        tk.Label(body, text="KALORI TERBAKAR", bg=t["frame"],
+                 fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(20,10))
+        
+        kal_container = tk.Frame(body, bg=t["card"], padx=30, pady=15)
+        kal_container.pack(fill="x", pady=5, padx=150)
+        
+        self.gizi_kal = tk.Label(kal_container, text="", bg=t["card"], fg="#ff6b6b",
+                                 font=("Arial",14,"bold"))
+        self.gizi_kal.pack()
+        
+        info_frame = tk.Frame(body, bg=t["card"], padx=15, pady=10)
+        info_frame.pack(fill="x", pady=10, padx=80)
+        
+        self.gizi_info = tk.Label(info_frame, text="", bg=t["card"], fg="#888", font=("Arial",9))
+        self.gizi_info.pack()
+        
+        tk.Label(body, text="REKOMENDASI NUTRISI", bg=t["frame"],
+                 fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,15))
+        
+        makanan = [
+            ("Dada Ayam (100g)", "31g protein", "Protein tinggi, rendah lemak"),
+            ("Telur (2 butir)", "13g protein", "Protein lengkap, mudah dicerna"),
+            ("Salmon (100g)", "25g protein", "Protein + Omega-3"),
+            ("Tahu (100g)", "8g protein", "Protein nabati"),
+            ("Nasi Merah (100g)", "23g karbo", "Karbohidrat kompleks"),
+            ("Oatmeal (50g)", "30g karbo", "Serat tinggi, energi tahan lama"),
+            ("Ubi (100g)", "20g karbo", "Vitamin A, karbo sehat"),
+            ("Pisang (1 buah)", "27g karbo", "Kalium, energi cepat")
+        ]
+        
+        makanan_container = tk.Frame(body, bg=t["frame"])
+        makanan_container.pack(fill="x", padx=50)
+        
+        for nama, nutrisi, desc in makanan:
+            frame = tk.Frame(makanan_container, bg=t["card"], padx=15, pady=10)
+            frame.pack(fill="x", pady=4)
             
-            tk.Label(container, text="TIPS CEPAT", bg=t["frame"],
-                     fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,10))
+            content_frame = tk.Frame(frame, bg=t["card"])
+            content_frame.pack(expand=True)
             
-            tips = [
-                "Protein dalam 30 menit setelah lari",
-                "Minum air 500ml setiap 30 menit lari",
-                "Karbohidrat kompleks sebelum lari",
-                "Hindari makanan berat 2 jam sebelum lari"
-            ]
+            tk.Label(content_frame, text=nama, bg=t["card"], fg=t["fg"],
+                     font=("Arial",10,"bold"), width=25).pack(pady=(0,5))
             
-            tips_container = tk.Frame(container, bg=t["frame"])
-            tips_container.pack(fill="x", padx=100)
+            nutrisi_frame = tk.Frame(content_frame, bg=t["card"])
+            nutrisi_frame.pack()
             
-            for tip in tips:
-                frame = tk.Frame(tips_container, bg=t["card"], padx=15, pady=8)
-                frame.pack(fill="x", pady=3)
-                tk.Label(frame, text=f"✓ {tip}", bg=t["card"], fg="#4ecdc4",
-                         font=("Arial",9)).pack(anchor="center")
-        else:
-            message_frame = tk.Frame(container, bg=t["frame"], padx=20, pady=40)
-            message_frame.pack(expand=True, fill="both")
-            tk.Label(message_frame, text="Masukkan target jarak harian di tab Input", 
-                     bg=t["frame"], fg=t["fg"], font=("Arial",11)).pack(expand=True)
-            tk.Label(message_frame, text="Target akan digunakan untuk menghitung progres harian", 
-                     bg=t["frame"], fg="#888", font=("Arial",9)).pack()
+            tk.Label(nutrisi_frame, text=nutrisi, bg=t["card"], fg="#ff6b6b",
+                     font=("Arial",9,"bold"), width=20).pack(side="left", padx=(0,10))
+            tk.Label(nutrisi_frame, text=desc, bg=t["card"], fg="#888",
+                     font=("Arial",9), wraplength=200, justify="center").pack(side="left")
+        
+        tk.Label(body, text="TIPS CEPAT", bg=t["frame"],
+                 fg=t["fg"], font=("Arial",12,"bold")).pack(pady=(25,10))
+        
+        tips = [
+            "Protein dalam 30 menit setelah lari",
+            "Minum air 500ml setiap 30 menit lari",
+            "Karbohidrat kompleks sebelum lari",
+            "Hindari makanan berat 2 jam sebelum lari"
+        ]
+        
+        tips_container = tk.Frame(body, bg=t["frame"])
+        tips_container.pack(fill="x", padx=100)
+        
+        for tip in tips:
+            frame = tk.Frame(tips_container, bg=t["card"], padx=15, pady=8)
+            frame.pack(fill="x", pady=3)
+            tk.Label(frame, text=f"✓ {tip}", bg=t["card"], fg="#4ecdc4",
+                     font=("Arial",9)).pack(anchor="center")
+
+        self.bind_wheel(main_frame, scroll)
+        self.register_theme(main_frame)
+
+    def bind_wheel(self, root, scroll):
+        """Mouse wheel di root dan semua turunannya memanggil scroll(-1/1); tanpa bind_all"""
+        stack = [root]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.winfo_children())
+            widget.bind("<MouseWheel>", lambda e: scroll(-1 if e.delta > 0 else 1))
+            widget.bind("<Button-4>", lambda e: scroll(-1))
+            widget.bind("<Button-5>", lambda e: scroll(1))
 
     def show_jadwal(self):
+        """Tabel jadwal dibangun sekali; yang diperbarui hanya kartu beban latihan"""
+        if not getattr(self, "jadwal_view", None) or not self.jadwal_view.winfo_exists():
+            self.make_jadwal_view()
+
+        # dibangun sekali di thread latar, setelah itu diperbarui per op di track()
+        if self.training_load is None:
+            self.build_in_background("training_load", "Menghitung beban latihan", "Jadwal",
+                                     TrainingLoad.build)
+            for value in self.jadwal_values.values():
+                self.set_text(value, "...")
+            return
+        summary = self.training_load.summary()
+        ratio = summary["ratio"]
+        data = [
+            ("Beban Akut (7 hari)", f"{summary['acute']:.0f}"),
+            ("Beban Kronis (28 hari)", f"{summary['chronic']:.0f}"),
+            ("Rasio Akut/Kronis", f"{ratio:.2f}" if ratio is not None else "-"),
+            ("Saran Hari Ini", f"{summary['saran']} ({summary['keterangan']})")
+        ]
+        for label, value in data:
+            self.set_text(self.jadwal_values[label], value)
+
+    def make_jadwal_view(self):
         t = THEME[self.mode]
         tab = self.tabs["Jadwal"]
         for w in tab.winfo_children(): w.destroy()
         
         f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
         f.pack(fill="both", expand=True)
+        self.jadwal_view = f
+
+        tk.Label(f, text="BEBAN LATIHAN", bg=t["frame"],
+                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,10))
+
+        self.jadwal_values = {}
+        for label in ["Beban Akut (7 hari)", "Beban Kronis (28 hari)", "Rasio Akut/Kronis", "Saran Hari Ini"]:
+            frame = tk.Frame(f, bg=t["card"], padx=15, pady=5)
+            frame.pack(fill="x", pady=2)
+            tk.Label(frame, text=label, bg=t["card"], fg=t["fg"],
+                     font=("Arial",10)).pack(side="left")
+            self.jadwal_values[label] = tk.Label(frame, text="", bg=t["card"], fg="#4ecdc4",
+                                                 font=("Arial",10,"bold"))
+            self.jadwal_values[label].pack(side="right")
         
         tk.Label(f, text="JADWAL LATIHAN", bg=t["frame"],
-                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(0,20))
+                 fg="#ffd166", font=("Arial",14,"bold")).pack(pady=(15,20))
         
         hari = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
         jadwal = [
@@ -426,66 +1210,346 @@ class RunningApp(tk.Tk):
             color = "#ff6b6b" if i % 3 == 0 else "#4ecdc4" if i % 3 == 1 else "#ffd166"
             tk.Label(frame, text="●", bg=t["card"], fg=color,
                      font=("Arial",12)).pack(side="right")
+        self.register_theme(f)
 
     def show_history(self):
+        if not getattr(self, "history_view", None) or not self.history_view.winfo_exists():
+            self.make_history_view()
+
+        self.history_dates = sorted(self.history)
+        total_days = len(self.history_dates)
+        if total_days > 0:
+            total_runs = self.rollup.total[3]
+            self.history_info.config(text=f"({total_days} hari, {total_runs} sesi lari)")
+        else:
+            self.history_info.config(text="")
+        minggu, bulan, tahun = today_keys()
+        self.history_summary.config(text=(
+            f"Minggu ini: {self.rollup.get('week', minggu)[0]:.1f} km  |  "
+            f"Bulan ini: {self.rollup.get('month', bulan)[0]:.1f} km  |  "
+            f"Tahun ini: {self.rollup.get('year', tahun)[0]:.1f} km"))
+
+        if not self.history_dates:
+            self.history_nav.pack_forget()
+            self.history_body.pack_forget()
+            self.history_empty.pack(expand=True)
+            return
+
+        self.history_empty.pack_forget()
+        self.history_nav.pack(fill="x", pady=(0,10))
+        self.history_body.pack(fill="both", expand=True)
+
+        years = sorted(self.rollup.buckets["year"], reverse=True)
+        self.history_year.configure(values=years)
+        if self.history_year.get() not in years:
+            self.history_year.set(years[0])
+            self.update_history_months()
+        self.history_top = min(self.history_top, self.history_max_top())
+        self.render_history_rows()
+
+    def make_history_view(self):
+        """Membangun kerangka tab History sekali; baris tanggal didaur ulang saat scroll"""
         t = THEME[self.mode]
         tab = self.tabs["History"]
         for w in tab.winfo_children(): w.destroy()
 
         f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
         f.pack(fill="both", expand=True)
-        
+        self.history_view = f
         
         header_frame = tk.Frame(f, bg=t["frame"])
         header_frame.pack(fill="x", pady=(0,20))
         
         tk.Label(header_frame, text="Riwayat Analisis", bg=t["frame"],
                  fg="#ffd166", font=("Arial",14,"bold")).pack(side="left")
-        
-        
-        total_days = len(self.history)
-        if total_days > 0:
-            total_runs = sum(len(runs) for runs in self.history.values())
-            info_text = f"({total_days} hari, {total_runs} sesi lari)"
-            tk.Label(header_frame, text=info_text, bg=t["frame"],
-                     fg="#888", font=("Arial",10)).pack(side="left", padx=(10,0))
-        
-        if not self.history:
-            no_data_frame = tk.Frame(f, bg=t["frame"], pady=50)
-            no_data_frame.pack(expand=True)
-            tk.Label(no_data_frame, text="Belum ada riwayat lari", fg=t["fg"], 
-                     bg=t["frame"], font=("Arial",11)).pack()
-            tk.Label(no_data_frame, text="Mulai dengan menginput data di tab 'Input'", 
-                     fg="#888", bg=t["frame"], font=("Arial",9)).pack(pady=(10,0))
-            return
+        self.history_info = tk.Label(header_frame, text="", bg=t["frame"],
+                                     fg="#888", font=("Arial",10))
+        self.history_info.pack(side="left", padx=(10,0))
+        self.history_summary = tk.Label(f, text="", bg=t["frame"], fg="#4ecdc4",
+                                        font=("Arial",10))
+        self.history_summary.pack(anchor="w", pady=(0,10))
 
-        dates_frame = tk.Frame(f, bg=t["frame"])
-        dates_frame.pack(anchor="center")
+        self.history_empty = tk.Frame(f, bg=t["frame"], pady=50)
+        tk.Label(self.history_empty, text="Belum ada riwayat lari", fg=t["fg"], 
+                 bg=t["frame"], font=("Arial",11)).pack()
+        tk.Label(self.history_empty, text="Mulai dengan menginput data di tab 'Input'", 
+                 fg="#888", bg=t["frame"], font=("Arial",9)).pack(pady=(10,0))
 
-        row_frame = None
-        dates_list = sorted(self.history.keys(), reverse=True)
-        
-        for i, tanggal in enumerate(dates_list):
-            if i % 3 == 0:
-                row_frame = tk.Frame(dates_frame, bg=t["frame"])
-                row_frame.pack(anchor="center", pady=6)
+        self.history_nav = tk.Frame(f, bg=t["frame"])
+        tk.Label(self.history_nav, text="Lompat ke:", bg=t["frame"], fg=t["fg"],
+                 font=("Arial",10)).pack(side="left", padx=(0,8))
+        self.history_year = ttk.Combobox(self.history_nav, state="readonly", width=6)
+        self.history_year.pack(side="left", padx=(0,6))
+        self.history_year.bind("<<ComboboxSelected>>", lambda e: self.on_history_year())
+        self.history_month = ttk.Combobox(self.history_nav, state="readonly", width=12)
+        self.history_month.pack(side="left")
+        self.history_month.bind("<<ComboboxSelected>>", lambda e: self.on_history_month())
 
-           
-            num_runs = len(self.history[tanggal])
-            
+        self.history_body = tk.Frame(f, bg=t["frame"])
+        self.history_grid = tk.Frame(self.history_body, bg=t["frame"])
+        self.history_grid.pack_propagate(False)
+        self.history_grid.pack(side="left", fill="both", expand=True)
+        self.history_scroll = ttk.Scrollbar(self.history_body, orient="vertical",
+                                            command=self.history_yview)
+        self.history_scroll.pack(side="right", fill="y")
+
+        self.history_rows = []
+        self.history_top = 0
+        self.history_visible = 1
+        self.history_grid.bind("<Configure>", self.on_history_resize)
+        self.bind_history_wheel(self.history_grid)
+        self.register_theme(f)
+
+    def make_history_row(self):
+        t = THEME[self.mode]
+        row_frame = tk.Frame(self.history_grid, bg=t["frame"])
+        row_frame.pack(anchor="center", pady=6)
+        self.bind_history_wheel(row_frame)
+        buttons = []
+        for k in range(HISTORY_COLS):
             btn = tk.Button(
-                row_frame, text=f"{tanggal}\n({num_runs} sesi)",
-                command=lambda tgl=tanggal: self.show_date_detail(tgl),
-                bg=t["card"], fg=t["fg"], font=("Arial",10),
+                row_frame, bg=t["card"], fg=t["fg"], font=("Arial",10),
                 relief="flat", padx=20, pady=10, cursor="hand2",
                 width=12, height=2
             )
-            btn.pack(side="left", padx=6)
-
+            btn.configure(command=lambda b=btn: self.show_date_detail(b.tanggal))
+            btn.grid(row=0, column=k, padx=6)
             btn.bind("<Enter>", lambda e, b=btn: b.config(bg="#444444" if self.mode=="dark" else "#dddddd"))
-            btn.bind("<Leave>", lambda e, b=btn: b.config(bg=t["card"]))
+            btn.bind("<Leave>", lambda e, b=btn: b.config(bg=THEME[self.mode]["card"]))
+            self.bind_history_wheel(btn)
+            buttons.append(btn)
+        self.history_rows.append(buttons)
+        self.register_theme(row_frame)
+
+    def bind_history_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.history_yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.history_yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda e: self.history_yview("scroll", 1, "units"))
+
+    def on_history_resize(self, event):
+        self.history_visible = max(1, event.height // HISTORY_ROW_HEIGHT)
+        while len(self.history_rows) < self.history_visible:
+            self.make_history_row()
+        self.history_top = min(self.history_top, self.history_max_top())
+        self.render_history_rows()
+
+    def history_total_rows(self):
+        return (len(self.history_dates) + HISTORY_COLS - 1) // HISTORY_COLS
+
+    def history_max_top(self):
+        return max(0, self.history_total_rows() - self.history_visible)
+
+    def history_yview(self, *args):
+        """Perintah scrollbar/mouse wheel: hanya menggeser indeks baris pertama"""
+        if args[0] == "moveto":
+            top = int(float(args[1]) * self.history_total_rows() + 0.5)
+        else:
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.history_visible
+            top = self.history_top + step
+        top = max(0, min(top, self.history_max_top()))
+        if top != self.history_top:
+            self.history_top = top
+            self.render_history_rows()
+
+    def render_history_rows(self):
+        """Mengisi ulang tombol di baris yang terlihat dengan tanggal yang sesuai"""
+        dates = self.history_dates
+        n = len(dates)
+        for r, buttons in enumerate(self.history_rows):
+            row = self.history_top + r
+            for k, btn in enumerate(buttons):
+                i = row * HISTORY_COLS + k
+                if r < self.history_visible and i < n:
+                    tanggal = dates[n - 1 - i]
+                    btn.tanggal = tanggal
+                    btn.config(text=f"{tanggal}\n({session_count(self.history, tanggal)} sesi)")
+                    btn.grid()
+                else:
+                    btn.grid_remove()
+
+        total = self.history_total_rows()
+        if total:
+            self.history_scroll.set(self.history_top / total,
+                                    min(1.0, (self.history_top + self.history_visible) / total))
+        else:
+            self.history_scroll.set(0, 1)
+
+    def update_history_months(self):
+        year = self.history_year.get()
+        months = sorted((key[5:] for key in self.rollup.buckets["month"] if key.startswith(year)),
+                        reverse=True)
+        self.history_month.configure(values=[f"{m} - {BULAN[int(m) - 1]}" for m in months])
+        self.history_month.set("")
+
+    def on_history_year(self):
+        self.update_history_months()
+        self.jump_history(self.history_year.get())
+
+    def on_history_month(self):
+        self.jump_history(f"{self.history_year.get()}-{self.history_month.get()[:2]}")
+
+    def jump_history(self, prefix):
+        """Scroll ke tanggal terbaru yang diawali prefix (tahun atau tahun-bulan)"""
+        dates = self.history_dates
+        i_asc = max(0, bisect_right(dates, prefix + "~") - 1)
+        i = len(dates) - 1 - i_asc
+        self.history_top = min(i // HISTORY_COLS, self.history_max_top())
+        self.render_history_rows()
+
+    def show_trends(self):
+        """Deret tren dihitung ulang sekali per perubahan data; zoom/geser hanya query level"""
+        if not getattr(self, "trends_view", None) or not self.trends_view.winfo_exists():
+            self.make_trends_view()
+        self.trend_series = {
+            "Jarak harian": (distance_series(self.daily_distances), "km", None),
+            "Pace mingguan": (pace_series(self.rollup), "menit/km", None),
+            "Progres vs target": (progress_series(self.daily_distances, self.daily_targets), "%", 100)
+        }
+        self.on_trend_select(keep_view=True)
+
+    def make_trends_view(self):
+        t = THEME[self.mode]
+        tab = self.tabs["Trends"]
+        for w in tab.winfo_children(): w.destroy()
+
+        f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
+        f.pack(fill="both", expand=True)
+        self.trends_view = f
+
+        header_frame = tk.Frame(f, bg=t["frame"])
+        header_frame.pack(fill="x", pady=(0,15))
+        tk.Label(header_frame, text="TREN LATIHAN", bg=t["frame"],
+                 fg="#ffd166", font=("Arial",14,"bold")).pack(side="left")
+        self.trend_choice = ttk.Combobox(header_frame, state="readonly", width=18,
+                                         values=TREND_CHARTS)
+        self.trend_choice.set(TREND_CHARTS[0])
+        self.trend_choice.pack(side="right")
+        self.trend_choice.bind("<<ComboboxSelected>>", lambda e: self.on_trend_select())
+        tk.Label(f, text="Scroll untuk zoom, drag untuk geser, klik ganda untuk reset",
+                 bg=t["frame"], fg="#888", font=("Arial",9)).pack(anchor="w", pady=(0,8))
+
+        self.trend_chart = TrendChart(f, t)
+        self.canvas_views.append(self.trend_chart)
+        self.register_theme(f)
+
+    def on_trend_select(self, keep_view=False):
+        series, unit, ref = self.trend_series[self.trend_choice.get()]
+        self.trend_chart.set_series(series, unit, ref, keep_view=keep_view and len(series) > 0)
+
+    def show_search(self):
+        """Indeks dibangun di thread latar saat tab pertama kali dibuka; setelah itu diperbarui per op"""
+        if not getattr(self, "search_view", None) or not self.search_view.winfo_exists():
+            self.make_search_view()
+        if self.search_index is None:
+            self.build_in_background("search_index", "Membangun indeks pencarian", "Cari",
+                                     SessionIndex.build)
+        self.run_search()
+
+    def make_search_view(self):
+        t = THEME[self.mode]
+        tab = self.tabs["Cari"]
+        for w in tab.winfo_children(): w.destroy()
+
+        f = tk.Frame(tab, bg=t["frame"], padx=25, pady=25)
+        f.pack(fill="both", expand=True)
+        self.search_view = f
+
+        tk.Label(f, text="CARI SESI", bg=t["frame"],
+                 fg="#ffd166", font=("Arial",14,"bold")).pack(anchor="w", pady=(0,15))
+
+        form = tk.Frame(f, bg=t["frame"])
+        form.pack(fill="x")
+        self.search_vars = {}
+        fields = [
+            ("Tanggal", "dari", "sampai", "YYYY, YYYY-MM atau YYYY-MM-DD"),
+            ("Jarak (km)", "jarak_min", "jarak_max", ""),
+            ("Pace (menit/km)", "pace_min", "pace_max", "mis. 4:30"),
+            ("Kalori", "kal_min", "kal_max", "")
+        ]
+        for i, (label, lo, hi, hint) in enumerate(fields):
+            tk.Label(form, text=label, bg=t["frame"], fg=t["fg"],
+                     font=("Arial",10)).grid(row=i, column=0, sticky="w", pady=3)
+            for k, name in enumerate((lo, hi)):
+                self.search_vars[name] = tk.StringVar()
+                entry = tk.Entry(form, textvariable=self.search_vars[name], width=12)
+                entry.grid(row=i, column=1 + 2 * k, padx=5)
+                entry.bind("<Return>", lambda e: self.run_search())
+            tk.Label(form, text="s/d", bg=t["frame"], fg="#888",
+                     font=("Arial",9)).grid(row=i, column=2)
+            tk.Label(form, text=hint, bg=t["frame"], fg="#888",
+                     font=("Arial",8)).grid(row=i, column=4, sticky="w", padx=5)
+
+        button_frame = tk.Frame(f, bg=t["frame"])
+        button_frame.pack(fill="x", pady=10)
+        tk.Button(button_frame, text="Cari", command=self.run_search,
+                  bg="#4ecdc4", fg="white", font=("Arial",10), padx=15).pack(side="left")
+        self.search_info = tk.Label(button_frame, text="", bg=t["frame"], fg="#888",
+                                    font=("Arial",9))
+        self.search_info.pack(side="left", padx=10)
+
+        list_frame = tk.Frame(f, bg=t["frame"])
+        list_frame.pack(fill="both", expand=True)
+        self.search_rows = []
+        self.search_list = VirtualList(
+            list_frame, SEARCH_ROW_HEIGHT, t, self.make_search_row, self.fill_search_row,
+            on_click=lambda i: self.show_date_detail(self.search_index.session(self.search_rows[i])[0]))
+        self.canvas_views.append(self.search_list)
+        self.register_theme(f)
+
+    def run_search(self):
+        """Menjalankan query dari isi form; hasil (nomor baris indeks) ditampilkan di VirtualList"""
+        if self.search_index is None:
+            self.set_text(self.search_info, "Indeks sedang dibangun...")
+            self.search_rows = []
+            self.search_list.set_count(0)
+            return
+        v = {name: var.get() for name, var in self.search_vars.items()}
+        try:
+            ranges = {
+                "day": (parse_day(v["dari"]), parse_day(v["sampai"], end=True)),
+                "jarak": (parse_number(v["jarak_min"]), parse_number(v["jarak_max"])),
+                "pace": (parse_pace(v["pace_min"]), parse_pace(v["pace_max"])),
+                "kal": (parse_number(v["kal_min"]), parse_number(v["kal_max"]))
+            }
+        except ValueError:
+            self.set_text(self.search_info, "Input pencarian tidak valid")
+            return
+        start = time.perf_counter()
+        self.search_rows = self.search_index.query(**ranges)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.set_text(self.search_info, f"{len(self.search_rows)} sesi ({elapsed:.1f} ms)")
+        self.search_list.set_count(len(self.search_rows))
+
+    def make_search_row(self, canvas, tag):
+        t = THEME[self.mode]
+        return {
+            "date": canvas.create_text(15, SEARCH_ROW_HEIGHT / 2, anchor="w", fill=t["fg"],
+                                       font=("Arial",10,"bold"), tags=(tag, "fg")),
+            "info": canvas.create_text(200, SEARCH_ROW_HEIGHT / 2, anchor="w", fill="#4ecdc4",
+                                       font=("Arial",9), tags=(tag,))
+        }
+
+    def fill_search_row(self, canvas, row, i):
+        tanggal, nomor, jam, jarak, pace, kal = self.search_index.session(self.search_rows[i])
+        menit = int(pace)
+        detik = round((pace - menit) * 60)
+        if detik == 60:
+            menit, detik = menit + 1, 0
+        canvas.itemconfigure(row["date"], text=f"{tanggal}  #{nomor}  {jam}")
+        canvas.itemconfigure(row["info"], text=f"{jarak:.2f} km  |  {menit}:{detik:02d} /km  |  {kal:.0f} kal")
 
     def show_date_detail(self, tanggal):
+        cached = self.detail_windows.get(tanggal)
+        if cached is not None and cached["window"].winfo_exists():
+            self.detail_windows.move_to_end(tanggal)
+            if cached["version"] != self.data_version:
+                self.fill_detail(cached)
+            cached["window"].deiconify()
+            cached["window"].lift()
+            return
+
         detail = tk.Toplevel(self)
         detail.title(f"Detail {tanggal}")
         detail.geometry("600x500")
@@ -517,98 +1581,38 @@ class RunningApp(tk.Tk):
         summary_frame = tk.Frame(container, bg=t["frame"], padx=15, pady=15)
         summary_frame.pack(fill="x", pady=(0,15))
         
-        target_harian = self.daily_targets.get(tanggal, "Tidak ada target")
-        total_jarak = self.daily_distances.get(tanggal, 0)
-        num_sessions = len(self.history[tanggal])
-        
         tk.Label(summary_frame, text=f"📊 SUMMARY - {tanggal}", bg=t["frame"], 
                  fg=t["fg"], font=("Arial",11,"bold")).pack(anchor="w", pady=(0,8))
         
-        tk.Label(summary_frame, text=f"• Target Harian: {target_harian} km", 
-                 bg=t["frame"], fg=t["fg"], font=("Arial",10)).pack(anchor="w")
-        tk.Label(summary_frame, text=f"• Total Jarak: {total_jarak:.2f} km", 
-                 bg=t["frame"], fg="#4ecdc4", font=("Arial",10)).pack(anchor="w")
-        tk.Label(summary_frame, text=f"• Jumlah Sesi: {num_sessions} sesi", 
-                 bg=t["frame"], fg="#888", font=("Arial",9)).pack(anchor="w")
-        
-        
-        canvas_frame = tk.Frame(container, bg=t["bg"])
-        canvas_frame.pack(fill="both", expand=True)
-        
-        canvas = tk.Canvas(canvas_frame, bg=t["bg"], highlightthickness=0, height=300)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_content = tk.Frame(canvas, bg=t["bg"])
-        
-        scrollable_content.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_content, anchor="nw", width=550)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        summary = [
+            tk.Label(summary_frame, bg=t["frame"], fg=t["fg"], font=("Arial",10)),
+            tk.Label(summary_frame, bg=t["frame"], fg="#4ecdc4", font=("Arial",10)),
+            tk.Label(summary_frame, bg=t["frame"], fg="#888", font=("Arial",9))
+        ]
+        for label in summary:
+            label.pack(anchor="w")
         
         
-        tk.Label(scrollable_content, text="📝 DETAIL SESI LARI", bg=t["bg"],
+        tk.Label(container, text="📝 DETAIL SESI LARI", bg=t["bg"],
                  fg=t["fg"], font=("Arial",11,"bold")).pack(anchor="w", pady=(0,10))
         
-        for idx, item in enumerate(self.history[tanggal], 1):
-            session_frame = tk.Frame(scrollable_content, bg=t["card"], padx=15, pady=12)
-            session_frame.pack(fill="x", pady=4)
-            
-            
-            header_sesi = tk.Frame(session_frame, bg=t["card"])
-            header_sesi.pack(fill="x", pady=(0,8))
-            
-            tk.Label(header_sesi, text=f"Sesi #{idx} - {item['time']}", 
-                     bg=t["card"], fg=t["fg"], font=("Arial",10,"bold")).pack(side="left")
-            
-            
-            detail_frame = tk.Frame(session_frame, bg=t["card"])
-            detail_frame.pack()
-            
-            
-            left_frame = tk.Frame(detail_frame, bg=t["card"])
-            left_frame.grid(row=0, column=0, padx=(0,20))
-            
-            tk.Label(left_frame, text=f"Jarak: {item['jarak']} km", 
-                     bg=t["card"], fg="#4ecdc4", font=("Arial",9)).pack(anchor="w")
-            tk.Label(left_frame, text=f"Waktu: {item['waktu']} menit", 
-                     bg=t["card"], fg="#4ecdc4", font=("Arial",9)).pack(anchor="w")
-            tk.Label(left_frame, text=f"Pace: {item['pace']:.2f} menit/km", 
-                     bg=t["card"], fg="#4ecdc4", font=("Arial",9)).pack(anchor="w")
-            
-            
-            right_frame = tk.Frame(detail_frame, bg=t["card"])
-            right_frame.grid(row=0, column=1)
-            
-            tk.Label(right_frame, text=f"Speed: {item['speed']:.1f} km/jam", 
-                     bg=t["card"], fg="#ff6b6b", font=("Arial",9)).pack(anchor="w")
-            tk.Label(right_frame, text=f"Kalori: {item['kal']:.0f} kal", 
-                     bg=t["card"], fg="#ff6b6b", font=("Arial",9)).pack(anchor="w")
-            tk.Label(right_frame, text=f"Total Harian: {item['total_jarak_harian']:.1f} km", 
-                     bg=t["card"], fg="#888", font=("Arial",9)).pack(anchor="w")
-        
-       
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas_frame = tk.Frame(container, bg=t["bg"])
+        canvas_frame.pack(fill="both", expand=True)
         
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        cached = {"window": detail, "tanggal": tanggal, "summary": summary, "sessions": []}
+        cached["list"] = VirtualList(
+            canvas_frame, DETAIL_ROW_HEIGHT, t, self.make_session_row,
+            lambda canvas, row, i: self.fill_session_row(canvas, row, cached["sessions"], i))
+        self.canvas_views.append(cached["list"])
         
         
         def delete_date_history():
             if messagebox.askyesno("Konfirmasi", f"Hapus semua data untuk tanggal {tanggal}?"):
-                if tanggal in self.history:
-                    del self.history[tanggal]
-                if tanggal in self.daily_targets:
-                    del self.daily_targets[tanggal]
-                if tanggal in self.daily_distances:
-                    del self.daily_distances[tanggal]
+                self.record({"op": "delete", "date": tanggal})
                 self.save_data()
+                self.detail_windows.pop(tanggal, None)
                 detail.destroy()
-                self.show_history()
+                self.mark_dirty("data")
                 messagebox.showinfo("Sukses", f"Data untuk {tanggal} telah dihapus!")
         
         button_frame = tk.Frame(container, bg=t["bg"])
@@ -616,12 +1620,55 @@ class RunningApp(tk.Tk):
         
         tk.Button(button_frame, text="Hapus Data Tanggal Ini", command=delete_date_history,
                   bg="#ff6b6b", fg="white", font=("Arial",10), padx=15).pack()
+        self.register_theme(detail)
+
+        self.detail_windows[tanggal] = cached
+        self.fill_detail(cached)
+        while len(self.detail_windows) > DETAIL_CACHE_SIZE:
+            _, old = self.detail_windows.popitem(last=False)
+            old["window"].destroy()
+
+    def fill_detail(self, cached):
+        """Mengisi ringkasan dan daftar sesi window detail dari data terbaru"""
+        tanggal = cached["tanggal"]
+        target_harian = self.daily_targets.get(tanggal, "Tidak ada target")
+        total_jarak = self.daily_distances.get(tanggal, 0)
+        cached["sessions"] = list(self.history.get(tanggal, []))
+        
+        target_label, total_label, sesi_label = cached["summary"]
+        self.set_text(target_label, f"• Target Harian: {target_harian} km")
+        self.set_text(total_label, f"• Total Jarak: {total_jarak:.2f} km")
+        self.set_text(sesi_label, f"• Jumlah Sesi: {len(cached['sessions'])} sesi")
+        cached["list"].set_count(len(cached["sessions"]))
+        cached["version"] = self.data_version
+
+    def make_session_row(self, canvas, tag):
+        """Item Canvas untuk satu kartu sesi; dipakai ulang untuk sesi lain saat scroll"""
+        t = THEME[self.mode]
+        return {
+            "header": canvas.create_text(15, 20, anchor="w", fill=t["fg"],
+                                         font=("Arial",10,"bold"), tags=(tag, "fg")),
+            "left": [canvas.create_text(15, 44 + 18 * k, anchor="w", fill="#4ecdc4",
+                                        font=("Arial",9), tags=(tag,)) for k in range(3)],
+            "right": [canvas.create_text(240, 44 + 18 * k, anchor="w",
+                                         fill="#ff6b6b" if k < 2 else "#888",
+                                         font=("Arial",9), tags=(tag,)) for k in range(3)]
+        }
+
+    def fill_session_row(self, canvas, row, sessions, i):
+        item = sessions[i]
+        canvas.itemconfigure(row["header"], text=f"Sesi #{i + 1} - {item['time']}")
+        left, right = row["left"], row["right"]
+        canvas.itemconfigure(left[0], text=f"Jarak: {item['jarak']} km")
+        canvas.itemconfigure(left[1], text=f"Waktu: {item['waktu']} menit")
+        canvas.itemconfigure(left[2], text=f"Pace: {item['pace']:.2f} menit/km")
+        canvas.itemconfigure(right[0], text=f"Speed: {item['speed']:.1f} km/jam")
+        canvas.itemconfigure(right[1], text=f"Kalori: {item['kal']:.0f} kal")
+        canvas.itemconfigure(right[2], text=f"Total Harian: {item['total_jarak_harian']:.1f} km")
 
     def close_detail_window(self, window):
-        """Menutup window detail"""
-        window.destroy()
-        # Refresh history tab
-        self.show_history()
+        """Menyembunyikan window detail; window disimpan untuk dibuka lagi"""
+        window.withdraw()
 
 if __name__ == "__main__":
     app = RunningApp()
@@ -0,0 +1,42 @@
+"""Cek properti dan uji beban analyzer_bench dalam ukuran kecil.
+
+Versi penuhnya (dengan waktu) tetap dijalankan lewat
+python analyzer_bench.py stats|training|concurrency|copy.
+"""
+import shutil
+import tempfile
+import unittest
+
+from analyzer_bench import bench_concurrency, bench_copy, bench_stats, bench_training
+
+
+class BenchChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="run_test_")
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+
+    def test_stats_match_recompute(self):
+        # AssertionError dari bench jika statistik inkremental != hitung ulang
+        result = bench_stats(1500, check_every=25, scenario="1y")
+        self.assertGreater(result["checks"], 0)
+
+    def test_training_load_match_recompute(self):
+        result = bench_training(1500, check_every=25, scenario="1y")
+        self.assertGreater(result["checks"], 0)
+
+    def test_concurrent_writers_lose_nothing(self):
+        for result in bench_concurrency(["journal", "shard", "binary", "sqlite"], 2, 40, 10, self.workdir):
+            with self.subTest(storage=result["storage"]):
+                self.assertEqual((result["lost"], result["duplicates"]), (0, 0))
+                self.assertTrue(result["ok"])
+                self.assertTrue(result["watcher_ok"])
+
+    def test_history_copy_isolated(self):
+        for result in bench_copy(600, self.workdir, n_ops=20):
+            with self.subTest(storage=result["storage"]):
+                self.assertTrue(result["ok"], result)
+
+
+if __name__ == "__main__":
+    unittest.main()
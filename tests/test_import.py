@@ -0,0 +1,70 @@
+"""Import CSV/GPX/TCX."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from analyzer_import import import_files, parse_time
+from analyzer_storage import empty_data
+
+GPX = """<?xml version="1.0"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>
+<trkpt lat="-6.2000" lon="106.8000"><time>2025-03-14T23:30:00Z</time></trkpt>
+<trkpt lat="-6.2100" lon="106.8000"><time>2025-03-14T23:40:00Z</time></trkpt>
+</trkseg></trk></gpx>
+"""
+
+
+class ImportFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="run_test_")
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        old_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Asia/Jakarta"
+        time.tzset()
+        self.addCleanup(self.restore_tz, old_tz)
+
+    @staticmethod
+    def restore_tz(old_tz):
+        if old_tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = old_tz
+        time.tzset()
+
+    def write(self, name, text):
+        path = os.path.join(self.workdir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_utc_time_becomes_local(self):
+        self.assertEqual(parse_time("2025-03-14T23:30:00Z").isoformat(), "2025-03-15T06:30:00")
+        self.assertEqual(parse_time("2025-03-14T06:30:00+02:00").isoformat(), "2025-03-14T11:30:00")
+        self.assertEqual(parse_time("2025-03-14T06:30:00").isoformat(), "2025-03-14T06:30:00")
+
+    def test_gpx_session_on_local_date(self):
+        data = empty_data()
+        ops = import_files([self.write("run.gpx", GPX)], data, berat=60)
+        self.assertEqual([(op["date"], op["session"]["time"]) for op in ops], [("2025-03-15", "06:30")])
+
+    def test_skips_non_finite_rows(self):
+        path = self.write("runs.csv", "date,time,distance_km,duration_min,weight_kg,target\n"
+                                      "2025-03-01,06:00,5,30,60,10\n"
+                                      "2025-03-02,06:00,nan,30,60,10\n"
+                                      "2025-03-03,06:00,5,inf,60,10\n"
+                                      "2025-03-04,06:00,5,30,60,nan\n"
+                                      "2025-03-05,06:00,5,30,nan,10\n")
+        data = empty_data()
+        ops = import_files([path], data, berat=70)
+        self.assertEqual([op["date"] for op in ops], ["2025-03-01", "2025-03-05"])
+        # berat NaN di file diganti berat default
+        self.assertGreater(ops[1]["session"]["kal"], ops[0]["session"]["kal"])
+        with self.assertRaises(ValueError):
+            import_files([path], empty_data(), berat=float("nan"))
+
+
+if __name__ == "__main__":
+    unittest.main()
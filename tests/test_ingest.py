@@ -0,0 +1,43 @@
+"""Validasi sesi kiriman ingest."""
+from datetime import datetime
+import unittest
+
+from analyzer_ingest import parse_session
+
+NOW = datetime(2025, 3, 14, 7, 30)
+
+
+def session(**fields):
+    raw = {"date": "2025-03-14", "time": "06:05", "jarak": 5, "waktu": 30, "berat": 60}
+    raw.update(fields)
+    return raw
+
+
+class ParseSession(unittest.TestCase):
+
+    def test_valid_session(self):
+        sesi = parse_session(session(), NOW)
+        self.assertEqual((sesi["date"], sesi["time"]), ("2025-03-14", "06:05"))
+
+    def test_defaults_to_now(self):
+        sesi = parse_session(session(date=None, time=None), NOW)
+        self.assertEqual((sesi["date"], sesi["time"]), ("2025-03-14", "07:30"))
+
+    def test_rejects_other_date_formats(self):
+        for tanggal in ("20250314", "2025-W11-5", "2025-02-30", "14-03-2025", "2025-03-14T06:05"):
+            with self.subTest(date=tanggal), self.assertRaises(ValueError):
+                parse_session(session(date=tanggal), NOW)
+
+    def test_rejects_other_time_formats(self):
+        for jam in ("6:05", "06:5", "24:00", "06:60", "06:05:00", " 06:05", "+6:05", "٠٦:٠٥"):
+            with self.subTest(time=jam), self.assertRaises(ValueError):
+                parse_session(session(time=jam), NOW)
+
+    def test_rejects_non_finite_and_negative(self):
+        for fields in ({"jarak": "nan"}, {"waktu": float("inf")}, {"kal": -1}, {"berat": 0}, {"target": "nan"}):
+            with self.subTest(**fields), self.assertRaises(ValueError):
+                parse_session(session(**fields), NOW)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Laporan multi-atlet."""
+from datetime import date
+import os
+import shutil
+import tempfile
+import unittest
+
+from analyzer_bench import generate_data
+from analyzer_report import athlete_files, build_report
+from analyzer_storage import open_store
+
+
+class Report(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="run_test_")
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.paths = []
+        for name, kind in (("alice.json", "journal"), ("bob.json", "shard"), ("carol.json", "binary"),
+                           ("dave.json", "sqlite"), (os.path.join("erin", "running_data.json"), "shard"),
+                           (os.path.join("frank", "running_data.json"), "binary")):
+            path = os.path.join(self.workdir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            store = open_store(path, kind)
+            store.commit(generate_data(20, end=date(2025, 3, 14)), None)
+            store.close()
+            self.paths.append(path)
+        with open(os.path.join(self.workdir, "zed.json"), "w") as f:
+            f.write("{rusak")
+
+    def test_finds_every_backend(self):
+        names = [os.path.relpath(p, self.workdir) for p in athlete_files(self.workdir)]
+        self.assertEqual(names, ["alice.json", "bob.json", "carol.json", "dave.json", "zed.json",
+                                 os.path.join("erin", "running_data.json"),
+                                 os.path.join("frank", "running_data.json")])
+
+    def test_broken_athlete_gets_error_row(self):
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                rows = {row["athlete"]: row for row in build_report(athlete_files(self.workdir), "2025-03-14", jobs)}
+                self.assertEqual(len(rows), 7)
+                self.assertTrue(rows["zed"]["error"])
+                for name in ("alice", "bob", "carol", "dave", "erin", "frank"):
+                    self.assertIsNone(rows[name]["error"])
+                    self.assertGreater(rows[name]["minggu_sesi"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
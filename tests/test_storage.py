@@ -0,0 +1,120 @@
+"""Regresi penyimpanan: migrasi antar backend dan konversi."""
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import analyzer_cli
+from analyzer_bench import generate_data, make_op
+from analyzer_binary import binary_path, binary_to_json, json_to_binary
+from analyzer_storage import JournalStore, JsonStore, apply_op, migrate_json_to_sqlite, open_store, shard_path, sqlite_path
+
+
+def session_total(data):
+    return sum(len(runs) for runs in data["history"].values())
+
+
+class StorageMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="run_test_")
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        self.path = os.path.join(self.workdir, "running_data.json")
+
+    def write_json(self, n):
+        """running_data.json lama (sebelum shard jadi default), diberi mtime lampau"""
+        store = JsonStore(self.path)
+        store.commit(generate_data(n), None)
+        store.close()
+        os.utime(self.path, (1, 1))
+
+    def add_session(self, kind, tanggal="2026-01-05"):
+        store = open_store(self.path, kind)
+        data = store.load()
+        op = make_op(random.Random(1), tanggal, data)
+        apply_op(data, op)
+        store.commit(data, [op])
+        total = session_total(data)
+        store.close()
+        return total
+
+    def load_total(self, kind):
+        store = open_store(self.path, kind)
+        try:
+            return session_total(store.load())
+        finally:
+            store.close()
+
+    def test_switch_backend_keeps_latest_data(self):
+        self.write_json(30)
+        total = self.add_session("shard")
+        self.assertEqual(total, 31)
+        for kind in ("sqlite", "binary"):
+            with self.subTest(storage=kind):
+                self.assertEqual(self.load_total(kind), total)
+
+    def test_migrators_read_latest_backend(self):
+        self.write_json(30)
+        total = self.add_session("shard")
+        self.assertEqual(migrate_json_to_sqlite(self.path)[1], total)
+        out, _, sessions = json_to_binary(self.path)
+        self.assertEqual((out, sessions), (binary_path(self.path), total))
+
+    def test_binary_to_json_includes_journal(self):
+        self.write_json(30)
+        # sesi baru hanya ada di .runb.journal sampai pemadatan berikutnya
+        total = self.add_session("binary")
+        self.assertTrue(os.path.getsize(binary_path(self.path) + ".journal") > 0)
+        out = os.path.join(self.workdir, "export.json")
+        self.assertEqual(binary_to_json(binary_path(self.path), out)[1], total)
+        self.assertEqual(session_total(JournalStore(out).load()), total)
+
+    def test_sqlite_clear_stays_cleared(self):
+        self.write_json(30)
+        self.assertEqual(self.load_total("sqlite"), 30)
+        store = open_store(self.path, "sqlite")
+        data = store.load()
+        op = {"op": "clear"}
+        apply_op(data, op)
+        store.commit(data, [op])
+        store.close()
+        self.assertEqual(self.load_total("sqlite"), 0)
+
+    @mock.patch.dict(os.environ, {"RUN_ANALYZER_STORAGE": "shard"})
+    def test_merge_defaults_to_active_backend(self):
+        self.write_json(30)
+        laptop = os.path.join(self.workdir, "laptop.json")
+        shutil.copy(self.path, laptop)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.workdir)
+        os.remove(self.path)
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(analyzer_cli.main(["merge", "laptop.json"]), 0)
+        self.assertEqual(err.getvalue(), "")
+        self.assertEqual(self.load_total("shard"), 30)
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch.dict(os.environ, {"RUN_ANALYZER_STORAGE": "shard"})
+    def test_merge_warns_about_inactive_output(self):
+        self.write_json(30)
+        out = os.path.join(self.workdir, "running_data.runb")
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(analyzer_cli.main(["merge", self.path, "--output", out]), 0)
+        self.assertIn(shard_path(self.path), err.getvalue())
+
+    def test_stats_does_not_write(self):
+        self.write_json(30)
+        before = sorted(os.listdir(self.workdir))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(analyzer_cli.main(["stats", "--data", self.path]), 0)
+        self.assertEqual(sorted(os.listdir(self.workdir)), before)
+        self.assertFalse(os.path.exists(shard_path(self.path)))
+        self.assertFalse(os.path.exists(sqlite_path(self.path)))
+
+
+if __name__ == "__main__":
+    unittest.main()